@@ -0,0 +1,96 @@
+import pandas as pd
+import threading
+import streamlit as st
+from data_manager import add_write_listener
+
+# Per-user counters kept by ActivityStats: counter -> (table, user column,
+# optional (column, value) row filter). Each table is grouped once.
+ACTIVITY_SOURCES = {
+    '출석': ('attendance', 'username', ('status', '출석')),
+    '과제제출': ('submissions', 'username', None),
+    '게시글작성': ('posts', 'author', None),
+    '퀴즈참여': ('quiz_responses', 'username', None),
+    '배지': ('badges', 'username', None),
+}
+
+
+class ActivityStats:
+    """Per-user activity counts for gamification, built with one groupby
+    per source table instead of filtering every table once per user.
+
+    Counts are kept per counter and patched in place when DataManager
+    appends rows; an update that touches the grouped columns, or a full
+    table rewrite, marks just that counter stale so it is regrouped on
+    the next read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}  # counter -> {username: count}
+        self._generations = {}  # table -> write count, to spot writes during a regroup
+
+    def invalidate(self, table=None):
+        """Drop cached counts (for one table, or all of them)"""
+        with self._lock:
+            for counter, (source, _, _) in ACTIVITY_SOURCES.items():
+                if table is None or source == table:
+                    self._counts.pop(counter, None)
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener"""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for counter, (source, user_col, row_filter) in ACTIVITY_SOURCES.items():
+                if source != table or counter not in self._counts:
+                    continue
+
+                if columns is not None or records is None:
+                    watched = {user_col} | ({row_filter[0]} if row_filter else set())
+                    if columns is None or columns & watched:
+                        self._counts.pop(counter, None)
+                    continue
+
+                counts = self._counts[counter]
+                for record in records:
+                    if row_filter and record.get(row_filter[0]) != row_filter[1]:
+                        continue
+                    username = record.get(user_col)
+                    counts[username] = counts.get(username, 0) + 1
+
+    def _group(self, counter):
+        table, user_col, row_filter = ACTIVITY_SOURCES[counter]
+        df = st.session_state.data_manager.load_csv(table)
+        if df.empty or user_col not in df.columns:
+            return {}
+        if row_filter:
+            if row_filter[0] not in df.columns:
+                return {}
+            df = df[df[row_filter[0]] == row_filter[1]]
+        return df.groupby(user_col).size().to_dict()
+
+    def _ensure_counter(self, counter):
+        table = ACTIVITY_SOURCES[counter][0]
+        with self._lock:
+            counts = self._counts.get(counter)
+            generation = self._generations.get(table, 0)
+        if counts is None:
+            counts = self._group(counter)
+            with self._lock:
+                # Only cache the result if no write landed while grouping
+                if self._generations.get(table, 0) == generation:
+                    counts = self._counts.setdefault(counter, counts)
+        return counts
+
+    def get_user_stats(self, username):
+        """{counter: count} for one user"""
+        return {counter: self._ensure_counter(counter).get(username, 0) for counter in ACTIVITY_SOURCES}
+
+    def get_frame(self):
+        """DataFrame indexed by username with one column per counter"""
+        columns = {counter: pd.Series(self._ensure_counter(counter), dtype='int64') for counter in ACTIVITY_SOURCES}
+        return pd.DataFrame(columns).fillna(0).astype('int64')
+
+
+# Global activity stats instance
+activity_stats = ActivityStats()
+add_write_listener(activity_stats.on_write)
@@ -20,10 +20,10 @@ class AdditionalFeatures:
         with col1:
             # Active users today
             try:
-                logs_df = st.session_state.data_manager.load_csv('logs')
-                today = datetime.now().strftime('%Y-%m-%d')
-                if not logs_df.empty and 'timestamp' in logs_df.columns and 'username' in logs_df.columns:
-                    today_users = logs_df[logs_df['timestamp'].str.startswith(today)]['username'].nunique()
+                today = datetime.now().date()
+                logs_df = st.session_state.logging_system.load_logs(today, today)
+                if not logs_df.empty and 'username' in logs_df.columns:
+                    today_users = logs_df['username'].nunique()
                 else:
                     today_users = 0
                 error_handler.wrap_streamlit_component(st.metric, "🔥 오늘 활성 사용자", today_users, delta="+2")
@@ -109,8 +109,8 @@ class AdditionalFeatures:
                         color_continuous_scale='viridis')
             error_handler.wrap_streamlit_component(st.plotly_chart, fig, use_container_width=True)
         
-        # Daily activity trend
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        # Daily activity trend (last 30 days)
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
         if not logs_df.empty:
             logs_df['date'] = pd.to_datetime(logs_df['timestamp']).dt.date
             daily_activity = logs_df.groupby('date').size().reset_index()
@@ -143,7 +143,7 @@ class AdditionalFeatures:
             error_handler.wrap_streamlit_component(st.plotly_chart, fig, use_container_width=True)
         
         # Monthly activity heatmap
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
         user_logs = logs_df[logs_df['username'] == user['username']] if not logs_df.empty else pd.DataFrame()
         
         if not user_logs.empty:
@@ -270,28 +270,23 @@ class AdminSystem:
 
                 # Process upload
                 if st.button("👥 사용자 일괄 추가", use_container_width=True):
-                    success_count = 0
-                    error_count = 0
-                    errors = []
-
-                    for _, row in df.iterrows():
-                        success, message = st.session_state.auth_manager.create_user(
-                            row['username'], row['password'], row['name'], 
-                            row['role'], row['club_name'], row['club_role']
-                        )
-
-                        if success:
-                            success_count += 1
-                            # Add welcome notification
-                            st.session_state.notification_system.add_notification(
-                                "환영합니다!",
-                                "info",
-                                row['username'],
-                                f"{row['name']}님, 폴라리스반 동아리 시스템에 오신 것을 환영합니다!"
-                            )
-                        else:
-                            error_count += 1
-                            errors.append(f"{row['username']}: {message}")
+                    created_users, errors = st.session_state.auth_manager.create_users(
+                        df[required_columns].to_dict('records')
+                    )
+                    success_count = len(created_users)
+                    error_count = len(errors)
+
+                    # Add welcome notifications in one write
+                    if created_users:
+                        st.session_state.notification_system.add_notifications([
+                            {
+                                'title': "환영합니다!",
+                                'type': "info",
+                                'username': new_user['username'],
+                                'message': f"{new_user['name']}님, 폴라리스반 동아리 시스템에 오신 것을 환영합니다!"
+                            }
+                            for new_user in created_users
+                        ])
 
                     st.success(f"✅ {success_count}명의 사용자가 성공적으로 추가되었습니다!")
 
@@ -649,7 +644,11 @@ class AdminSystem:
                 st.write(f"📄 {file_name}")
 
             with col2:
-                df = st.session_state.data_manager.load_csv(file_key)
+                if file_key == 'chat_logs':
+                    # Chat lives in per-room segments (data/chat/)
+                    df = st.session_state.chat_system.chat_store.read()
+                else:
+                    df = st.session_state.data_manager.load_csv(file_key)
                 csv_data = df.to_csv(index=False, encoding='utf-8-sig')
 
                 st.download_button(
@@ -971,8 +970,8 @@ class AdminSystem:
             error_handler.wrap_streamlit_component(st.metric, "👥 총 사용자", users_count)
 
         with col2:
-            logs_df = st.session_state.data_manager.load_csv('logs')
-            today_logs = len(logs_df[logs_df['timestamp'].str.startswith(datetime.now().strftime('%Y-%m-%d'))])
+            today = datetime.now().date()
+            today_logs = st.session_state.logging_system.count_logs(today, today)
             error_handler.wrap_streamlit_component(st.metric, "📊 오늘 활동", today_logs)
 
         with col3:
@@ -1010,19 +1009,19 @@ class AdminSystem:
         """Show detailed log analysis"""
         st.subheader("🔍 시스템 로그 분석")
 
-        logs_df = st.session_state.data_manager.load_csv('logs')
-
-        if logs_df.empty:
-            st.info("로그 데이터가 없습니다.")
-            return
-
-        # Date range filter
+        # Date range filter - only the segments in this window are read
         col1, col2 = st.columns(2)
         with col1:
             start_date = st.date_input("시작 날짜", value=datetime.now().date() - timedelta(days=7))
         with col2:
             end_date = st.date_input("종료 날짜", value=datetime.now().date())
 
+        logs_df = st.session_state.logging_system.load_logs(start_date, end_date)
+
+        if logs_df.empty:
+            st.info("로그 데이터가 없습니다.")
+            return
+
         # Filter logs
         logs_df['date'] = pd.to_datetime(logs_df['timestamp']).dt.date
         filtered_logs = logs_df[
@@ -1070,7 +1069,9 @@ class AdminSystem:
 
         # Failed login attempts
         st.subheader("🔐 실패한 로그인 시도")
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
+        if logs_df.empty:
+            logs_df = pd.DataFrame(columns=['timestamp', 'username', 'ip_address', 'error_message', 'activity_type', 'action_result'])
         failed_logins = logs_df[
             (logs_df['activity_type'] == 'Authentication') & 
             (logs_df['action_result'] == 'Failed')
@@ -1105,14 +1106,11 @@ class AdminSystem:
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🧹 오래된 로그 정리"):
-                # Clean logs older than 90 days
-                cutoff_date = datetime.now() - timedelta(days=90)
-                logs_df['timestamp'] = pd.to_datetime(logs_df['timestamp'])
-                recent_logs = logs_df[logs_df['timestamp'] >= cutoff_date]
-
-                if len(recent_logs) < len(logs_df):
-                    st.session_state.data_manager.save_csv('logs', recent_logs)
-                    st.success(f"{len(logs_df) - len(recent_logs)}개의 오래된 로그를 정리했습니다.")
+                # Clean logs older than 90 days (drops whole daily segments)
+                removed_count = st.session_state.logging_system.cleanup_old_logs(days_to_keep=90)
+
+                if removed_count:
+                    st.success(f"{removed_count}개의 오래된 로그를 정리했습니다.")
                 else:
                     st.info("정리할 오래된 로그가 없습니다.")
 
@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime, date
 import os
 from error_handler import error_handler
+from counter_store import counter_store
 
 # Configure page
 st.set_page_config(
@@ -19,11 +20,13 @@ def initialize_core_systems():
     from auth import AuthManager
     from data_manager import DataManager
     from ui_components import UIComponents
+    from event_bus import EventBus
 
     core_systems = {}
     core_systems['auth_manager'] = AuthManager()
     core_systems['data_manager'] = DataManager()
     core_systems['ui_components'] = UIComponents()
+    core_systems['event_bus'] = EventBus()
 
     return core_systems
 
@@ -375,8 +378,7 @@ def show_main_app():
     with col3:
         # 알림 표시
         if hasattr(st.session_state, 'notification_system'):
-            notifications = st.session_state.notification_system.get_user_notifications(user['username'])
-            unread_count = len([n for n in notifications if not n.get('read', False)])
+            unread_count = st.session_state.notification_system.get_unread_count(user['username'])
             if unread_count > 0:
                 error_handler.wrap_streamlit_component(st.metric, "🔔 알림", f"{unread_count}개")
             else:
@@ -625,8 +627,7 @@ def show_home_dashboard(user):
 
     with col3:
         if hasattr(st.session_state, 'notification_system'):
-            notifications = st.session_state.notification_system.get_user_notifications(user['username'])
-            unread_count = len([n for n in notifications if not n.get('read', False)])
+            unread_count = st.session_state.notification_system.get_unread_count(user['username'])
             error_handler.wrap_streamlit_component(st.metric, "🔔 읽지 않은 알림", unread_count)
         else:
             error_handler.wrap_streamlit_component(st.metric, "🔔 읽지 않은 알림", 0)
@@ -683,8 +684,7 @@ def show_home_dashboard(user):
     with col2:
         st.markdown("#### 📢 최근 알림")
         if hasattr(st.session_state, 'notification_system'):
-            notifications = st.session_state.notification_system.get_user_notifications(user['username'])
-            recent_notifications = notifications[:5] if notifications else []
+            recent_notifications = st.session_state.notification_system.get_latest_notifications(user['username'], 5)
 
             if recent_notifications:
                 for notification in recent_notifications:
@@ -789,7 +789,7 @@ def show_performance_analytics(user):
     st.markdown("#### 📈 성과 분석")
 
     # 사용자별 통계
-    posts_df = st.session_state.data_manager.load_csv('posts')
+    posts_df = counter_store.merge_frame('posts', st.session_state.data_manager.load_csv('posts'))
     user_posts = posts_df[posts_df['author'] == user['name']] if not posts_df.empty else pd.DataFrame()
 
     col1, col2, col3 = st.columns(3)
@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+from event_bus import TOPIC_ATTENDANCE
+from points_ledger import points_ledger
 
 
 class AttendanceSystem:
@@ -313,7 +315,8 @@ class AttendanceSystem:
                 backup_data = st.checkbox("💽 백업 생성", value=False)
 
             if submit_button:
-                success_count = 0
+                new_records = []
+                updates_by_id = {}
 
                 for username, data in attendance_data.items():
                     # Check if record exists
@@ -335,14 +338,16 @@ class AttendanceSystem:
                     if not existing_record.empty:
                         # Update existing record
                         record_id = existing_record['id'].iloc[0]
-                        if st.session_state.data_manager.update_record(
-                                'attendance', record_id, record_data):
-                            success_count += 1
+                        updates_by_id[record_id] = record_data
                     else:
                         # Create new record
-                        if st.session_state.data_manager.add_record(
-                                'attendance', record_data):
-                            success_count += 1
+                        new_records.append(record_data)
+
+                # Persist the whole roster with one write per operation
+                success_count = st.session_state.data_manager.update_records(
+                    'attendance', updates_by_id)
+                success_count += st.session_state.data_manager.add_records(
+                    'attendance', new_records)
 
                 if success_count == len(attendance_data):
                     st.success(f"출석이 성공적으로 저장되었습니다! ({success_count}명)")
@@ -357,9 +362,6 @@ class AttendanceSystem:
                         self.create_attendance_backup(selected_date,
                                                       selected_club)
 
-                    # 출석 포인트 부여
-                    self.award_attendance_points(attendance_data)
-
                     st.rerun()
                 else:
                     st.warning(
@@ -1750,9 +1752,8 @@ class AttendanceSystem:
         if st.session_state.data_manager.add_record('attendance', record_data):
             st.success(f"✅ {status} 체크인이 완료되었습니다!")
 
-            # Award points
-            if status == '출석':
-                self.award_attendance_points({user['username']: {'status': '출석'}})
+            if 'event_bus' in st.session_state:
+                st.session_state.event_bus.publish(TOPIC_ATTENDANCE, record_data)
 
             st.rerun()
         else:
@@ -1770,26 +1771,20 @@ class AttendanceSystem:
             st.session_state[f"attendance_goal_{user['username']}"] = new_goal
             st.success(f"출석률 목표가 {new_goal}%로 설정되었습니다!")
 
-    def award_attendance_points(self, attendance_data):
-        """Award points for attendance"""
-        for username, data in attendance_data.items():
-            if data['status'] == '출석':
-                # Award 10 points for attendance
-                current_points = st.session_state.get(f"points_{username}", 0)
-                st.session_state[f"points_{username}"] = current_points + 10
-
     def send_attendance_notifications(self, attendance_data, date, user):
         """Send attendance notifications"""
         absent_users = [username for username, data in attendance_data.items() if data['status'] == '결석']
 
         if absent_users:
-            for username in absent_users:
-                st.session_state.notification_system.add_notification(
-                    "결석 알림",
-                    "warning",
-                    username,
-                    f"{date} 동아리 활동에 결석하셨습니다."
-                )
+            st.session_state.notification_system.add_notifications([
+                {
+                    'title': "결석 알림",
+                    'type': "warning",
+                    'username': username,
+                    'message': f"{date} 동아리 활동에 결석하셨습니다."
+                }
+                for username in absent_users
+            ])
 
     def create_attendance_backup(self, date, club):
         """Create attendance backup"""
@@ -1881,12 +1876,12 @@ class AttendanceSystem:
         st.write(f"목표: {goal}% | 현재: {achievement:.1f}%")
 
     def get_user_points(self, username):
-        """Get user points"""
-        return st.session_state.get(f"points_{username}", 0)
+        """Get user points (attendance points are credited by the points ledger)"""
+        return points_ledger.get_balance(username)
 
     def get_points_change(self, username):
         """Get points change"""
-        return st.session_state.get(f"points_change_{username}", 0)
+        return points_ledger.get_earned_today(username)
 
     def get_available_badges(self, username):
         """Get available badges for user"""
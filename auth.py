@@ -3,11 +3,14 @@ import os
 from datetime import datetime
 import streamlit as st
 from error_handler import error_handler
+from storage_backend import get_storage_backend
+from user_directory import user_directory
 
 class AuthManager:
     def __init__(self):
-        self.users_file = 'data/users.csv'
         self.ensure_data_directory()
+        self.storage = get_storage_backend('data')
+        self.users_file = self.storage.table_path('users')
         self.initialize_users()
     
     def ensure_data_directory(self):
@@ -17,7 +20,7 @@ class AuthManager:
     
     def initialize_users(self):
         """Initialize users.csv with default accounts if it doesn't exist"""
-        if not os.path.exists(self.users_file):
+        if not self.storage.exists('users'):
             # Create initial user accounts based on the provided data
             initial_users = [
                 # Teacher accounts
@@ -53,16 +56,14 @@ class AuthManager:
             ]
             
             df = pd.DataFrame(initial_users)
-            df.to_csv(self.users_file, index=False, encoding='utf-8-sig')
+            self.storage.write('users', df)
     
     def login(self, username, password):
         """Authenticate user login"""
         try:
-            df = pd.read_csv(self.users_file, encoding='utf-8-sig')
-            user = df[(df['username'] == username) & (df['password'] == password)]
-            
-            if not user.empty:
-                return user.iloc[0].to_dict()
+            for user in user_directory.get_user_rows(username):
+                if user.get('password') == password:
+                    return user
             return None
         except Exception as e:
             st.error(f"Login error: {e}")
@@ -71,7 +72,7 @@ class AuthManager:
     def create_user(self, username, password, name, role, club_name, club_role):
         """Create a new user account"""
         try:
-            df = pd.read_csv(self.users_file, encoding='utf-8-sig')
+            df = self.storage.read('users')
             
             # Check if username already exists
             if username in df['username'].values:
@@ -88,27 +89,65 @@ class AuthManager:
             }
             
             df = pd.concat([df, pd.DataFrame([new_user])], ignore_index=True)
-            df.to_csv(self.users_file, index=False, encoding='utf-8-sig')
+            self.storage.write('users', df)
+            user_directory.invalidate()
             return True, "계정이 성공적으로 생성되었습니다."
         except Exception as e:
             return False, f"Account creation error: {e}"
     
+    def create_users(self, users):
+        """Create several accounts with a single write.
+
+        users is a list of dicts with the create_user fields. Returns
+        (created_users, errors) where errors holds "username: message" strings.
+        """
+        try:
+            df = self.storage.read('users')
+            existing = set(df['username'].values) if 'username' in df.columns else set()
+            created_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            created_users = []
+            errors = []
+            for user in users:
+                if user['username'] in existing:
+                    errors.append(f"{user['username']}: 사용자명이 이미 존재합니다.")
+                    continue
+                existing.add(user['username'])
+                created_users.append({
+                    'username': user['username'],
+                    'password': user['password'],
+                    'name': user['name'],
+                    'role': user['role'],
+                    'club_name': user['club_name'],
+                    'club_role': user['club_role'],
+                    'created_date': created_date
+                })
+
+            if created_users:
+                df = pd.concat([df, pd.DataFrame(created_users)], ignore_index=True)
+                self.storage.write('users', df)
+                user_directory.invalidate()
+            return created_users, errors
+        except Exception as e:
+            return [], [f"Account creation error: {e}"]
+    
     def get_all_users(self):
         """Get all user accounts"""
         try:
-            return pd.read_csv(self.users_file, encoding='utf-8-sig')
+            return self.storage.read('users')
         except:
             return pd.DataFrame()
     
     def update_user(self, username, updates):
         """Update user information"""
         try:
-            df = pd.read_csv(self.users_file, encoding='utf-8-sig')
+            df = self.storage.read('users')
             
             for key, value in updates.items():
                 df.loc[df['username'] == username, key] = value
             
-            df.to_csv(self.users_file, index=False, encoding='utf-8-sig')
+            self.storage.write('users', df)
+            user_directory.invalidate()
             return True, "사용자 정보가 업데이트되었습니다."
         except Exception as e:
             return False, f"Update error: {e}"
@@ -116,9 +155,10 @@ class AuthManager:
     def delete_user(self, username):
         """Delete a user account"""
         try:
-            df = pd.read_csv(self.users_file, encoding='utf-8-sig')
+            df = self.storage.read('users')
             df = df[df['username'] != username]
-            df.to_csv(self.users_file, index=False, encoding='utf-8-sig')
+            self.storage.write('users', df)
+            user_directory.invalidate()
             return True, "사용자가 삭제되었습니다."
         except Exception as e:
             return False, f"Delete error: {e}"
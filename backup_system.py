@@ -5,6 +5,9 @@ import os
 import io
 from datetime import datetime
 import json
+from points_ledger import points_ledger
+from blob_store import blob_store
+from counter_store import counter_store
 
 class BackupSystem:
     def __init__(self):
@@ -157,6 +160,10 @@ class BackupSystem:
     def create_backup(self, backup_type, include_images, compress_backup, description):
         """Create system backup"""
         try:
+            # Pending row updates have to be on disk before we zip the files
+            if self.data_manager is not None:
+                self.data_manager.flush()
+
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_filename = f"backup_{backup_type.replace(' ', '_')}_{timestamp}.zip"
             backup_path = os.path.join("data", backup_filename)
@@ -186,10 +193,15 @@ class BackupSystem:
                         if os.path.exists(file_path):
                             zipf.write(file_path, filename)
                 
-                # Add uploads directory if exists and images are included
-                if include_images and os.path.exists("uploads"):
-                    for root, dirs, files in os.walk("uploads"):
+                # Add uploads and stored post images if images are included
+                image_dirs = ["uploads", blob_store.blob_dir] if include_images else []
+                for image_dir in image_dirs:
+                    if not os.path.exists(image_dir):
+                        continue
+                    for root, dirs, files in os.walk(image_dir):
                         for file in files:
+                            if file.endswith('.tmp'):
+                                continue
                             file_path = os.path.join(root, file)
                             arc_path = os.path.relpath(file_path, ".")
                             zipf.write(file_path, arc_path)
@@ -222,15 +234,31 @@ class BackupSystem:
             # Restore selected data
             file_mapping = {
                 "사용자 계정": "users.csv",
-                "게시판": "posts.csv",
+                "게시판": ["posts.csv", "counters.json"],
                 "과제": ["assignments.csv", "submissions.csv"],
                 "퀴즈": ["quizzes.csv", "quiz_responses.csv"],
-                "채팅": "chat_logs.csv",
+                "채팅": ["chat_logs.csv", "chat"],
                 "일정": "schedule.csv",
                 "투표": "votes.csv",
                 "출석": "attendance.csv"
             }
             
+            # Pending row updates and counter changes go to disk first, so a
+            # late write-behind flush cannot overwrite the restored files
+            if self.data_manager is not None:
+                self.data_manager.flush()
+            counter_store.save()
+            restored_tables = []
+
+            # Chat messages are per-room segments under data/chat/. A backup from
+            # before that only has chat_logs.csv: move the segments aside so the
+            # restored table is migrated again
+            chat_store = st.session_state.chat_system.chat_store if 'chat_system' in st.session_state else None
+            chat_dir = os.path.join("data", "chat")
+            if ("채팅" in restore_options and not os.path.exists(os.path.join(temp_dir, "chat"))
+                    and os.path.exists(os.path.join(temp_dir, "chat_logs.csv")) and os.path.exists(chat_dir)):
+                os.rename(chat_dir, f"{chat_dir}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
             for option in restore_options:
                 if option in file_mapping:
                     files = file_mapping[option]
@@ -249,7 +277,23 @@ class BackupSystem:
                             
                             # Copy restored file
                             os.rename(temp_file_path, target_file_path)
+                            if filename.endswith(('.csv', '.parquet')):
+                                restored_tables.append(filename)
+
+            # Cached frames, id counters and derived indexes of the restored tables are stale
+            if self.data_manager is not None:
+                self.data_manager.reload_tables(restored_tables)
             
+            # Restored chat segments replace the manifest and ring buffers in memory
+            if "채팅" in restore_options and chat_store is not None:
+                chat_store.reload()
+                for key in [key for key in st.session_state.keys() if str(key).startswith('chat_view_')]:
+                    del st.session_state[key]
+
+            # Restored like/comment counts replace the ones in memory
+            if "게시판" in restore_options:
+                counter_store.reload()
+
             # Cleanup
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
@@ -264,6 +308,9 @@ class BackupSystem:
         """Create backup of selected files"""
         zip_buffer = io.BytesIO()
         
+        if self.data_manager is not None:
+            self.data_manager.flush()
+        
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for filename in selected_files:
                 file_path = os.path.join("data", filename)
@@ -282,13 +329,23 @@ class BackupSystem:
             "vote_responses.csv", "attendance.csv", "notifications.csv", "badges.csv",
             "points.csv", "video_conferences.csv"
         ]
+
+        # Chat messages are stored per room under data/chat/
+        if 'chat_system' in st.session_state:
+            all_files += st.session_state.chat_system.chat_store.files()
+
+        # Earned and spent points are in the ledger, not points.csv
+        all_files += points_ledger.files()
+
+        # Like and comment counts are kept in counters.json, not posts.csv
+        all_files += counter_store.files()
         
         if backup_type == "전체 백업":
             return all_files
         elif backup_type == "사용자 데이터만":
-            return ["users.csv", "clubs.csv", "user_clubs.csv", "badges.csv", "points.csv"]
+            return ["users.csv", "clubs.csv", "user_clubs.csv", "badges.csv", "points.csv"] + points_ledger.files()
         elif backup_type == "게시판 데이터만":
-            return ["posts.csv", "comments.csv"]
+            return ["posts.csv", "comments.csv"] + counter_store.files()
         elif backup_type == "과제 데이터만":
             return ["assignments.csv", "submissions.csv", "quizzes.csv", "quiz_responses.csv"]
         else:
@@ -0,0 +1,101 @@
+import os
+import re
+import base64
+import hashlib
+import binascii
+import threading
+
+_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_blob_ref(value):
+    """True if a value is a blob hash rather than inline (base64) data"""
+    return isinstance(value, str) and bool(_HASH_PATTERN.match(value.strip()))
+
+
+class BlobStore:
+    """Content-addressed file store for binary data such as post images.
+
+    A blob is saved once under data/blobs/<aa>/<sha256> and referenced by
+    its SHA-256 hex digest, so identical uploads share one file and tables
+    only carry the 64-character hash.
+    """
+
+    def __init__(self, blob_dir=os.path.join('data', 'blobs')):
+        self.blob_dir = blob_dir
+
+    def path(self, ref):
+        ref = ref.strip()
+        return os.path.join(self.blob_dir, ref[:2], ref)
+
+    def put(self, data):
+        """Store bytes and return their hash (no-op if already stored)"""
+        ref = hashlib.sha256(data).hexdigest()
+        filepath = self.path(ref)
+        if not os.path.exists(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            # Unique per writer: sessions storing the same content run on separate threads
+            tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        return ref
+
+    def get(self, ref):
+        """Bytes of a blob, or None if it does not exist"""
+        try:
+            with open(self.path(ref), 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, OSError):
+            return None
+
+    def exists(self, ref):
+        return os.path.exists(self.path(ref))
+
+    def load(self, value):
+        """Bytes for a stored value: a blob hash, or legacy inline base64"""
+        if not isinstance(value, str) or not value.strip():
+            return None
+        if is_blob_ref(value):
+            return self.get(value)
+        try:
+            return base64.b64decode(value)
+        except (binascii.Error, ValueError):
+            return None
+
+    def refs(self, value):
+        """Split a comma-separated image column value into its parts"""
+        if not isinstance(value, str):
+            return []
+        return [part.strip() for part in value.split(',') if part.strip()]
+
+    def migrate_column(self, dataframe, column):
+        """Move inline base64 values of a column into the store.
+
+        Comma-separated lists are handled part by part. Returns the number
+        of values that were rewritten (the frame is changed in place).
+        """
+        if column not in dataframe.columns:
+            return 0
+        migrated = 0
+        for label, value in dataframe[column].items():
+            parts = self.refs(value)
+            if not parts or all(is_blob_ref(part) for part in parts):
+                continue
+            if migrated == 0:
+                dataframe[column] = dataframe[column].astype('object')
+            new_parts = []
+            for part in parts:
+                if is_blob_ref(part):
+                    new_parts.append(part)
+                    continue
+                data = self.load(part)
+                if data:
+                    new_parts.append(self.put(data))
+            dataframe.at[label, column] = ','.join(new_parts)
+            migrated += 1
+        return migrated
+
+
+# Global blob store instance
+blob_store = BlobStore()
@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import base64
 from PIL import Image
 import io
 import os
 from error_handler import error_handler
+from blob_store import blob_store
+from image_pipeline import image_pipeline
+from post_feed import post_feed
+from counter_store import counter_store
+from comment_store import comment_store, COMMENT_PAGE_SIZE
+from search_index import search_index
 
 class BoardSystem:
     def __init__(self):
@@ -57,29 +62,12 @@ class BoardSystem:
             # Search
             search_term = st.text_input("🔍 검색", placeholder="제목, 내용 검색...")
 
-        # Load and filter posts
-        posts_df = st.session_state.data_manager.load_csv('posts')
-
-        if posts_df.empty:
-            st.info("등록된 게시글이 없습니다.")
-            return
-
-        # Apply filters
-        if selected_club != "전체":
-            posts_df = posts_df[posts_df['club'] == selected_club]
-
+        # Only the requested page is loaded and rendered
+        club = selected_club if selected_club != "전체" else None
+        post_ids = None
         if search_term:
-            try:
-                # Ensure string columns are properly typed
-                posts_df['title'] = posts_df['title'].astype(str)
-                posts_df['content'] = posts_df['content'].astype(str)
-                posts_df = posts_df[
-                    posts_df['title'].str.contains(search_term, case=False, na=False) |
-                    posts_df['content'].str.contains(search_term, case=False, na=False)
-                ]
-            except Exception:
-                # If search fails, keep all posts
-                pass
+            hits = search_index.search(search_term, ['게시글'])
+            post_ids = [doc['id'] for _, _, doc in hits]
 
             # 검색 로그
             st.session_state.logging_system.log_activity(
@@ -87,22 +75,43 @@ class BoardSystem:
                 'Posts', 'Success'
             )
 
-        # Sort posts
-        if sort_by == "좋아요순":
-            posts_df['likes'] = pd.to_numeric(posts_df['likes'], errors='coerce').fillna(0)
-            posts_df = posts_df.sort_values('likes', ascending=False)
-        elif sort_by == "댓글순":
-            posts_df['comments'] = pd.to_numeric(posts_df['comments'], errors='coerce').fillna(0)
-            posts_df = posts_df.sort_values('comments', ascending=False)
-        else:  # 최신순
-            posts_df['created_date'] = posts_df['created_date'].apply(error_handler.safe_datetime_parse)
+        if post_feed.count(club) == 0:
+            st.info("등록된 게시글이 없습니다.")
+            return
 
-            posts_df = posts_df.sort_values('created_date', ascending=False)
+        # Cursor stack for the current filter; reset when the filter changes
+        view = (club, sort_by, search_term)
+        if st.session_state.get('board_view') != view:
+            st.session_state.board_view = view
+            st.session_state.board_cursors = [None]
+        cursors = st.session_state.board_cursors
+
+        posts, next_cursor = post_feed.page(sort_by, club=club, post_ids=post_ids, cursor=cursors[-1])
+        if not posts:
+            st.info("조건에 맞는 게시글이 없습니다.")
+            return
+
+        # Comment counts for the page in one lookup
+        comment_counts = comment_store.counts([post['id'] for post in posts])
 
         # Display posts
-        for idx, post in posts_df.iterrows():
+        for idx, post in enumerate(posts):
+            post['comments'] = comment_counts.get(post['id'], 0)
             self.show_post_card(post, user, idx)
 
+        # Page navigation
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if len(cursors) > 1 and st.button("◀ 이전", key="board_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"{len(cursors)} 페이지")
+        with col3:
+            if next_cursor is not None and st.button("다음 ▶", key="board_next_page"):
+                cursors.append(next_cursor)
+                st.rerun()
+
     def show_post_card(self, post, user, idx):
         """Display a single post card using pure Streamlit components"""
         # Calculate engagement metrics
@@ -131,23 +140,13 @@ class BoardSystem:
             # Post content
             st.write(post['content'])
 
-            # Image display
+            # Image display (blob hashes; older posts may still hold base64)
             if pd.notna(post.get('image_path')) and str(post.get('image_path', '')).strip():
-                try:
-                    if pd.notna(post.get('image_path')) and str(post.get('image_path', '')).strip():
-                        image_list = post['image_path'].split(',')
-                        for img_str in image_list:
-                            try:
-                                image_data = base64.b64decode(img_str)
-                                image = Image.open(io.BytesIO(image_data))
-                                st.image(image, use_column_width=True)
-                            except:
-                                st.warning("이미지를 불러올 수 없습니다.")
-
-                    image = Image.open(io.BytesIO(image_data))
-                    st.image(image, use_column_width=True)
-                except:
-                    st.warning("이미지를 불러올 수 없습니다.")
+                for image_ref in blob_store.refs(post['image_path']):
+                    try:
+                        st.image(image_pipeline.get(image_ref, 'full'), use_column_width=True)
+                    except:
+                        st.warning("이미지를 불러올 수 없습니다.")
 
             # Action buttons
             col1, col2, col3, col4 = st.columns(4)
@@ -279,44 +278,44 @@ class BoardSystem:
                     st.error("모든 필수 항목을 입력해주세요.")
 
     def process_uploaded_image(self, uploaded_file):
-        """Process uploaded image and return base64 encoded string"""
+        """Process uploaded image, store it in the blob store and return its hash"""
         try:
             image = Image.open(uploaded_file)
 
-            # Resize image if too large
-            max_size = (800, 600)
+            # Resize image if too large (the original the renditions are made from)
+            max_size = (1600, 1200)
             image.thumbnail(max_size, Image.Resampling.LANCZOS)
 
-            # Convert to base64
+            # Store the PNG bytes once; the post only keeps the hash
             buffered = io.BytesIO()
             image.save(buffered, format="PNG")
-            img_str = base64.b64encode(buffered.getvalue()).decode()
+            image_ref = blob_store.put(buffered.getvalue())
 
-            return img_str
+            # Grid/card/full renditions are rendered in the background
+            image_pipeline.submit(image_ref)
+            return image_ref
         except Exception as e:
             st.error(f"이미지 처리 중 오류가 발생했습니다: {e}")
             return None
 
     def like_post(self, post_id, user):
         """Add like to post"""
-        posts_df = st.session_state.data_manager.load_csv('posts')
-
-        if not posts_df.empty:
-            current_likes = int(posts_df.loc[posts_df['id'] == post_id, 'likes'].iloc[0]) if not posts_df[posts_df['id'] == post_id].empty else 0
-            new_likes = current_likes + 1
+        counter_store.increment('posts', post_id, 'likes')
 
-            if st.session_state.data_manager.update_record('posts', post_id, {'likes': new_likes}):
-                # 좋아요 로그
-                st.session_state.logging_system.log_activity(
-                    user['username'], 'User Interaction', f'Liked post ID: {post_id}',
-                    'Posts', 'Success', data_modified='1 record'
-                )
+        # 좋아요 로그
+        st.session_state.logging_system.log_activity(
+            user['username'], 'User Interaction', f'Liked post ID: {post_id}',
+            'Posts', 'Success', data_modified='1 record'
+        )
 
     def delete_post(self, post_id, user):
         """Delete a post"""
         success = st.session_state.data_manager.delete_record('posts', post_id)
 
         if success:
+            counter_store.discard('posts', post_id)
+            comment_store.delete_post_comments(post_id)
+
             # 게시글 삭제 로그
             st.session_state.logging_system.log_activity(
                 user['username'], 'Content Management', f'Deleted post ID: {post_id}',
@@ -346,33 +345,41 @@ class BoardSystem:
                 submit_comment = st.form_submit_button("💬 댓글 등록", use_container_width=True)
 
             if submit_comment and comment_text:
-                # Save comment data
-                comment_data = {
-                    'id': f"comment_{int(datetime.now().timestamp())}",
-                    'post_id': post_id,
-                    'username': user['username'],
-                    'content': comment_text,
-                    'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-
-                # 댓글 작성 로그
-                st.session_state.logging_system.log_activity(
-                    user['username'], 'User Interaction', f'Added comment to post ID: {post_id}',
-                    'Comments', 'Success', data_modified='1 record'
-                )
-
-                st.success("댓글이 등록되었습니다!")
-
-                # Update comment count
-                posts_df = st.session_state.data_manager.load_csv('posts')
-                if not posts_df.empty:
-                    current_comments = int(posts_df.loc[posts_df['id'] == post_id, 'comments'].iloc[0]) if not posts_df[posts_df['id'] == post_id].empty else 0
-                    new_comments = current_comments + 1
-                    st.session_state.data_manager.update_record('posts', post_id, {'comments': new_comments})
+                if comment_store.add_comment(post_id, user['username'], comment_text):
+                    # 댓글 작성 로그
+                    st.session_state.logging_system.log_activity(
+                        user['username'], 'User Interaction', f'Added comment to post ID: {post_id}',
+                        'Comments', 'Success', data_modified='1 record'
+                    )
 
-        # Display existing comments (simulated)
-        with st.expander("📝 댓글 보기", expanded=False, key=f"expander_{post_id}_unique"): # Added unique key to expander
-            st.info("댓글 시스템이 구현되었습니다. 실제 댓글 데이터는 별도 테이블에서 관리됩니다.")
+                    st.success("댓글이 등록되었습니다!")
+                else:
+                    st.error("댓글 등록에 실패했습니다.")
+
+        # Existing comments, newest first, one page at a time
+        limit_key = f'comment_limit_{post_id}'
+        limit = st.session_state.get(limit_key, COMMENT_PAGE_SIZE)
+        comments, total = comment_store.get_comments(post_id, limit=limit)
+
+        with st.expander(f"📝 댓글 보기 ({total})", expanded=False, key=f"expander_{post_id}_unique"): # Added unique key to expander
+            if not comments:
+                st.info("아직 댓글이 없습니다.")
+
+            for comment in comments:
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    st.markdown(f"**{comment['username']}** · {str(comment['created_date'])[:16]}")
+                    st.write(comment['content'])
+                with col2:
+                    if user['role'] in ['선생님'] or user['username'] == comment['username']:
+                        if st.button("🗑️", key=f"delete_comment_{comment['id']}"):
+                            if comment_store.delete_comment(comment['id'], post_id):
+                                st.rerun()
+
+            if total > len(comments):
+                if st.button(f"이전 댓글 더 보기 ({total - len(comments)}개 남음)", key=f"more_comments_{post_id}"):
+                    st.session_state[limit_key] = limit + COMMENT_PAGE_SIZE
+                    st.rerun()
 
         # Close comments
         if st.button("❌ 댓글 닫기", key=f"close_comments_{post_id}_unique"):
@@ -0,0 +1,299 @@
+import pandas as pd
+import os
+import json
+import threading
+from collections import deque
+from storage_backend import get_storage_backend
+
+# A room's segment rolls over to a new file after this many messages
+CHAT_SEGMENT_ROWS = 500
+
+# Recent messages kept in memory per room for since-id polling
+CHAT_RING_SIZE = 200
+
+CHAT_COLUMNS = ['id', 'username', 'club', 'message', 'timestamp', 'deleted']
+
+
+def is_deleted(value):
+    """True for deleted flags as written by pandas (True, 'True', 1)"""
+    return value is True or str(value).strip().lower() in ('true', '1', '1.0')
+
+
+class ChatStore:
+    """Chat messages split per room into small, row-capped segment files.
+
+    Segments live in data/chat/ as 'room<N>_<k>' tables; manifest.json maps
+    each room to its segments with their id range and row count. Message
+    ids are global and increasing, so a room's newest messages are in its
+    last segment: opening a room reads one or two files however long the
+    history is, and "load older" walks back segment by segment.
+
+    Each room also has an in-memory ring buffer of its latest messages,
+    shared by every session, so get_messages_since (the polling call) is
+    a scan of at most CHAT_RING_SIZE dicts instead of a file read.
+    """
+
+    def __init__(self, chat_dir=os.path.join('data', 'chat'), legacy_table='chat_logs',
+                 segment_rows=CHAT_SEGMENT_ROWS):
+        self.chat_dir = chat_dir
+        self.legacy_table = legacy_table
+        self.segment_rows = segment_rows
+        self.manifest_file = os.path.join(chat_dir, 'manifest.json')
+        self._lock = threading.RLock()
+        self._rings = {}  # room -> (deque of recent messages, floor id)
+
+        self.storage = get_storage_backend(chat_dir)
+        self.reload()
+
+    def reload(self):
+        """(Re)read the manifest and drop the ring buffers, e.g. after a restore
+        replaced the chat files. Without a manifest the legacy table is migrated."""
+        with self._lock:
+            os.makedirs(self.chat_dir, exist_ok=True)
+            self._rings = {}
+            self.manifest = self._load_manifest()
+            if self.manifest is None:
+                self.manifest = {'last_id': 0, 'rooms': {}}
+                self._migrate_legacy_table()
+                self._save_manifest()
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_file):
+            return None
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_file)
+
+    def _migrate_legacy_table(self):
+        """Split the old single chat_logs table into room segments (one time)"""
+        data_dir = os.path.dirname(self.chat_dir.rstrip(os.sep)) or '.'
+        legacy_storage = get_storage_backend(data_dir)
+        if not legacy_storage.exists(self.legacy_table):
+            return
+
+        try:
+            legacy_df = legacy_storage.read(self.legacy_table)
+        except Exception:
+            return
+        if legacy_df.empty:
+            return
+
+        # Keep existing ids where they are numbers; number the rest after them
+        ids = pd.to_numeric(legacy_df.get('id', pd.Series(index=legacy_df.index, dtype=float)), errors='coerce')
+        next_id = int(ids.max()) if ids.notna().any() else 0
+        records = []
+        for record, message_id in zip(legacy_df.to_dict('records'), ids):
+            if pd.isna(message_id):
+                next_id += 1
+                message_id = next_id
+            record['id'] = int(message_id)
+            records.append(record)
+        records.sort(key=lambda record: record['id'])
+        self.manifest['last_id'] = next_id
+        self._append_records(records)
+
+        # Leave a header-only file behind so nothing reads the rows twice
+        legacy_storage.write(self.legacy_table, legacy_df.iloc[0:0])
+
+    # -- writing ---------------------------------------------------------
+
+    def _room_entry(self, room):
+        rooms = self.manifest['rooms']
+        if room not in rooms:
+            rooms[room] = {'slug': f"room{len(rooms) + 1}", 'segments': []}
+        return rooms[room]
+
+    def _current_segment(self, room):
+        """Segment that new messages for a room go to, rolling over when full"""
+        entry = self._room_entry(room)
+        segments = entry['segments']
+        if segments and segments[-1]['rows'] < self.segment_rows:
+            return segments[-1]
+        segment = {'name': f"{entry['slug']}_{len(segments)}", 'first_id': None, 'last_id': None, 'rows': 0}
+        segments.append(segment)
+        return segment
+
+    def _append_records(self, records):
+        pending = {}
+        for record in records:
+            segment = self._current_segment(str(record.get('club')))
+            row = {column: record.get(column) for column in CHAT_COLUMNS}
+            row.update(record)
+            pending.setdefault(segment['name'], []).append(row)
+            if segment['first_id'] is None:
+                segment['first_id'] = row['id']
+            segment['last_id'] = row['id']
+            segment['rows'] += 1
+
+        for name, rows in pending.items():
+            if not self.storage.append_many(name, rows):
+                existing = self.storage.read(name)
+                self.storage.write(name, pd.concat([existing, pd.DataFrame(rows)], ignore_index=True))
+
+    def append(self, message):
+        """Assign the next id to a message, store it and return it"""
+        with self._lock:
+            self.manifest['last_id'] += 1
+            message = dict(message, id=self.manifest['last_id'])
+            self._append_records([message])
+            self._save_manifest()
+            self._push_ring(str(message.get('club')), message)
+        return message
+
+    # -- ring buffers ----------------------------------------------------
+
+    def _ring(self, room):
+        """A room's ring buffer, filled from its last segments on first use.
+
+        The floor is the id below which messages may be missing from the
+        ring (0 when the ring holds the room's whole history).
+        """
+        ring = self._rings.get(room)
+        if ring is None:
+            recent = self._room_tail(room, CHAT_RING_SIZE + 1, None, include_deleted=True)
+            floor = int(recent[0]['id']) if len(recent) > CHAT_RING_SIZE else 0
+            ring = self._rings[room] = [deque(recent[-CHAT_RING_SIZE:], maxlen=CHAT_RING_SIZE), floor]
+        return ring
+
+    def _push_ring(self, room, message):
+        ring = self._rings.get(room)
+        if ring is None:
+            return  # built from storage (including this message) on first use
+        messages = ring[0]
+        if len(messages) == messages.maxlen:
+            ring[1] = int(messages[0]['id'])
+        messages.append(message)
+
+    def mark_deleted(self, message_id, room=None):
+        """Flag a message as deleted by rewriting only its segment"""
+        message_id = int(float(message_id))
+        with self._lock:
+            rooms = [room] if room is not None and room in self.manifest['rooms'] else list(self.manifest['rooms'])
+            for name in rooms:
+                for segment in self.manifest['rooms'][name]['segments']:
+                    if segment['first_id'] is None or not segment['first_id'] <= message_id <= segment['last_id']:
+                        continue
+                    df = self.storage.read(segment['name'])
+                    match = pd.to_numeric(df['id'], errors='coerce') == message_id
+                    if match.any():
+                        df['deleted'] = df['deleted'].astype('object')
+                        df.loc[match, 'deleted'] = True
+                        self.storage.write(segment['name'], df)
+                        for message in self._rings.get(name, [()])[0]:
+                            if int(message['id']) == message_id:
+                                message['deleted'] = True
+                        return True
+        return False
+
+    # -- reading ---------------------------------------------------------
+
+    def rooms(self):
+        with self._lock:
+            return list(self.manifest['rooms'])
+
+    def _room_tail(self, room, limit, before_id, include_deleted=False):
+        """Up to `limit` live messages of one room with id < before_id, oldest first"""
+        with self._lock:
+            segments = list(self.manifest['rooms'].get(room, {}).get('segments', []))
+        collected = []
+        for segment in reversed(segments):
+            if segment['first_id'] is None or (before_id is not None and segment['first_id'] >= before_id):
+                continue
+            if not self.storage.exists(segment['name']):
+                continue
+            rows = self.storage.read(segment['name']).to_dict('records')
+            rows = [
+                row for row in rows
+                if (include_deleted or not is_deleted(row.get('deleted')))
+                and (before_id is None or int(row['id']) < before_id)
+            ]
+            collected = rows + collected
+            if len(collected) >= limit:
+                break
+        return collected[-limit:] if limit else collected
+
+    def tail(self, room=None, limit=50, before_id=None):
+        """The last `limit` live messages of a room (None = every room).
+
+        Returns (messages, has_older): messages oldest first, has_older True
+        when there are earlier messages to page back to with
+        before_id=messages[0]['id'].
+        """
+        rooms = [room] if room is not None else self.rooms()
+        messages = []
+        for name in rooms:
+            messages.extend(self._room_tail(name, limit + 1, before_id))
+        messages.sort(key=lambda message: int(message['id']))
+        has_older = len(messages) > limit
+        return messages[-limit:], has_older
+
+    def get_messages_since(self, room, last_id, limit=CHAT_RING_SIZE):
+        """Live messages of a room (None = every room) with id > last_id, oldest first.
+
+        Served from the ring buffers; a client that fell further behind
+        than a ring holds gets the newest `limit` messages from storage.
+        """
+        last_id = int(last_id or 0)
+        rooms = [room] if room is not None else self.rooms()
+        messages = []
+        with self._lock:
+            for name in rooms:
+                if name not in self.manifest['rooms']:
+                    continue
+                ring, floor = self._ring(name)
+                if last_id < floor:
+                    newer = [m for m in self._room_tail(name, limit, None) if int(m['id']) > last_id]
+                else:
+                    newer = [m for m in ring if int(m['id']) > last_id and not is_deleted(m.get('deleted'))]
+                messages.extend(dict(m) for m in newer)
+        messages.sort(key=lambda message: int(message['id']))
+        return messages[-limit:]
+
+    def last_id(self):
+        """Id of the newest message in any room"""
+        with self._lock:
+            return self.manifest['last_id']
+
+    def count(self, room=None):
+        """Messages stored for a room (or all rooms), deleted ones included"""
+        with self._lock:
+            rooms = [room] if room is not None else list(self.manifest['rooms'])
+            return sum(
+                segment['rows']
+                for name in rooms
+                for segment in self.manifest['rooms'].get(name, {}).get('segments', [])
+            )
+
+    def read(self, room=None):
+        """All messages of a room (or all rooms) as one frame, for statistics"""
+        with self._lock:
+            rooms = [room] if room is not None else list(self.manifest['rooms'])
+            names = [
+                segment['name']
+                for name in rooms
+                for segment in self.manifest['rooms'].get(name, {}).get('segments', [])
+            ]
+        frames = [self.storage.read(name) for name in names if self.storage.exists(name)]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=CHAT_COLUMNS)
+        return pd.concat(frames, ignore_index=True).sort_values('id', ignore_index=True)
+
+    def files(self):
+        """Paths of the manifest and segment files, relative to the data dir"""
+        relative_dir = os.path.basename(self.chat_dir.rstrip(os.sep))
+        with self._lock:
+            paths = [os.path.join(relative_dir, 'manifest.json')]
+            for entry in self.manifest['rooms'].values():
+                for segment in entry['segments']:
+                    table_path = self.storage.table_path(segment['name'])
+                    paths.append(os.path.join(relative_dir, os.path.basename(table_path)))
+        return paths
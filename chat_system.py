@@ -2,10 +2,19 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from error_handler import error_handler
+from chat_store import ChatStore, is_deleted
+from event_bus import TOPIC_CHAT, TOPIC_CHAT_DELETE
+
+# Messages shown when a room is opened, and per "load older" click
+CHAT_PAGE_SIZE = 50
+
+# Seconds between polls for new messages while the chat tab is open
+CHAT_POLL_SECONDS = 3
 
 class ChatSystem:
     def __init__(self):
-        self.chat_file = 'data/chat_logs.csv'
+        self.chat_store = ChatStore()
+        self.chat_file = self.chat_store.chat_dir
     
     def show_chat_interface(self, user):
         """Display the chat interface"""
@@ -29,40 +38,56 @@ class ChatSystem:
         # Message input
         self.show_message_input(selected_room, user)
     
+    @st.fragment(run_every=CHAT_POLL_SECONDS)
     def show_chat_messages(self, room, user):
-        """Display chat messages for the selected room"""
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
-        
-        if chat_df.empty:
-            st.info("아직 메시지가 없습니다.")
-            return
-        
-        # Filter messages for the selected room
-        if room != "전체":
-            room_messages = chat_df[
-                (chat_df['club'] == room) & 
-                (chat_df['deleted'] != True)
-            ]
+        """Display the selected room, pulling only new messages on each poll"""
+        bus = st.session_state.get('event_bus')
+        seq = bus.last_seq() if bus else 0
+
+        view_key = f'chat_view_{room}'
+        view = st.session_state.get(view_key)
+        events = self._room_events(bus, view['seq'], room) if view is not None and bus else []
+        if view is None or events is None:
+            # First open, or events were dropped from the bus history - read the store
+            messages, has_older = self.get_recent_messages(room)
+            view = st.session_state[view_key] = {'messages': messages, 'has_older': has_older, 'seq': seq}
         else:
-            room_messages = chat_df[chat_df['deleted'] != True]
-        
-        if room_messages.empty:
+            if bus is None or any(event['topic'] == TOPIC_CHAT for event in events):
+                last_id = view['messages'][-1]['id'] if view['messages'] else 0
+                view['messages'].extend(self.get_messages_since(room, last_id))
+            deleted = {int(event['payload']['id']) for event in events if event['topic'] == TOPIC_CHAT_DELETE}
+            if deleted:
+                view['messages'] = [m for m in view['messages'] if int(m['id']) not in deleted]
+        view['seq'] = seq
+
+        if not view['messages']:
             st.info("이 채팅방에는 아직 메시지가 없습니다.")
             return
         
-        # Sort by timestamp
-        room_messages = room_messages.sort_values('timestamp')
-        
         # Create a container for messages with fixed height
         messages_container = st.container()
         
         with messages_container:
             st.markdown("#### 💬 메시지")
+
+            if view['has_older'] and st.button("⬆️ 이전 메시지 더 보기", key=f"chat_older_{room}"):
+                older, view['has_older'] = self.get_recent_messages(room, before_id=view['messages'][0]['id'])
+                view['messages'] = older + view['messages']
+                st.rerun(scope="fragment")
             
             # Display messages
-            for _, message in room_messages.iterrows():
+            for message in view['messages']:
                 self.display_message(message, user)
     
+    @staticmethod
+    def _room_events(bus, seq, room):
+        """New and deleted message events for a room after seq (None if some were dropped)"""
+        if not bus.covers(seq):
+            return None
+        events = bus.events_since(seq, {TOPIC_CHAT, TOPIC_CHAT_DELETE})
+        # A delete without a known room reaches every view
+        return [event for event in events if room == "전체" or event['payload'].get('club') in (room, None)]
+    
     def display_message(self, message, current_user):
         """Display a single chat message"""
         is_own_message = message['username'] == current_user['username']
@@ -100,7 +125,11 @@ class ChatSystem:
             col1, col2, col3 = st.columns([1, 1, 8])
             with col1:
                 if st.button("🗑️", key=f"delete_msg_{message['id']}", help="메시지 삭제"):
-                    self.delete_message(message['id'])
+                    self.delete_message(message['id'], message['club'])
+                    if 'event_bus' not in st.session_state:
+                        # No delete event to pick up - rebuild the open room views
+                        for key in [key for key in st.session_state.keys() if str(key).startswith('chat_view_')]:
+                            del st.session_state[key]
                     st.rerun()
             with col2:
                 if st.button("📋", key=f"copy_msg_{message['id']}", help="메시지 복사"):
@@ -137,44 +166,47 @@ class ChatSystem:
             'deleted': False
         }
         
-        if st.session_state.data_manager.add_record('chat_logs', message_data):
-            # Add notification for new message
-            st.session_state.notification_system.add_notification(
-                f"새 메시지 ({club})",
-                "info",
-                "all",
-                f"{username}: {message[:50]}{'...' if len(message) > 50 else ''}"
-            )
-            return True
-        return False
+        try:
+            message_data = self.chat_store.append(message_data)
+        except Exception as e:
+            error_handler.log_error(e, "Chat message save failed")
+            return False
+
+        # Let open chat views know without touching storage
+        if 'event_bus' in st.session_state:
+            st.session_state.event_bus.publish(TOPIC_CHAT, message_data)
+
+        # Add notification for new message
+        st.session_state.notification_system.add_notification(
+            f"새 메시지 ({club})",
+            "info",
+            "all",
+            f"{username}: {message[:50]}{'...' if len(message) > 50 else ''}"
+        )
+        return True
     
-    def delete_message(self, message_id):
-        """Mark a message as deleted"""
-        return st.session_state.data_manager.update_record('chat_logs', message_id, {'deleted': True})
+    def delete_message(self, message_id, room=None):
+        """Mark a message as deleted and tell open chat views to drop it"""
+        if not self.chat_store.mark_deleted(message_id, room):
+            return False
+        if 'event_bus' in st.session_state:
+            st.session_state.event_bus.publish(TOPIC_CHAT_DELETE, {'id': int(float(message_id)), 'club': room})
+        return True
     
-    def get_recent_messages(self, room, limit=50):
-        """Get recent messages for a room"""
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
-        
-        if chat_df.empty:
-            return pd.DataFrame()
-        
-        # Filter by room
-        if room != "전체":
-            room_messages = chat_df[
-                (chat_df['club'] == room) & 
-                (chat_df['deleted'] != True)
-            ]
-        else:
-            room_messages = chat_df[chat_df['deleted'] != True]
-        
-        # Sort and limit
-        room_messages = room_messages.sort_values('timestamp', ascending=False).head(limit)
-        return room_messages.sort_values('timestamp')
+    def get_recent_messages(self, room, limit=CHAT_PAGE_SIZE, before_id=None):
+        """Latest messages of a room, oldest first: (messages, has_older).
+
+        "전체" shows every room. Only the newest segments are read.
+        """
+        return self.chat_store.tail(None if room == "전체" else room, limit=limit, before_id=before_id)
+    
+    def get_messages_since(self, room, last_id):
+        """Messages of a room newer than last_id, from the shared in-memory buffers"""
+        return self.chat_store.get_messages_since(None if room == "전체" else room, last_id)
     
     def get_chat_statistics(self, club=None):
         """Get chat statistics"""
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
+        chat_df = self.chat_store.read(club if club and club != "전체" else None)
         
         if chat_df.empty:
             return {
@@ -183,12 +215,8 @@ class ChatSystem:
                 'messages_today': 0
             }
         
-        # Filter by club if specified
-        if club and club != "전체":
-            chat_df = chat_df[chat_df['club'] == club]
-        
         # Filter non-deleted messages
-        chat_df = chat_df[chat_df['deleted'] != True]
+        chat_df = chat_df[~chat_df['deleted'].map(is_deleted)]
         
         # Calculate statistics
         total_messages = len(chat_df)
@@ -196,7 +224,7 @@ class ChatSystem:
         
         # Messages today
         today = datetime.now().strftime('%Y-%m-%d')
-        messages_today = len(chat_df[chat_df['timestamp'].str.startswith(today)])
+        messages_today = len(chat_df[chat_df['timestamp'].astype(str).str.startswith(today)])
         
         return {
             'total_messages': total_messages,
@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime
+import streamlit as st
+from data_manager import add_write_listener
+from counter_store import counter_store, counter_key
+
+COMMENTS_TABLE = 'comments'
+COMMENT_PAGE_SIZE = 20
+
+
+class CommentStore:
+    """Board comments in the `comments` table with an in-memory post index.
+
+    The index maps post id -> that post's comments in posting order, so
+    showing a thread or counting comments for a page of posts never scans
+    the whole table. It is built on first use and kept current from the
+    DataManager write listener. Adding or deleting a comment also moves the
+    post's comment counter, which the board uses for 댓글순; when the
+    index is built the counters are set from it, so they never drift from
+    the comments actually stored.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_post = None  # post key -> list of comment dicts
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._by_post is not None:
+                return
+            self._by_post = {}
+            comments_df = st.session_state.data_manager.load_csv(COMMENTS_TABLE)
+            for comment in comments_df.to_dict('records'):
+                self._index(comment)
+            counts = {post: len(thread) for post, thread in self._by_post.items()}
+        counter_store.set_values('posts', 'comments', counts)
+
+    def sync_counters(self):
+        """Make sure the post comment counters have been set from the comments"""
+        self._ensure_loaded()
+
+    def _index(self, comment):
+        self._by_post.setdefault(counter_key(comment.get('post_id')), []).append(comment)
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener"""
+        if table != COMMENTS_TABLE:
+            return
+        with self._lock:
+            if self._by_post is None:
+                return
+            if records is None or columns is not None:
+                # Rewrites and edits are rare - rebuild on next read
+                self._by_post = None
+                return
+            for comment in records:
+                self._index(dict(comment))
+
+    def add_comment(self, post_id, username, content):
+        """Save a comment and bump the post's comment counter"""
+        comment = {
+            'post_id': post_id,
+            'username': username,
+            'content': content,
+            'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if not st.session_state.data_manager.add_record(COMMENTS_TABLE, comment):
+            return False
+        counter_store.increment('posts', post_id, 'comments')
+        return True
+
+    def delete_comment(self, comment_id, post_id):
+        """Delete a comment and lower the post's comment counter"""
+        self._ensure_loaded()
+        with self._lock:
+            thread = self._by_post.get(counter_key(post_id), [])
+            comment = next((c for c in thread if counter_key(c.get('id')) == counter_key(comment_id)), None)
+        if comment is None:
+            return False  # already deleted (or not this post's)
+        if not st.session_state.data_manager.delete_record(COMMENTS_TABLE, comment['id']):
+            return False
+        counter_store.increment('posts', post_id, 'comments', -1)
+        return True
+
+    def delete_post_comments(self, post_id):
+        """Delete every comment of a deleted post with one table write"""
+        self._ensure_loaded()
+        key = counter_key(post_id)
+        with self._lock:
+            if not self._by_post.get(key):
+                return True
+        data_manager = st.session_state.data_manager
+        comments_df = data_manager.load_csv(COMMENTS_TABLE)
+        return data_manager.save_csv(COMMENTS_TABLE, comments_df[comments_df['post_id'].map(counter_key) != key])
+
+    def get_comments(self, post_id, offset=0, limit=COMMENT_PAGE_SIZE):
+        """A page of a post's comments, newest first: (comments, total)"""
+        self._ensure_loaded()
+        with self._lock:
+            thread = self._by_post.get(counter_key(post_id), [])
+            total = len(thread)
+            end = max(total - offset, 0)
+            page = thread[max(end - limit, 0):end]
+        return [dict(comment) for comment in reversed(page)], total
+
+    def counts(self, post_ids):
+        """{post_id: number of comments} for several posts at once"""
+        self._ensure_loaded()
+        with self._lock:
+            return {post_id: len(self._by_post.get(counter_key(post_id), [])) for post_id in post_ids}
+
+
+# Global comment store instance
+comment_store = CommentStore()
+add_write_listener(comment_store.on_write)
@@ -0,0 +1,203 @@
+import os
+import json
+import threading
+import atexit
+import pandas as pd
+from storage_backend import get_storage_backend
+from error_handler import error_handler
+
+# Counter namespaces seeded from a table column on first run:
+# namespace -> (table, counter fields). Comment counts are then corrected
+# from the comments table by CommentStore.
+COUNTER_SEEDS = {
+    'posts': ('posts', ['likes', 'comments']),
+}
+
+# Counter changes are written to disk this many seconds after the last increment
+COUNTER_SAVE_DELAY = 1.0
+
+
+def counter_key(value):
+    """Normalize a row id so 3, 3.0 and '3' share one counter"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+class CounterStore:
+    """Atomic integer counters kept apart from the tables they count for.
+
+    Counters live in memory as {namespace: {row id: {field: value}}},
+    change under one lock with increment semantics, and are saved to
+    data/counters.json shortly after the last change. Liking a post is
+    then a dict update instead of a read-modify-write of posts.csv, and
+    two likes at once both count. Reads merge the counters over the
+    table's own (stale) columns.
+    """
+
+    def __init__(self, data_dir='data'):
+        self.storage = get_storage_backend(data_dir)
+        self.counter_file = os.path.join(data_dir, 'counters.json')
+        self._lock = threading.RLock()
+        self._counters = None
+        self._listeners = []
+        self._save_timer = None
+        atexit.register(self.save)
+
+    def add_listener(self, callback):
+        """Call callback(namespace, key, field, value) after each change"""
+        self._listeners.append(callback)
+
+    # -- loading ---------------------------------------------------------
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._counters is not None:
+                return
+            self._counters = {}
+            if os.path.exists(self.counter_file):
+                try:
+                    with open(self.counter_file, 'r', encoding='utf-8') as f:
+                        self._counters = json.load(f)
+                except (OSError, ValueError):
+                    self._counters = {}
+            seeded = False
+            for namespace, (table, fields) in COUNTER_SEEDS.items():
+                if namespace not in self._counters:
+                    self._seed(namespace, table, fields)
+                    seeded = True
+            if seeded:
+                self._schedule_save()
+
+    def _seed(self, namespace, table, fields):
+        """First run: take the current values from the table columns"""
+        counters = self._counters[namespace] = {}
+        if not self.storage.exists(table):
+            return
+        df = self.storage.read(table)
+        if df.empty or 'id' not in df.columns:
+            return
+        for field in fields:
+            if field not in df.columns:
+                continue
+            values = pd.to_numeric(df[field], errors='coerce').fillna(0).astype(int)
+            for row_id, value in zip(df['id'], values):
+                counters.setdefault(counter_key(row_id), {})[field] = int(value)
+
+    # -- changing --------------------------------------------------------
+
+    def increment(self, namespace, row_id, field, amount=1):
+        """Atomically add amount to a counter and return the new value"""
+        self._ensure_loaded()
+        key = counter_key(row_id)
+        with self._lock:
+            row = self._counters.setdefault(namespace, {}).setdefault(key, {})
+            row[field] = max(row.get(field, 0) + amount, 0)
+            value = row[field]
+            self._schedule_save()
+        self._notify(namespace, key, field, value)
+        return value
+
+    def discard(self, namespace, row_id):
+        """Drop the counters of a deleted row"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._counters.get(namespace, {}).pop(counter_key(row_id), None) is not None:
+                self._schedule_save()
+
+    def set_values(self, namespace, field, values):
+        """Set one field from {row id: value}; rows left out that hold the field drop to 0"""
+        self._ensure_loaded()
+        values = {counter_key(row_id): int(value) for row_id, value in values.items()}
+        changed = []
+        with self._lock:
+            rows = self._counters.setdefault(namespace, {})
+            keys = {key for key, row in rows.items() if field in row} | set(values)
+            for key in keys:
+                row = rows.setdefault(key, {})
+                value = values.get(key, 0)
+                if row.get(field) != value:
+                    row[field] = value
+                    changed.append((key, value))
+            if changed:
+                self._schedule_save()
+        for key, value in changed:
+            self._notify(namespace, key, field, value)
+        return len(changed)
+
+    def _notify(self, namespace, key, field, value):
+        for callback in list(self._listeners):
+            try:
+                callback(namespace, key, field, value)
+            except Exception as e:
+                error_handler.log_error(e, f"Counter listener failed for {namespace}")
+
+    def _schedule_save(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(COUNTER_SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        """Write all counters to data/counters.json"""
+        with self._lock:
+            self._save_timer = None
+            if self._counters is None:
+                return
+            tmp_path = self.counter_file + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._counters, f, ensure_ascii=False)
+                os.replace(tmp_path, self.counter_file)
+            except OSError as e:
+                print(f"카운터 저장 실패: {e}")
+
+    def reload(self):
+        """Drop the in-memory counters so they are read again from disk (after a restore)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._counters = None
+
+    def files(self):
+        """Paths of the saved counters, relative to the data dir, written fresh"""
+        self.save()
+        return [os.path.basename(self.counter_file)]
+
+    # -- reading ---------------------------------------------------------
+
+    def get(self, namespace, row_id, field, default=0):
+        self._ensure_loaded()
+        with self._lock:
+            return self._counters.get(namespace, {}).get(counter_key(row_id), {}).get(field, default)
+
+    def merge_record(self, namespace, record):
+        """Overlay the counters of one row onto a record dict (in place)"""
+        self._ensure_loaded()
+        with self._lock:
+            record.update(self._counters.get(namespace, {}).get(counter_key(record.get('id')), {}))
+        return record
+
+    def merge_frame(self, namespace, df):
+        """Overlay counters onto the matching columns of a table frame (in place)"""
+        self._ensure_loaded()
+        if df.empty or 'id' not in df.columns:
+            return df
+        with self._lock:
+            counters = self._counters.get(namespace, {})
+            keys = df['id'].map(counter_key)
+            fields = {field for row in counters.values() for field in row}
+            for field in fields:
+                current = pd.to_numeric(df[field], errors='coerce').fillna(0) if field in df.columns else 0
+                values = keys.map(lambda key: counters.get(key, {}).get(field))
+                df[field] = values.fillna(current).astype(int)
+        return df
+
+
+# Global counter store instance
+counter_store = CounterStore()
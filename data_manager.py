@@ -1,15 +1,113 @@
 import pandas as pd
 import os
+import atexit
+import threading
 from datetime import datetime
 import streamlit as st
 import warnings
 warnings.filterwarnings('ignore')
 from error_handler import error_handler
+from storage_backend import get_storage_backend, table_name
+from user_directory import user_directory
+from blob_store import blob_store
+
+# Process-wide write state, shared by every DataManager instance.
+# Streamlit runs each session on its own thread, so appends to the same
+# table must be serialized and id allocation must not race.
+_table_locks = {}
+_table_locks_guard = threading.Lock()
+_id_counters = {}
+
+# Parsed tables shared by all sessions, keyed by file path and validated
+# against (mtime_ns, size) so external edits are picked up as well.
+_table_cache = {}
+_table_cache_lock = threading.Lock()
+
+# Row updates patch the cached frame in place and are written back by a
+# background flush. While a table is dirty, the in-memory frame is the
+# source of truth. Maps filepath -> (storage backend, table name).
+_dirty_tables = {}
+_flush_timers = {}
+_id_index = {}
+WRITE_BEHIND_DELAY = 1.0  # seconds
+
+# Callbacks told about every write so derived in-memory views (aggregates,
+# indexes) can follow along without rereading the table. Each is called as
+# callback(table, records, columns):
+#   append  - records = appended dicts, columns = None
+#   update  - records = [{'id': ..., <changed values>}], columns = names touched
+#   rewrite - records = None, columns = None (save_csv, delete_record)
+_write_listeners = []
+
+
+def add_write_listener(callback):
+    """Register a callback notified after each write to any table"""
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+
+def _notify_write(filename, records=None, columns=None):
+    table = table_name(filename)
+    for callback in list(_write_listeners):
+        try:
+            callback(table, records, columns)
+        except Exception as e:
+            error_handler.log_error(e, f"Write listener for {table}")
+
+
+def _get_table_lock(filepath):
+    """Return the lock guarding writes to a single table file"""
+    with _table_locks_guard:
+        if filepath not in _table_locks:
+            _table_locks[filepath] = threading.RLock()
+        return _table_locks[filepath]
+
+
+def _id_key(value):
+    """Normalize an id so 3, 3.0 and numpy.int64(3) hit the same index slot"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer() and not isinstance(value, str):
+            return int(as_float)
+    except (TypeError, ValueError):
+        pass
+    return value
+
+
+def _flush_table(filepath):
+    """Write a dirty in-memory table back to storage"""
+    with _get_table_lock(filepath):
+        _flush_timers.pop(filepath, None)
+        entry = _dirty_tables.pop(filepath, None)
+        with _table_cache_lock:
+            cached = _table_cache.get(filepath)
+        if entry is None or cached is None:
+            return
+        storage, filename = entry
+        df = cached[1]
+        storage.write(filename, df)
+        stat = os.stat(filepath)
+        # The frame on disk is now exactly the cached one - keep it warm
+        with _table_cache_lock:
+            _table_cache[filepath] = ((stat.st_mtime_ns, stat.st_size), df)
+
+
+def flush_all_tables():
+    """Write every pending row update to storage immediately"""
+    for filepath in list(_dirty_tables):
+        timer = _flush_timers.get(filepath)
+        if timer is not None:
+            timer.cancel()
+        _flush_table(filepath)
+
+
+atexit.register(flush_all_tables)
 
 class DataManager:
     def __init__(self):
         self.data_dir = 'data'
         self.ensure_data_directory()
+        self.storage = get_storage_backend(self.data_dir)
         self.initialize_csv_files()
 
     def ensure_data_directory(self):
@@ -29,14 +127,15 @@ class DataManager:
             'schedule.csv': ['id', 'title', 'description', 'club', 'date', 'time', 'location', 'creator', 'created_date'],
             'votes.csv': ['id', 'title', 'description', 'options', 'club', 'creator', 'end_date', 'created_date'],
             'badges.csv': ['id', 'username', 'badge_name', 'badge_icon', 'description', 'awarded_date', 'awarded_by'],
-            'notifications.csv': ['id', 'username', 'title', 'message', 'type', 'read', 'created_date']
+            'notifications.csv': ['id', 'username', 'title', 'message', 'type', 'read', 'created_date', 'audience'],
+            'notification_reads.csv': ['id', 'notification_id', 'username', 'state', 'created_date'],
+            'comments.csv': ['id', 'post_id', 'username', 'content', 'created_date']
         }
 
         for filename, columns in csv_structures.items():
-            filepath = os.path.join(self.data_dir, filename)
-            if not os.path.exists(filepath):
+            if not self.storage.exists(filename):
                 df = pd.DataFrame(columns=columns)
-                df.to_csv(filepath, index=False, encoding='utf-8-sig')
+                self.storage.write(filename, df)
 
         # Initialize clubs.csv with default clubs
         self.initialize_clubs()
@@ -46,8 +145,7 @@ class DataManager:
 
     def initialize_clubs(self):
         """Initialize clubs with default data"""
-        clubs_file = os.path.join(self.data_dir, 'clubs.csv')
-        clubs_df = pd.read_csv(clubs_file, encoding='utf-8-sig')
+        clubs_df = self.storage.read('clubs')
 
         if clubs_df.empty:
             default_clubs = [
@@ -108,18 +206,34 @@ class DataManager:
             ]
 
             df = pd.DataFrame(default_clubs)
-            df.to_csv(clubs_file, index=False, encoding='utf-8-sig')
+            self.storage.write('clubs', df)
 
     def migrate_csv_files(self):
         """Migrate existing CSV files to add missing columns"""
-        # Add image_data column to posts.csv if missing
-        posts_file = os.path.join(self.data_dir, 'posts.csv')
-        if os.path.exists(posts_file):
+        # Add image_data column to posts.csv if missing, and move inline
+        # base64 images into the blob store so posts only keep their hashes
+        if self.storage.exists('posts'):
             try:
-                posts_df = pd.read_csv(posts_file, encoding='utf-8-sig')
+                posts_df = self.storage.read('posts')
+                changed = False
                 if 'image_data' not in posts_df.columns:
                     posts_df['image_data'] = ''
-                    posts_df.to_csv(posts_file, index=False, encoding='utf-8-sig')
+                    changed = True
+                migrated = sum(blob_store.migrate_column(posts_df, column) for column in ('image_path', 'image_data'))
+                if migrated:
+                    print(f"🖼️ 게시글 이미지 {migrated}건을 blob 저장소로 옮겼습니다")
+                if changed or migrated:
+                    self.storage.write('posts', posts_df)
+            except Exception:
+                pass  # Ignore errors during migration
+
+        # Add audience column to notifications.csv (shared notifications)
+        if self.storage.exists('notifications'):
+            try:
+                if 'audience' not in self.storage.header('notifications'):
+                    notifications_df = self.storage.read('notifications')
+                    notifications_df['audience'] = ''
+                    self.storage.write('notifications', notifications_df)
             except Exception:
                 pass  # Ignore errors during migration
 
@@ -198,35 +312,104 @@ class DataManager:
         )
     
     def _load_csv_internal(self, filename):
-        """Internal CSV loading logic"""
-        if not filename.endswith('.csv'):
-            filename += '.csv'
-        filepath = os.path.join(self.data_dir, filename)
+        """Internal CSV loading logic, served from the shared table cache"""
+        filepath = self._table_path(filename)
+        with _get_table_lock(filepath):
+            df = self._master_frame(filename)
+            if df is None:
+                return pd.DataFrame()
+            # Hand out a copy so callers can keep mutating their frame freely
+            return df.copy()
 
-        if not os.path.exists(filepath):
-            return pd.DataFrame()
+    def _master_frame(self, filename):
+        """Return the shared cached frame for a table (not a copy).
 
-        # Check if file is empty or has only headers
-        with open(filepath, 'r', encoding='utf-8-sig') as f:
-            content = f.read().strip()
-            lines = content.split('\n')
-            
-            # If file has only headers or is empty, return empty DataFrame with columns
-            if len(lines) <= 1 or (len(lines) == 2 and lines[1].strip() == ''):
-                if len(lines) >= 1 and lines[0].strip():
-                    columns = [col.strip() for col in lines[0].split(',')]
-                    return pd.DataFrame(columns=columns)
-                else:
-                    return pd.DataFrame()
-        
-        # Load with safe parsing
-        df = pd.read_csv(filepath, encoding='utf-8-sig')
+        Callers must hold the table lock and must not mutate the frame
+        unless they go through the write-behind path.
+        """
+        filepath = self._table_path(filename)
+
+        with _table_cache_lock:
+            cached = _table_cache.get(filepath)
+        if cached is not None and filepath in _dirty_tables:
+            return cached[1]
+
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        df = self._read_table(filename)
+        with _table_cache_lock:
+            _table_cache[filepath] = (version, df)
+            _id_index.pop(filepath, None)
+        return df
+
+    def _row_positions(self, filename, df, record_id):
+        """Look up the row labels of a record through the per-table id index"""
+        filepath = self._table_path(filename)
+        index = _id_index.get(filepath)
+        if index is None:
+            index = {}
+            if 'id' in df.columns:
+                for label, value in zip(df.index, df['id']):
+                    index.setdefault(_id_key(value), []).append(label)
+            _id_index[filepath] = index
+        return index.get(_id_key(record_id), [])
+
+    def _schedule_flush(self, filename):
+        """Mark a table dirty and make sure a write-behind flush is pending"""
+        filepath = self._table_path(filename)
+        _dirty_tables[filepath] = (self.storage, filename)
+        if filepath not in _flush_timers:
+            timer = threading.Timer(WRITE_BEHIND_DELAY, _flush_table, args=(filepath,))
+            timer.daemon = True
+            _flush_timers[filepath] = timer
+            timer.start()
+
+    def flush(self, filename=None):
+        """Persist pending row updates now (all tables if no name is given)"""
+        if filename is None:
+            flush_all_tables()
+            return
+        filepath = self._table_path(filename)
+        timer = _flush_timers.get(filepath)
+        if timer is not None:
+            timer.cancel()
+        _flush_table(filepath)
+
+    def _invalidate_cache(self, filepath):
+        """Drop a table from the shared cache after a write"""
+        with _table_cache_lock:
+            _table_cache.pop(filepath, None)
+            _id_index.pop(filepath, None)
+
+    def clear_csv_cache(self):
+        """Clear the shared table cache for every session"""
+        flush_all_tables()
+        with _table_cache_lock:
+            _table_cache.clear()
+            _id_index.clear()
+
+    def _read_table(self, filename):
+        """Read a table through the storage backend and parse its datetimes"""
+        df = self.storage.read(filename)
+        if df.empty:
+            return df
         
         # Handle datetime columns safely
         datetime_columns = ['created_date', 'submitted_date', 'awarded_date', 'timestamp', 'due_date', 'end_date', 'date']
         for col in datetime_columns:
             if col in df.columns and not df.empty:
-                df[col] = df[col].apply(error_handler.safe_datetime_parse)
+                if pd.api.types.is_datetime64_any_dtype(df[col]):
+                    # Columnar backends keep the type - only blanks need filling
+                    df[col] = df[col].fillna(datetime.now())
+                else:
+                    df[col] = error_handler.safe_datetime_parse_series(df[col])
         
         return df
 
@@ -240,111 +423,220 @@ class DataManager:
     
     def _save_csv_internal(self, filename, dataframe):
         """Internal CSV saving logic"""
-        if not filename.endswith('.csv'):
-            filename += '.csv'
-        filepath = os.path.join(self.data_dir, filename)
-        
         # Ensure dataframe is not None
         if dataframe is None:
             dataframe = pd.DataFrame()
         
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        
-        dataframe.to_csv(filepath, index=False, encoding='utf-8-sig')
+        self._write_table(filename, dataframe)
+        _notify_write(filename)
         return True
 
+    def _write_table(self, filename, dataframe):
+        """Replace a table on storage without notifying the write listeners"""
+        filepath = self._table_path(filename)
+        with _get_table_lock(filepath):
+            # This frame supersedes any pending row updates
+            timer = _flush_timers.pop(filepath, None)
+            if timer is not None:
+                timer.cancel()
+            _dirty_tables.pop(filepath, None)
+            self.storage.write(filename, dataframe)
+            self._invalidate_cache(filepath)
+            # A full rewrite may carry ids we have not seen - rescan lazily
+            _id_counters.pop(filepath, None)
+
+    def reload_tables(self, filenames):
+        """Forget the in-memory state of tables replaced on disk (e.g. by a restore).
+
+        Pending row updates, cached frames and id counters are dropped, and
+        the write listeners are told the tables were rewritten.
+        """
+        for filename in filenames:
+            filepath = self._table_path(filename)
+            with _get_table_lock(filepath):
+                timer = _flush_timers.pop(filepath, None)
+                if timer is not None:
+                    timer.cancel()
+                _dirty_tables.pop(filepath, None)
+                self._invalidate_cache(filepath)
+                _id_counters.pop(filepath, None)
+            _notify_write(filename)
+
     def get_user_clubs(self, username):
         """Get clubs that user belongs to"""
         try:
-            users_df = pd.read_csv(os.path.join(self.data_dir, 'users.csv'), encoding='utf-8-sig')
-            user_clubs = users_df[users_df['username'] == username][['club_name', 'club_role']]
-            user_clubs = user_clubs.rename(columns={'club_role': 'role'})
-            return user_clubs
+            return pd.DataFrame(user_directory.get_user_clubs(username), columns=['club_name', 'role'])
         except:
             return pd.DataFrame()
 
+    def _table_path(self, filename):
+        """Resolve a table name to its file path"""
+        return self.storage.table_path(filename)
+
+    def _scan_max_id(self, filename):
+        """Read only the id column of a table to find its current max id"""
+        try:
+            ids = self.storage.read_column(filename, 'id')
+        except (FileNotFoundError, ValueError, KeyError, pd.errors.EmptyDataError):
+            return 0
+        ids = pd.to_numeric(ids, errors='coerce').dropna()
+        return int(ids.max()) if not ids.empty else 0
+
+    def _next_id(self, filename):
+        """Allocate the next id from the in-memory max-id counter"""
+        filepath = self._table_path(filename)
+        with _get_table_lock(filepath):
+            if filepath not in _id_counters:
+                _id_counters[filepath] = self._scan_max_id(filename)
+            _id_counters[filepath] += 1
+            return _id_counters[filepath]
+
+    def _observe_id(self, filepath, record_id):
+        """Keep the counter ahead of explicitly supplied ids"""
+        if filepath not in _id_counters:
+            return
+        try:
+            _id_counters[filepath] = max(_id_counters[filepath], int(record_id))
+        except (TypeError, ValueError):
+            pass
+
     def generate_id(self, filename):
         """Generate unique ID for new records"""
-        df = self.load_csv(filename)
-        if df.empty or 'id' not in df.columns:
-            return 1
-        return df['id'].max() + 1 if not df['id'].isna().all() else 1
+        return self._next_id(filename)
 
     def add_record(self, filename, record):
-        """Add new record to CSV file"""
+        """Append new record to a table"""
+        return self.add_records(filename, [record]) == 1
+
+    def add_records(self, filename, records, audit=True):
+        """Append several records with one id pass and a single write.
+
+        Ids and created_date are filled into the given dicts, as with
+        add_record. Returns the number of records written. audit=False
+        writes the rows as given (no created_date, no activity-log entry);
+        the logging pipeline uses it for its own tables.
+        """
+        if not records:
+            return 0
         try:
-            df = self.load_csv(filename)
+            filepath = self._table_path(filename)
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-            # Generate ID if not provided
-            if 'id' not in record:
-                record['id'] = self.generate_id(filename)
+            with _get_table_lock(filepath):
+                # Appending behind a dirty in-memory table would be lost on flush
+                if filepath in _dirty_tables:
+                    self.flush(filename)
 
-            # Add timestamp if not provided
-            if 'created_date' not in record:
-                record['created_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                for record in records:
+                    # Generate ID if not provided
+                    if 'id' not in record:
+                        record['id'] = self._next_id(filename)
+                    else:
+                        self._observe_id(filepath, record['id'])
+
+                    # Add timestamp if not provided
+                    if audit and 'created_date' not in record:
+                        record['created_date'] = now
+
+                saved = self.storage.append_many(filename, records)
+                self._invalidate_cache(filepath)
+                if not saved:
+                    # New columns - rewrite the table once with the wider header.
+                    # Listeners still see a plain append, sent below
+                    df = self.load_csv(filename)
+                    df = pd.concat([df, pd.DataFrame(records)], ignore_index=True)
+                    self._write_table(filename, df)
+                    saved = True
+
+            # Listeners run outside the table lock so they may read other tables
+            if saved:
+                _notify_write(filename, records)
 
-            df = pd.concat([df, pd.DataFrame([record])], ignore_index=True)
-            
             # Log data access
-            if hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
+            if audit and hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
                 st.session_state.logging_system.log_data_access(
                     st.session_state.user.get('username', 'System'),
                     filename,
                     'INSERT',
-                    1
+                    len(records)
                 )
-            
-            return self.save_csv(filename, df)
+
+            return len(records) if saved else 0
         except Exception as e:
             # Log error
-            if hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
+            if audit and hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
                 st.session_state.logging_system.log_error(
                     st.session_state.user.get('username', 'System'),
                     'Database Error',
                     str(e),
-                    f"add_record to {filename}"
+                    f"add_records to {filename}"
                 )
-            return False
+            return 0
 
     def update_record(self, filename, record_id, updates):
-        """Update existing record in CSV file"""
+        """Update a single record in place; the table is written back shortly after"""
+        return self.update_records(filename, {record_id: updates}) == 1
+
+    def update_records(self, filename, updates_by_id):
+        """Apply {record_id: updates} in place with a single write-behind flush.
+
+        Returns the number of records that were found and updated.
+        """
+        if not updates_by_id:
+            return 0
         try:
-            df = self.load_csv(filename)
-            if df.empty:
-                return False
-
-            # Find and update the record
-            mask = df['id'] == record_id
-            if mask.any():
-                for key, value in updates.items():
-                    # Handle type conversion carefully
-                    if key in df.columns:
-                        try:
-                            # If column has a specific dtype and value is compatible, convert
-                            if df[key].dtype != 'object' and pd.notna(value):
-                                if df[key].dtype in ['int64', 'float64'] and str(value).replace('.', '').replace('-', '').isdigit():
-                                    value = pd.to_numeric(value, errors='coerce')
-                            df.loc[mask, key] = value
-                        except (ValueError, TypeError):
-                            # If conversion fails, convert column to object type
-                            df[key] = df[key].astype('object')
-                            df.loc[mask, key] = value
-                    else:
-                        df.loc[mask, key] = value
-
-                # Log data access
-                if hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
-                    st.session_state.logging_system.log_data_access(
-                        st.session_state.user.get('username', 'System'),
-                        filename,
-                        'UPDATE',
-                        1
-                    )
-                
-                # Save updated data
-                return self.save_csv(filename, df)
-            return False
+            filepath = self._table_path(filename)
+            updated_count = 0
+            with _get_table_lock(filepath):
+                df = self._master_frame(filename)
+                if df is None or df.empty:
+                    return 0
+
+                for record_id, updates in updates_by_id.items():
+                    # Find the record through the id index instead of a full-column mask
+                    rows = self._row_positions(filename, df, record_id)
+                    if not rows:
+                        continue
+
+                    for key, value in updates.items():
+                        # Handle type conversion carefully
+                        if key in df.columns:
+                            try:
+                                # If column has a specific dtype and value is compatible, convert
+                                if df[key].dtype != 'object' and pd.notna(value):
+                                    if df[key].dtype in ['int64', 'float64'] and str(value).replace('.', '').replace('-', '').isdigit():
+                                        value = pd.to_numeric(value, errors='coerce')
+                                df.loc[rows, key] = value
+                            except (ValueError, TypeError):
+                                # If conversion fails, convert column to object type
+                                df[key] = df[key].astype('object')
+                                df.loc[rows, key] = value
+                        else:
+                            df.loc[rows, key] = value
+
+                        if key == 'id':
+                            _id_index.pop(filepath, None)
+
+                    updated_count += 1
+
+                if updated_count:
+                    self._schedule_flush(filename)
+
+            if updated_count:
+                columns = {key for updates in updates_by_id.values() for key in updates}
+                changes = [dict(updates, id=record_id) for record_id, updates in updates_by_id.items()]
+                _notify_write(filename, changes, columns)
+
+            # Log data access
+            if updated_count and hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
+                st.session_state.logging_system.log_data_access(
+                    st.session_state.user.get('username', 'System'),
+                    filename,
+                    'UPDATE',
+                    updated_count
+                )
+
+            return updated_count
         except Exception as e:
             # Log error
             if hasattr(st.session_state, 'logging_system') and hasattr(st.session_state, 'user'):
@@ -352,9 +644,9 @@ class DataManager:
                     st.session_state.user.get('username', 'System'),
                     'Database Error',
                     str(e),
-                    f"update_record in {filename}"
+                    f"update_records in {filename}"
                 )
-            return False
+            return 0
 
     def delete_record(self, filename, record_id):
         """Delete record from CSV file"""
@@ -391,34 +683,16 @@ class DataManager:
         from datetime import datetime
 
         try:
+            # Pending row updates have to be on disk before we zip the files
+            self.flush()
             backup_filename = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
 
             with zipfile.ZipFile(backup_filename, 'w') as zipf:
                 for filename in os.listdir(self.data_dir):
-                    if filename.endswith('.csv'):
+                    if filename.endswith(self.storage.extension):
                         zipf.write(os.path.join(self.data_dir, filename), filename)
 
             return backup_filename
         except Exception as e:
             st.error(f"Backup error: {e}")
             return None
-# Performance optimizations added to data_manager.py
-def optimized_load_csv(self, filename, use_cache=True):
-    """Optimized CSV loading with caching"""
-    cache_key = f"csv_cache_{filename}"
-    
-    if use_cache and hasattr(st.session_state, cache_key):
-        return getattr(st.session_state, cache_key)
-    
-    df = self._load_csv_internal(filename)
-    
-    if use_cache:
-        setattr(st.session_state, cache_key, df)
-    
-    return df
-
-def clear_csv_cache(self):
-    """Clear CSV cache"""
-    cache_keys = [key for key in st.session_state.keys() if key.startswith('csv_cache_')]
-    for key in cache_keys:
-        del st.session_state[key]
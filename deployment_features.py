@@ -86,7 +86,7 @@ class DeploymentFeatures:
         
         with col2:
             # Activity heatmap
-            logs_df = st.session_state.data_manager.load_csv('logs')
+            logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
             if not logs_df.empty and 'timestamp' in logs_df.columns:
                 logs_df['hour'] = pd.to_datetime(logs_df['timestamp']).dt.hour
                 hourly_activity = logs_df.groupby('hour').size()
@@ -336,7 +336,7 @@ class DeploymentFeatures:
         """Show user engagement metrics"""
         st.markdown("**참여도 지표:**")
         
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
         if not logs_df.empty and 'username' in logs_df.columns:
             user_logs = logs_df[logs_df['username'] == user['username']]
             if not user_logs.empty:
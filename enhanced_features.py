@@ -81,23 +81,13 @@ class EnhancedFeatures:
         """Recent notifications widget"""
         st.markdown("##### 🔔 최근 알림")
         
-        notifications_df = st.session_state.data_manager.load_csv('notifications')
+        notifications = st.session_state.notification_system.get_latest_notifications(user['username'], 3)
         
-        if notifications_df.empty:
+        if not notifications:
             st.info("알림이 없습니다")
             return
         
-        # Check if recipient column exists, if not use a default filtering approach
-        if 'recipient' in notifications_df.columns:
-            user_notifications = notifications_df[
-                (notifications_df['recipient'] == user['username']) |
-                (notifications_df['recipient'] == 'all')
-            ].sort_values('created_date', ascending=False)
-        else:
-            # Fallback if recipient column doesn't exist
-            user_notifications = notifications_df.sort_values('created_date', ascending=False)
-        
-        for _, notif in user_notifications.head(3).iterrows():
+        for notif in notifications:
             st.markdown(f"• {notif['title']}")
     
     def show_achievement_widget(self, user):
@@ -105,7 +95,7 @@ class EnhancedFeatures:
         st.markdown("##### 🏆 최근 성과")
         
         user_points = st.session_state.gamification_system.calculate_user_points(user['username'])
-        user_level = st.session_state.gamification_system.calculate_level(user_points)
+        user_level = st.session_state.gamification_system.calculate_user_level(user['username'])
         
         error_handler.wrap_streamlit_component(st.metric, "레벨", user_level)
         error_handler.wrap_streamlit_component(st.metric, "포인트", user_points)
@@ -186,7 +176,7 @@ class EnhancedFeatures:
         st.markdown("#### 📊 활동 패턴")
         
         # Analyze activity by day of week
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
         user_logs = logs_df[logs_df['username'] == user['username']] if not logs_df.empty else pd.DataFrame()
         
         if user_logs.empty:
@@ -306,7 +296,7 @@ class EnhancedFeatures:
             error_handler.wrap_streamlit_component(st.metric, "게시글 작성", len(month_posts))
         
         with col4:
-            total_points = st.session_state.gamification_system.calculate_user_points(user['username'])
+            total_points = st.session_state.gamification_system.get_lifetime_points(user['username'])
             error_handler.wrap_streamlit_component(st.metric, "누적 포인트", total_points)
     
     def generate_assignment_report(self, user):
@@ -401,7 +391,7 @@ class EnhancedFeatures:
         st.markdown("##### 💬 참여도 분석")
         
         # Chat participation
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
+        chat_df = st.session_state.chat_system.chat_store.read()
         user_chats = chat_df[
             chat_df['username'] == user['username']
         ] if not chat_df.empty else pd.DataFrame()
@@ -507,7 +497,7 @@ class EnhancedFeatures:
                 })
         
         # Participation recommendation
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
+        chat_df = st.session_state.chat_system.chat_store.read()
         recent_chats = chat_df[
             (chat_df['username'] == user['username']) &
             (chat_df['timestamp'] >= (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'))
@@ -3,11 +3,45 @@ import pandas as pd
 from datetime import datetime
 import traceback
 import logging
+import threading
+import hashlib
+import time
+import atexit
+from collections import deque
+from storage_backend import get_storage_backend
+
+# Error sink settings: errors are buffered in memory (oldest dropped once
+# ERROR_BUFFER_SIZE is reached) and appended in the background every
+# ERROR_FLUSH_INTERVAL seconds. Identical tracebacks within
+# ERROR_DEDUP_WINDOW seconds are written once with a repeat count.
+ERROR_BUFFER_SIZE = 1000
+ERROR_FLUSH_INTERVAL = 2.0
+ERROR_DEDUP_WINDOW = 60.0
+ERROR_LOG_MAX_ROWS = 1000
 
 class ErrorHandler:
+    """Error helpers plus the buffered error_log sink.
+
+    Each instance runs its own writer thread, so the app uses the single
+    module-level `error_handler` rather than creating more.
+    """
+
     def __init__(self):
-        self.error_log_file = 'data/error_log.csv'
+        self.storage = get_storage_backend('data')
+        self.error_log_file = self.storage.table_path('error_log')
         self.initialize_error_log()
+
+        # Errors go to a ring buffer that a background thread appends to disk
+        self._pending = deque(maxlen=ERROR_BUFFER_SIZE)
+        self._recent = {}  # traceback hash -> [first_seen, entry, repeats]
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._dropped_count = 0
+        self._log_rows = None  # error_log row count, read once on the first write
+        self._writer = threading.Thread(target=self._writer_loop, name='error-log-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.flush_errors)
     
     def initialize_error_log(self):
         """Initialize error log CSV file"""
@@ -16,12 +50,12 @@ class ErrorHandler:
             if not os.path.exists('data'):
                 os.makedirs('data')
             
-            if not os.path.exists(self.error_log_file):
+            if not self.storage.exists('error_log'):
                 error_df = pd.DataFrame(columns=[
                     'timestamp', 'error_type', 'error_message', 'traceback',
                     'user', 'context', 'severity'
                 ])
-                error_df.to_csv(self.error_log_file, index=False, encoding='utf-8-sig')
+                self.storage.write('error_log', error_df)
         except Exception:
             pass  # Fail silently to avoid cascading errors
     
@@ -34,45 +68,106 @@ class ErrorHandler:
             return default_return
     
     def log_error(self, error, context="", severity="Medium"):
-        """Log error to CSV file"""
+        """Buffer an error for the background writer (never touches disk)"""
         try:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             user = getattr(st.session_state, 'user', {}).get('username', 'Unknown') if hasattr(st.session_state, 'user') else 'Unknown'
-            
+            error_traceback = traceback.format_exc()
+
             error_entry = {
                 'timestamp': timestamp,
                 'error_type': type(error).__name__,
                 'error_message': str(error),
-                'traceback': traceback.format_exc(),
+                'traceback': error_traceback,
                 'user': user,
                 'context': context,
                 'severity': severity
             }
-            
-            # Read existing errors
-            try:
-                error_df = pd.read_csv(self.error_log_file, encoding='utf-8-sig')
-            except:
-                error_df = pd.DataFrame()
-            
-            # Add new error
-            new_error_df = pd.DataFrame([error_entry])
-            if not error_df.empty:
-                error_df = pd.concat([error_df, new_error_df], ignore_index=True)
-            else:
-                error_df = new_error_df
-            
-            # Keep only last 1000 errors
-            if len(error_df) > 1000:
-                error_df = error_df.tail(1000)
-            
-            # Save to CSV
-            error_df.to_csv(self.error_log_file, index=False, encoding='utf-8-sig')
-            
+
+            key = hashlib.md5(
+                f"{error_entry['error_type']}|{error_entry['error_message']}|{context}|{error_traceback}".encode('utf-8', 'replace')
+            ).hexdigest()
+            now = time.monotonic()
+
+            with self._buffer_lock:
+                seen = self._recent.get(key)
+                if seen is not None and now - seen[0] < ERROR_DEDUP_WINDOW:
+                    # A repeat within the window is only counted, not written
+                    seen[2] += 1
+                    return
+                if seen is not None and seen[2]:
+                    self._pending.append(self._repeat_summary(seen))
+                self._recent[key] = [now, error_entry, 0]
+
+                if len(self._pending) == self._pending.maxlen:
+                    self._dropped_count += 1
+                self._pending.append(error_entry)
+                if len(self._pending) >= ERROR_BUFFER_SIZE // 2:
+                    # Flush early rather than let a burst push entries out of the buffer
+                    self._wake.set()
+
         except Exception:
             # Fail silently to avoid cascading errors
             pass
-    
+
+    @staticmethod
+    def _repeat_summary(seen):
+        """Error entry standing in for the repeats suppressed by dedup"""
+        entry = dict(seen[1])
+        entry['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        entry['error_message'] = f"{entry['error_message']} (최근 {int(ERROR_DEDUP_WINDOW)}초 동안 {seen[2]}회 반복)"
+        return entry
+
+    def _take_pending(self, flush_repeats=False):
+        """Swap out the buffered errors plus summaries for expired repeats"""
+        now = time.monotonic()
+        with self._buffer_lock:
+            batch = list(self._pending)
+            self._pending.clear()
+            for key, seen in list(self._recent.items()):
+                if flush_repeats or now - seen[0] >= ERROR_DEDUP_WINDOW:
+                    if seen[2]:
+                        batch.append(self._repeat_summary(seen))
+                    del self._recent[key]
+            if self._dropped_count:
+                print(f"⚠️ 오류 버퍼가 가득 차 {self._dropped_count}개 오류를 버렸습니다")
+                self._dropped_count = 0
+        return batch
+
+    def _writer_loop(self):
+        """Append buffered errors every ERROR_FLUSH_INTERVAL seconds"""
+        while True:
+            self._wake.wait(ERROR_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._write_batch(self._take_pending())
+
+    def _write_batch(self, batch):
+        """Append a batch to error_log, trimming the table only once it has
+        grown well past ERROR_LOG_MAX_ROWS"""
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                if not self.storage.append_many('error_log', batch):
+                    error_df = pd.concat([self.storage.read('error_log'), pd.DataFrame(batch)], ignore_index=True)
+                    self.storage.write('error_log', error_df)
+                    self._log_rows = len(error_df)
+                elif self._log_rows is None:
+                    self._log_rows = len(self.storage.read_column('error_log', 'timestamp'))
+                else:
+                    self._log_rows += len(batch)
+
+                if self._log_rows > 2 * ERROR_LOG_MAX_ROWS:
+                    error_df = self.storage.read('error_log').tail(ERROR_LOG_MAX_ROWS)
+                    self.storage.write('error_log', error_df)
+                    self._log_rows = len(error_df)
+            except Exception as e:
+                print(f"오류 로그 기록 실패: {e}")
+
+    def flush_errors(self):
+        """Write every buffered error now (called on shutdown)"""
+        self._write_batch(self._take_pending(flush_repeats=True))
+
     def safe_datetime_parse(self, date_value):
         """Safely parse datetime values"""
         if pd.isna(date_value) or date_value is None:
@@ -109,6 +204,54 @@ class ErrorHandler:
         except Exception:
             return datetime.now()
     
+    def safe_datetime_parse_series(self, values):
+        """Vectorized safe_datetime_parse over a whole column.
+
+        Each format is tried on the still-unparsed remainder of the column
+        at once; only values no format matches go through the per-cell
+        fallback. Blanks become datetime.now(), as with safe_datetime_parse.
+        """
+        result = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        if values.empty:
+            return result
+
+        strings = values.astype(str).str.strip()
+        blank = values.isna() | strings.str.lower().isin(['', 'nan', 'none'])
+        pending = ~blank
+
+        formats = [
+            '%Y-%m-%d %H:%M:%S',
+            '%Y-%m-%d %H:%M:%S.%f',
+            '%Y-%m-%d',
+            '%m/%d/%Y',
+            '%d/%m/%Y',
+            '%Y/%m/%d'
+        ]
+
+        for fmt in formats:
+            if not pending.any():
+                break
+            parsed = pd.to_datetime(strings[pending], format=fmt, errors='coerce')
+            matched = parsed.index[parsed.notna()]
+            result.loc[matched] = parsed.loc[matched]
+            pending.loc[matched] = False
+
+        if pending.any():
+            fallback = values[pending].apply(self.safe_datetime_parse)
+            try:
+                converted = pd.to_datetime(fallback, errors='coerce')
+            except (TypeError, ValueError):
+                converted = None
+            if converted is not None and not (converted.isna() & fallback.notna()).any():
+                result.loc[fallback.index] = converted
+            else:
+                # Out-of-range or mixed values - keep them as Python objects
+                result = result.astype('object')
+                result.loc[fallback.index] = fallback
+
+        result.loc[blank] = datetime.now()
+        return result
+    
     def safe_dataframe_operation(self, operation_func, df, *args, **kwargs):
         """Safely perform DataFrame operations"""
         try:
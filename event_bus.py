@@ -0,0 +1,95 @@
+import threading
+import queue
+import time
+import atexit
+from collections import deque
+from error_handler import error_handler
+
+# Events kept for sessions catching up with events_since
+EVENT_HISTORY = 1000
+
+# Topics published by the app
+TOPIC_CHAT = 'chat.message'
+TOPIC_CHAT_DELETE = 'chat.delete'
+TOPIC_NOTIFICATION = 'notification'
+TOPIC_ATTENDANCE = 'attendance.checkin'
+
+
+class EventBus:
+    """Thread-safe in-process publish/subscribe bus shared by all sessions.
+
+    publish() stamps an event with an increasing sequence number, keeps it
+    in a bounded history and hands it to a single dispatcher thread, which
+    calls the topic's subscribers - so slow work such as persistence runs
+    off the publishing request. Streamlit sessions cannot be pushed to, so
+    live views keep the last sequence they saw and ask for events_since().
+    """
+
+    def __init__(self, history=EVENT_HISTORY):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history = deque(maxlen=history)
+        self._subscribers = {}  # topic -> list of callbacks
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._dispatch_loop, name='event-bus', daemon=True)
+        self._worker.start()
+        atexit.register(self.flush)
+
+    def subscribe(self, topic, callback):
+        """Call callback(event) on the dispatcher thread for each event of a topic"""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic, payload):
+        """Publish an event and return its sequence number"""
+        with self._lock:
+            self._seq += 1
+            event = {'seq': self._seq, 'topic': topic, 'payload': payload, 'time': time.time()}
+            self._history.append(event)
+            has_subscribers = bool(self._subscribers.get(topic))
+        if has_subscribers:
+            self._queue.put(event)
+        return event['seq']
+
+    def _dispatch_loop(self):
+        while True:
+            event = self._queue.get()
+            try:
+                with self._lock:
+                    callbacks = list(self._subscribers.get(event['topic'], []))
+                for callback in callbacks:
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        error_handler.log_error(e, f"Event subscriber failed for {event['topic']}")
+            finally:
+                self._queue.task_done()
+
+    def events_since(self, seq, topics=None):
+        """Events after a sequence number, optionally limited to some topics"""
+        with self._lock:
+            return [
+                event for event in self._history
+                if event['seq'] > seq and (topics is None or event['topic'] in topics)
+            ]
+
+    def covers(self, seq):
+        """Whether the history still holds every event after seq"""
+        with self._lock:
+            return not self._history or self._history[0]['seq'] <= seq + 1
+
+    def last_seq(self):
+        with self._lock:
+            return self._seq
+
+    def flush(self, timeout=5.0):
+        """Wait (up to timeout seconds) for queued events to be delivered"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
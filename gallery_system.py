@@ -1,11 +1,13 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import base64
 import os
 from PIL import Image
 import io
 from error_handler import error_handler
+from blob_store import blob_store
+from image_pipeline import image_pipeline
+from counter_store import counter_store
 
 class GallerySystem:
     def __init__(self):
@@ -46,15 +48,20 @@ class GallerySystem:
     
     def show_gallery_from_posts(self, user):
         """Display gallery items from board posts with images"""
-        posts_df = self.data_manager.load_csv('posts')
+        posts_df = counter_store.merge_frame('posts', self.data_manager.load_csv('posts'))
         
         if posts_df.empty:
             st.info("아직 업로드된 이미지가 없습니다.")
             return
         
-        # Filter posts with images
-        if 'image_data' in posts_df.columns:
-            image_posts = posts_df[posts_df['image_data'].notna() & (posts_df['image_data'] != '')]
+        # Filter posts with images (board uploads are in image_path)
+        image_columns = [col for col in ('image_data', 'image_path') if col in posts_df.columns]
+        if image_columns:
+            has_image = pd.Series(False, index=posts_df.index)
+            for col in image_columns:
+                # Only string references count - posts without images hold 0.0/NaN here
+                has_image |= posts_df[col].map(lambda value: bool(blob_store.refs(value)))
+            image_posts = posts_df[has_image]
         else:
             image_posts = pd.DataFrame()
         
@@ -73,11 +80,10 @@ class GallerySystem:
     def show_gallery_item(self, post, user):
         """Display a single gallery item"""
         try:
-            # Display image
-            if 'image_data' in post and post.get('image_data') and str(post.get('image_data', '')).strip():
-                image_data = base64.b64decode(post['image_data'])
-                image = Image.open(io.BytesIO(image_data))
-                st.image(image, caption=post['title'][:50], use_column_width=True)
+            # Display the grid rendition of the post's first image
+            image_refs = blob_store.refs(post.get('image_data')) or blob_store.refs(post.get('image_path'))
+            if image_refs:
+                st.image(image_pipeline.get(image_refs[0], 'grid'), caption=post['title'][:50], use_column_width=True)
             
             # Post info
             st.markdown(f"""
@@ -96,21 +102,21 @@ class GallerySystem:
             st.error(f"이미지 표시 중 오류가 발생했습니다: {str(e)}")
     
     def process_uploaded_image(self, uploaded_file):
-        """Process uploaded image and return base64 encoded string"""
+        """Process uploaded image, store it in the blob store and return its hash"""
         if uploaded_file is not None:
             try:
                 image = Image.open(uploaded_file)
                 
-                # Resize image if too large
-                max_size = (800, 600)
+                # Resize image if too large (the original the renditions are made from)
+                max_size = (1600, 1200)
                 image.thumbnail(max_size, Image.Resampling.LANCZOS)
                 
-                # Convert to base64
+                # Store the PNG bytes once; posts only keep the hash
                 buffer = io.BytesIO()
                 image.save(buffer, format='PNG')
-                image_data = base64.b64encode(buffer.getvalue()).decode()
-                
-                return image_data
+                image_ref = blob_store.put(buffer.getvalue())
+                image_pipeline.submit(image_ref)
+                return image_ref
             except Exception as e:
                 st.error(f"이미지 처리 중 오류가 발생했습니다: {str(e)}")
                 return None
@@ -2,19 +2,12 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+from activity_stats import activity_stats, ACTIVITY_SOURCES
+from points_ledger import points_ledger, POINT_VALUES
 
 class GamificationSystem:
     def __init__(self):
-        self.point_values = {
-            '출석': 10,
-            '과제제출': 20,
-            '게시글작성': 5,
-            '댓글작성': 2,
-            '퀴즈참여': 15,
-            '투표참여': 5,
-            '회의참석': 25,
-            '우수활동': 50
-        }
+        self.point_values = POINT_VALUES
         
         self.badges = {
             '출석왕': {'condition': '출석', 'threshold': 30, 'icon': '👑', 'description': '30일 연속 출석'},
@@ -59,8 +52,9 @@ class GamificationSystem:
         
         # Calculate user points
         user_points = self.calculate_user_points(user['username'])
-        user_level = self.calculate_level(user_points)
-        points_to_next = self.points_to_next_level(user_points)
+        earned_points = self.get_lifetime_points(user['username'])
+        user_level = self.calculate_level(earned_points)
+        points_to_next = self.points_to_next_level(earned_points)
         
         # Stats dashboard
         col1, col2, col3, col4 = st.columns(4)
@@ -81,7 +75,7 @@ class GamificationSystem:
         # Progress bar for next level
         current_level_points = self.get_level_points(user_level)
         next_level_points = self.get_level_points(user_level + 1)
-        progress = (user_points - current_level_points) / (next_level_points - current_level_points)
+        progress = (earned_points - current_level_points) / (next_level_points - current_level_points)
         
         st.progress(min(progress, 1.0))
         st.markdown(f"**레벨 {user_level + 1}까지 {points_to_next}포인트 필요**")
@@ -126,7 +120,7 @@ class GamificationSystem:
                 
                 # Calculate progress
                 if badge_info['condition'] == '종합점수':
-                    current_value = self.calculate_user_points(user['username'])
+                    current_value = self.get_lifetime_points(user['username'])
                 else:
                     current_value = user_stats.get(badge_info['condition'], 0)
                 
@@ -157,23 +151,31 @@ class GamificationSystem:
         """Display user rankings"""
         st.markdown("#### 📊 동아리 랭킹")
         
-        # Get all users and their points
+        # Get all users and their points (one pass over the aggregated stats)
         users_df = st.session_state.data_manager.load_csv('users')
-        rankings = []
-        
-        for _, user_row in users_df.iterrows():
-            points = self.calculate_user_points(user_row['username'])
-            level = self.calculate_level(points)
-            badges_count = len(self.get_user_badges(user_row['username']))
-            
-            rankings.append({
-                'username': user_row['username'],
-                'name': user_row['name'],
-                'club': user_row['club_name'],
-                'points': points,
-                'level': level,
-                'badges': badges_count
-            })
+        if users_df.empty:
+            st.info("랭킹을 표시할 사용자가 없습니다.")
+            return
+
+        stats_df = activity_stats.get_frame()
+        users_df = users_df.join(stats_df, on='username')
+        for column in ACTIVITY_SOURCES:
+            if column not in users_df.columns:
+                users_df[column] = 0
+            users_df[column] = users_df[column].fillna(0).astype(int)
+
+        users_df['points'] = users_df['username'].map(points_ledger.get_earned_map()).fillna(0)
+        rankings = [
+            {
+                'username': row['username'],
+                'name': row['name'],
+                'club': row['club_name'],
+                'points': int(row['points']),
+                'level': self.calculate_level(int(row['points'])),
+                'badges': int(row['배지'])
+            }
+            for row in users_df.to_dict('records')
+        ]
         
         # Sort by points
         rankings.sort(key=lambda x: x['points'], reverse=True)
@@ -256,28 +258,16 @@ class GamificationSystem:
             st.markdown(mission_html, unsafe_allow_html=True)
     
     def calculate_user_points(self, username):
-        """Calculate total points for a user"""
-        # Get attendance points
-        attendance_df = st.session_state.data_manager.load_csv('attendance')
-        user_attendance = attendance_df[attendance_df['username'] == username]
-        attendance_points = len(user_attendance[user_attendance['status'] == '출석']) * self.point_values['출석']
-        
-        # Get assignment points
-        submissions_df = st.session_state.data_manager.load_csv('submissions')
-        user_submissions = submissions_df[submissions_df['username'] == username]
-        assignment_points = len(user_submissions) * self.point_values['과제제출']
-        
-        # Get post points
-        posts_df = st.session_state.data_manager.load_csv('posts')
-        user_posts = posts_df[posts_df['author'] == username] if not posts_df.empty else pd.DataFrame()
-        post_points = len(user_posts) * self.point_values['게시글작성']
-        
-        # Get quiz points
-        quiz_responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        user_quizzes = quiz_responses_df[quiz_responses_df['username'] == username] if not quiz_responses_df.empty else pd.DataFrame()
-        quiz_points = len(user_quizzes) * self.point_values['퀴즈참여']
-        
-        return attendance_points + assignment_points + post_points + quiz_points
+        """Spendable point balance of a user (from the points ledger)"""
+        return points_ledger.get_balance(username)
+
+    def get_lifetime_points(self, username):
+        """Points earned in total; levels are based on this, so spending never lowers a level"""
+        return points_ledger.get_earned(username)
+
+    def calculate_user_level(self, username):
+        """Level of a user"""
+        return self.calculate_level(self.get_lifetime_points(username))
     
     def calculate_level(self, points):
         """Calculate user level based on points"""
@@ -300,39 +290,11 @@ class GamificationSystem:
     
     def get_user_activity_stats(self, username):
         """Get user activity statistics"""
-        stats = {}
-        
-        # Attendance count
-        attendance_df = st.session_state.data_manager.load_csv('attendance')
-        stats['출석'] = len(attendance_df[(attendance_df['username'] == username) & (attendance_df['status'] == '출석')])
-        
-        # Assignment submissions
-        submissions_df = st.session_state.data_manager.load_csv('submissions')
-        stats['과제제출'] = len(submissions_df[submissions_df['username'] == username])
-        
-        # Posts
-        posts_df = st.session_state.data_manager.load_csv('posts')
-        stats['게시글작성'] = len(posts_df[posts_df['author'] == username]) if not posts_df.empty else 0
-        
-        # Quiz participation
-        quiz_responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        stats['퀴즈참여'] = len(quiz_responses_df[quiz_responses_df['username'] == username]) if not quiz_responses_df.empty else 0
-        
-        return stats
+        return activity_stats.get_user_stats(username)
     
     def get_daily_points(self, username):
         """Get points earned today"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Today's attendance
-        attendance_df = st.session_state.data_manager.load_csv('attendance')
-        today_attendance = attendance_df[
-            (attendance_df['username'] == username) & 
-            (attendance_df['date'] == today) & 
-            (attendance_df['status'] == '출석')
-        ]
-        
-        return len(today_attendance) * self.point_values['출석']
+        return points_ledger.get_earned_today(username)
     
     def get_recent_activities(self, username):
         """Get recent user activities"""
@@ -410,10 +372,10 @@ class GamificationSystem:
     def get_today_messages(self, username):
         """Get today's chat messages count"""
         today = datetime.now().strftime('%Y-%m-%d')
-        chat_df = st.session_state.data_manager.load_csv('chat_logs')
+        chat_df = st.session_state.chat_system.chat_store.read()
         today_messages = chat_df[
             (chat_df['username'] == username) & 
-            (chat_df['timestamp'].str.startswith(today))
+            (chat_df['timestamp'].astype(str).str.startswith(today))
         ] if not chat_df.empty else pd.DataFrame()
         return len(today_messages)
     
@@ -436,7 +398,7 @@ class GamificationSystem:
         """Check and award eligible badges"""
         user_stats = self.get_user_activity_stats(username)
         current_badges = [b['badge_name'] for b in self.get_user_badges(username)]
-        user_points = self.calculate_user_points(username)
+        user_points = self.get_lifetime_points(username)
         
         for badge_name, badge_info in self.badges.items():
             if badge_name not in current_badges:
@@ -701,6 +663,10 @@ class GamificationSystem:
         
         if st.button("🎲 룰렛 돌리기"):
             import random
+
+            if not points_ledger.spend(user['username'], bet_amount, "룰렛 베팅", source='game'):
+                st.error("보유 포인트가 부족합니다.")
+                return
             
             outcomes = [
                 {"result": "꽝", "multiplier": 0, "probability": 0.4},
@@ -722,6 +688,8 @@ class GamificationSystem:
             
             result_points = bet_amount * selected_outcome["multiplier"]
             net_gain = result_points - bet_amount
+            if result_points:
+                points_ledger.award(user['username'], result_points, f"룰렛 {selected_outcome['result']}", source='game')
             
             if selected_outcome["result"] == "꽝":
                 st.error(f"😢 {selected_outcome['result']}! {bet_amount}포인트를 잃었습니다.")
@@ -733,11 +701,8 @@ class GamificationSystem:
     
     def purchase_item(self, username, item):
         """Purchase an item from the point shop"""
-        user_points = self.calculate_user_points(username)
-        
-        if user_points >= item['cost']:
-            # Deduct points (this would need a proper points tracking system)
-            # For now, just log the purchase
+        # The ledger checks the balance and deducts under one lock
+        if points_ledger.spend(username, item['cost'], f"상점 구매: {item['name']}"):
             st.session_state.logging_system.log_activity(
                 username,
                 'Point Shop Purchase',
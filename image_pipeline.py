@@ -0,0 +1,109 @@
+import os
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, features
+from blob_store import blob_store, is_blob_ref
+
+# Rendition name -> (max width/height box, encoder quality)
+RENDITIONS = {
+    'grid': ((320, 240), 70),   # gallery tiles
+    'card': ((640, 480), 78),   # previews
+    'full': ((1280, 960), 85),  # post view
+}
+
+# WebP when Pillow was built with it, JPEG otherwise
+OUTPUT_FORMAT = 'WEBP' if features.check('webp') else 'JPEG'
+OUTPUT_EXTENSION = 'webp' if OUTPUT_FORMAT == 'WEBP' else 'jpg'
+
+PIPELINE_WORKERS = 2
+
+
+class ImagePipeline:
+    """Resized, compressed renditions of blob-store images.
+
+    Each uploaded image is rendered once per size in RENDITIONS and
+    cached on disk under data/renditions/<aa>/<hash>.<size>.<ext>. Uploads
+    queue the work on a small thread pool; a rendition that is not there
+    yet (older posts, a restart mid-queue) is rendered on first request.
+    """
+
+    def __init__(self, cache_dir=os.path.join('data', 'renditions'), workers=PIPELINE_WORKERS):
+        self.cache_dir = cache_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-pipeline')
+        self._pending = {}  # ref -> Future
+        self._lock = threading.Lock()
+
+    def path(self, ref, size):
+        ref = ref.strip()
+        return os.path.join(self.cache_dir, ref[:2], f"{ref}.{size}.{OUTPUT_EXTENSION}")
+
+    def _encode(self, image, size):
+        box, quality = RENDITIONS[size]
+        rendition = image.copy()
+        rendition.thumbnail(box, Image.Resampling.LANCZOS)
+        if OUTPUT_FORMAT == 'JPEG' and rendition.mode not in ('RGB', 'L'):
+            rendition = rendition.convert('RGB')
+        options = {'method': 4} if OUTPUT_FORMAT == 'WEBP' else {'optimize': True}
+        buffer = io.BytesIO()
+        rendition.save(buffer, format=OUTPUT_FORMAT, quality=quality, **options)
+        return buffer.getvalue()
+
+    def _write(self, filepath, data):
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+
+    def _render_all(self, ref):
+        """Render every missing size of one image"""
+        try:
+            missing = [size for size in RENDITIONS if not os.path.exists(self.path(ref, size))]
+            if not missing:
+                return
+            original = blob_store.get(ref)
+            if original is None:
+                return
+            image = Image.open(io.BytesIO(original))
+            image.load()
+            for size in missing:
+                self._write(self.path(ref, size), self._encode(image, size))
+        finally:
+            with self._lock:
+                self._pending.pop(ref, None)
+
+    def submit(self, ref):
+        """Queue rendition generation for a stored image"""
+        if not is_blob_ref(ref):
+            return None
+        with self._lock:
+            future = self._pending.get(ref)
+            if future is None:
+                future = self._executor.submit(self._render_all, ref)
+                self._pending[ref] = future
+        return future
+
+    def get(self, value, size='grid'):
+        """Bytes of a rendition for an image column value.
+
+        Falls back to the original bytes for legacy inline base64 or when
+        rendering fails, so callers can always hand the result to st.image.
+        """
+        if not is_blob_ref(value):
+            return blob_store.load(value)
+        filepath = self.path(value, size)
+        if not os.path.exists(filepath):
+            try:
+                self.submit(value).result()
+            except Exception:
+                return blob_store.get(value)
+        try:
+            with open(filepath, 'rb') as f:
+                return f.read()
+        except OSError:
+            return blob_store.get(value)
+
+
+# Global image pipeline instance
+image_pipeline = ImagePipeline()
@@ -45,9 +45,11 @@ def initialize_all_data():
         'notes':
         ['User login successful', 'None', 'System initialization complete']
     })
-    logs_df.to_csv(os.path.join(data_dir, 'logs.csv'),
-                   index=False,
-                   encoding='utf-8-sig')
+    # Only seed sample logs on a fresh install; real logs live in data/logs/ segments
+    if not os.path.exists(os.path.join(data_dir, 'logs.csv')) and not os.path.exists(os.path.join(data_dir, 'logs')):
+        logs_df.to_csv(os.path.join(data_dir, 'logs.csv'),
+                       index=False,
+                       encoding='utf-8-sig')
 
     # Initialize users.csv (if not exists)
     users_file = os.path.join(data_dir, 'users.csv')
@@ -0,0 +1,191 @@
+import pandas as pd
+import os
+import json
+import threading
+from datetime import datetime, date
+from storage_backend import get_storage_backend
+
+# A day's segment rolls over to a new file once it grows past this size
+MAX_SEGMENT_BYTES = 5 * 1024 * 1024
+
+
+def _segment_order(segment):
+    """Sort key of a segment: its date, then the numeric roll-over part ('_10' after '_9')"""
+    _, _, part = segment['name'].partition('_')
+    return (segment['date'], int(part) if part.isdigit() else 0)
+
+
+class LogSegmentStore:
+    """Activity logs split into daily, size-capped segment files.
+
+    Segments live in data/logs/ as '<YYYY-MM-DD>' tables (with '_1', '_2'
+    suffixes when a day rolls over). A small manifest.json lists each
+    segment with its date and row count, so a read for a date window only
+    opens the matching files, and retention just deletes old segments.
+    """
+
+    def __init__(self, log_dir=os.path.join('data', 'logs'), legacy_table='logs',
+                 max_segment_bytes=MAX_SEGMENT_BYTES):
+        self.log_dir = log_dir
+        self.legacy_table = legacy_table
+        self.max_segment_bytes = max_segment_bytes
+        self.manifest_file = os.path.join(log_dir, 'manifest.json')
+        self._lock = threading.RLock()
+
+        os.makedirs(log_dir, exist_ok=True)
+        self.storage = get_storage_backend(log_dir)
+        self.manifest = self._load_manifest()
+        if self.manifest is None:
+            self.manifest = {'last_id': 0, 'segments': []}
+            self._migrate_legacy_table()
+            self._save_manifest()
+        else:
+            # Manifests written with a name sort may list '_10' before '_9'
+            self.manifest['segments'].sort(key=_segment_order)
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_file):
+            return None
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_file)
+
+    def _migrate_legacy_table(self):
+        """Split the old single logs table into daily segments (one time)"""
+        data_dir = os.path.dirname(self.log_dir.rstrip(os.sep)) or '.'
+        legacy_storage = get_storage_backend(data_dir)
+        if not legacy_storage.exists(self.legacy_table):
+            return
+
+        try:
+            legacy_df = legacy_storage.read(self.legacy_table)
+        except Exception:
+            return
+        if legacy_df.empty:
+            return
+
+        records = legacy_df.to_dict('records')
+        # Keep existing ids; new entries continue after the largest one
+        ids = pd.to_numeric(legacy_df.get('id', pd.Series(dtype=float)), errors='coerce').dropna()
+        self.manifest['last_id'] = int(ids.max()) if not ids.empty else 0
+        self._append_records(records)
+
+        # Leave a header-only file behind so nothing reads the rows twice
+        legacy_storage.write(self.legacy_table, legacy_df.iloc[0:0])
+
+    @staticmethod
+    def _entry_date(entry):
+        timestamp = entry.get('timestamp')
+        if isinstance(timestamp, (datetime, pd.Timestamp)):
+            return timestamp.strftime('%Y-%m-%d')
+        text = str(timestamp or '')[:10]
+        try:
+            return datetime.strptime(text, '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            return datetime.now().strftime('%Y-%m-%d')
+
+    def _current_segment(self, day):
+        """Segment that new entries for a day go to, rolling over when full"""
+        day_segments = [s for s in self.manifest['segments'] if s['date'] == day]
+        if day_segments:
+            segment = day_segments[-1]
+            path = self.storage.table_path(segment['name'])
+            if not os.path.exists(path) or os.path.getsize(path) < self.max_segment_bytes:
+                return segment
+            name = f"{day}_{len(day_segments)}"
+        else:
+            name = day
+
+        segment = {'name': name, 'date': day, 'rows': 0}
+        self.manifest['segments'].append(segment)
+        self.manifest['segments'].sort(key=_segment_order)
+        return segment
+
+    def _append_records(self, records):
+        by_day = {}
+        for record in records:
+            by_day.setdefault(self._entry_date(record), []).append(record)
+
+        for day, day_records in sorted(by_day.items()):
+            segment = self._current_segment(day)
+            if not self.storage.append_many(segment['name'], day_records):
+                # Entries with new columns - widen this segment once
+                existing = self.storage.read(segment['name'])
+                self.storage.write(segment['name'], pd.concat([existing, pd.DataFrame(day_records)], ignore_index=True))
+            segment['rows'] += len(day_records)
+
+    def append(self, entries):
+        """Assign ids to log entries and append them to their day's segment"""
+        if not entries:
+            return 0
+        with self._lock:
+            for entry in entries:
+                self.manifest['last_id'] += 1
+                entry['id'] = self.manifest['last_id']
+            self._append_records(entries)
+            self._save_manifest()
+        return len(entries)
+
+    @staticmethod
+    def _as_day(value):
+        if value is None:
+            return None
+        if isinstance(value, (datetime, pd.Timestamp)):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)[:10]
+
+    def segments_in_range(self, start_date=None, end_date=None):
+        """Names of the segments whose date falls inside [start_date, end_date]"""
+        start_day = self._as_day(start_date)
+        end_day = self._as_day(end_date)
+        with self._lock:
+            return [
+                s['name'] for s in self.manifest['segments']
+                if (start_day is None or s['date'] >= start_day)
+                and (end_day is None or s['date'] <= end_day)
+            ]
+
+    def count(self, start_date=None, end_date=None):
+        """Number of log rows in a date window, answered from the manifest"""
+        names = set(self.segments_in_range(start_date, end_date))
+        with self._lock:
+            return sum(s['rows'] for s in self.manifest['segments'] if s['name'] in names)
+
+    def read(self, start_date=None, end_date=None):
+        """Load the logs of a date window by opening only its segments"""
+        frames = []
+        for name in self.segments_in_range(start_date, end_date):
+            if self.storage.exists(name):
+                frames.append(self.storage.read(name))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def delete_before(self, cutoff_date):
+        """Retention: drop whole segments older than cutoff_date. Returns rows removed"""
+        cutoff_day = self._as_day(cutoff_date)
+        removed_rows = 0
+        with self._lock:
+            keep = []
+            for segment in self.manifest['segments']:
+                if segment['date'] < cutoff_day:
+                    path = self.storage.table_path(segment['name'])
+                    if os.path.exists(path):
+                        os.remove(path)
+                    removed_rows += segment['rows']
+                else:
+                    keep.append(segment)
+            self.manifest['segments'] = keep
+            self._save_manifest()
+        return removed_rows
@@ -8,34 +8,45 @@ import hashlib
 import socket
 import numpy as np
 import os
+import queue
+import threading
+import time
+import atexit
 from error_handler import error_handler
+from storage_backend import get_storage_backend
+from user_directory import user_directory
+from log_store import LogSegmentStore
+
+# Background log writer settings: entries are batched and appended every
+# LOG_FLUSH_INTERVAL seconds or LOG_BATCH_SIZE entries, whichever comes first.
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_SIZE = 200
+LOG_FLUSH_INTERVAL = 0.5
 
 
 class LoggingSystem:
     def __init__(self):
-        self.logs_file = 'data/logs.csv'
+        self.storage = get_storage_backend('data')
+        self.log_store = LogSegmentStore()
+        self.logs_file = self.log_store.log_dir
         self._is_logging = False  # 재귀 방지 플래그
+
+        # 로그는 큐에 넣고 백그라운드 스레드가 일괄 기록
+        self._log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._write_lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+        self._batch = []  # entries taken off the queue but not yet written
+        self._dropped_count = 0
+        self._writer = threading.Thread(target=self._writer_loop, name='activity-log-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.flush_logs)
         # 세션 상태 확인 후 초기화
         if hasattr(st.session_state, 'data_manager'):
             self.initialize_logs()
 
     def initialize_logs(self):
-        """Initialize logs CSV file"""
-        if not hasattr(st.session_state, 'data_manager'):
-            return
-
-        logs_df = st.session_state.data_manager.load_csv('logs')
-        if logs_df.empty:
-            # Create logs with all required columns
-            logs_structure = [
-                'id', 'timestamp', 'username', 'user_name', 'user_role', 'club_name',
-                'ip_address', 'session_id', 'activity_type', 'activity_description',
-                'target_resource', 'action_result', 'error_message', 'user_agent',
-                'device_type', 'browser_info', 'request_method', 'response_time',
-                'data_modified', 'security_level', 'notes'
-            ]
-            empty_df = pd.DataFrame(columns=logs_structure)
-            st.session_state.data_manager.save_csv('logs', empty_df)
+        """Initialize log storage (daily segments are created on first write)"""
+        os.makedirs(self.log_store.log_dir, exist_ok=True)
 
     def get_client_info(self):
         """Get client information for logging"""
@@ -83,10 +94,7 @@ class LoggingSystem:
             # Get user info safely without causing recursion
             user_info = None
             try:
-                if os.path.exists('data/users.csv'):
-                    users_df = pd.read_csv('data/users.csv', encoding='utf-8-sig')
-                    if not users_df.empty and username in users_df['username'].values:
-                        user_info = users_df[users_df['username'] == username].iloc[0]
+                user_info = user_directory.get_user(username)
             except Exception:
                 pass
 
@@ -117,21 +125,15 @@ class LoggingSystem:
                 'notes': notes
             }
 
-            # 직접 CSV에 저장하여 재귀 방지
-            logs_df = pd.read_csv(self.logs_file, encoding='utf-8-sig') if os.path.exists(self.logs_file) else pd.DataFrame()
-
-            # ID 생성
-            log_entry['id'] = len(logs_df) + 1
-
-            # 새 로그 추가
-            new_log_df = pd.DataFrame([log_entry])
-            if not logs_df.empty:
-                logs_df = pd.concat([logs_df, new_log_df], ignore_index=True)
-            else:
-                logs_df = new_log_df
-
-            # CSV 저장
-            logs_df.to_csv(self.logs_file, index=False, encoding='utf-8-sig')
+            # 큐에 넣기만 하고 기록은 백그라운드 스레드가 담당 (페이지 렌더링 차단 방지)
+            try:
+                self._log_queue.put_nowait(log_entry)
+            except queue.Full:
+                # 큐가 가득 차면 요청을 막지 않고 로그를 버림
+                self._dropped_count += 1
+                if self._dropped_count % 1000 == 1:
+                    print(f"⚠️ 로그 큐가 가득 차 {self._dropped_count}개 로그를 버렸습니다")
+                return False
 
             # Also log to console for debugging
             if activity_type in ['Authentication', 'System', 'Admin']:
@@ -145,6 +147,50 @@ class LoggingSystem:
         finally:
             self._is_logging = False
 
+    def _writer_loop(self):
+        """Drain the log queue in batches and append them to the logs table"""
+        while True:
+            self._take(self._log_queue.get())
+            collected = 1
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while collected < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    self._take(self._log_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                collected += 1
+            self._write_batch()
+
+    def _take(self, entry):
+        # Entries wait in self._batch rather than a local list, so flush_logs
+        # can still write a batch the writer thread was collecting
+        with self._batch_lock:
+            self._batch.append(entry)
+
+    def _write_batch(self):
+        """Append the collected log entries to their daily segments"""
+        with self._write_lock:
+            with self._batch_lock:
+                batch, self._batch = self._batch, []
+            if not batch:
+                return
+            try:
+                self.log_store.append(batch)
+            except Exception as e:
+                print(f"로그 기록 오류: {e}")
+
+    def flush_logs(self):
+        """Write every queued or collected log entry now (also called on shutdown)"""
+        while True:
+            try:
+                self._take(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write_batch()
+
     def log_login(self, username, success):
         """Log login attempts"""
         try:
@@ -218,35 +264,22 @@ class LoggingSystem:
             notes=f"Security event: {event_type}"
         )
 
-    def load_logs(self):
-        """Load logs from CSV file with safe datetime parsing"""
+    def load_logs(self, start_date=None, end_date=None):
+        """Load logs of a date window (only the matching segments are read)"""
         try:
-            logs_df = st.session_state.data_manager.load_csv('logs')
+            logs_df = self.log_store.read(start_date, end_date)
             if not logs_df.empty and 'timestamp' in logs_df.columns:
-                # Safe datetime conversion
-                def safe_parse_timestamp(ts):
-                    if pd.isna(ts) or not ts:
-                        return None
-                    try:
-                        # Try multiple formats
-                        formats = ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S']
-                        for fmt in formats:
-                            try:
-                                return datetime.strptime(str(ts), fmt)
-                            except ValueError:
-                                continue
-                        # If all fail, use pandas parsing
-                        return pd.to_datetime(ts, errors='coerce')
-                    except:
-                        return None
-
-                logs_df['timestamp'] = logs_df['timestamp'].apply(safe_parse_timestamp)
+                logs_df['timestamp'] = pd.to_datetime(logs_df['timestamp'], errors='coerce', format='mixed')
                 logs_df = logs_df.dropna(subset=['timestamp'])
             return logs_df
         except Exception as e:
             # Return empty dataframe instead of error
             return pd.DataFrame()
 
+    def count_logs(self, start_date=None, end_date=None):
+        """Number of logs in a date window, without reading any segment"""
+        return self.log_store.count(start_date, end_date)
+
     def show_logs_interface(self, user):
         """Display comprehensive logs interface"""
         if not hasattr(st.session_state, 'data_manager'):
@@ -262,8 +295,14 @@ class LoggingSystem:
             st.warning("로그 조회 권한이 없습니다.")
             return
 
-        # Load logs
-        logs_df = self.load_logs()
+        # Load only the segments of the selected window
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("📅 시작 날짜", value=datetime.now().date() - timedelta(days=7), key="logs_start_date")
+        with col2:
+            end_date = st.date_input("📅 종료 날짜", value=datetime.now().date(), key="logs_end_date")
+
+        logs_df = self.load_logs(start_date, end_date)
 
         if logs_df.empty:
             st.info("로그 데이터가 없습니다.")
@@ -299,7 +338,7 @@ class LoggingSystem:
             error_handler.wrap_streamlit_component(st.metric, "📊 총 로그", total_logs)
 
         with col2:
-            today_logs = len(logs_df[logs_df['timestamp'].astype(str).str.contains(datetime.now().strftime('%Y-%m-%d'))])
+            today_logs = self.count_logs(datetime.now().date(), datetime.now().date())
             error_handler.wrap_streamlit_component(st.metric, "📅 오늘 로그", today_logs)
 
         with col3:
@@ -614,22 +653,12 @@ class LoggingSystem:
             return logs_df.to_string()
 
     def cleanup_old_logs(self, days_to_keep=30):
-        """Clean up old logs"""
-        if not hasattr(st.session_state, 'data_manager'):
-            return False
-
+        """Clean up old logs by deleting whole segments; returns rows removed"""
         try:
-            logs_df = st.session_state.data_manager.load_csv('logs')
-            if logs_df.empty:
-                return True
-
+            self.flush_logs()
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-            logs_df['timestamp'] = pd.to_datetime(logs_df['timestamp'])
-
-            recent_logs = logs_df[logs_df['timestamp'] >= cutoff_date]
-
-            return st.session_state.data_manager.save_csv('logs', recent_logs)
+            return self.log_store.delete_before(cutoff_date)
 
         except Exception as e:
             self.log_error('system', 'Log Cleanup', str(e), 'cleanup_old_logs')
-            return False
\ No newline at end of file
+            return 0
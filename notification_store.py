@@ -0,0 +1,359 @@
+import threading
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+from data_manager import add_write_listener
+from user_directory import user_directory
+
+NOTIFICATIONS_TABLE = 'notifications'
+RECEIPTS_TABLE = 'notification_reads'
+# Tables whose writes can change a user's clubs
+MEMBERSHIP_TABLES = ('users', 'user_clubs')
+
+# Audience values for notifications stored once for many users
+AUDIENCE_ALL = 'all'
+AUDIENCE_CLUB = 'club:'
+AUDIENCE_USERS = 'users:'
+
+# Newest notifications indexed per user (home widgets show at most this many)
+LATEST_K = 10
+
+
+def notification_key(value):
+    """Normalize a notification id so 3, 3.0 and '3' compare equal"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def club_audience(club_name):
+    return AUDIENCE_ALL if club_name == "전체" else f"{AUDIENCE_CLUB}{club_name}"
+
+
+def users_audience(usernames):
+    return AUDIENCE_USERS + ','.join(usernames)
+
+
+def _flag(value):
+    """True for read flags as written by pandas (True, 'True', 1)"""
+    return value is True or str(value).strip().lower() in ('true', '1', '1.0')
+
+
+def _id_order(key):
+    try:
+        return (0, float(key), key)
+    except ValueError:
+        return (1, 0.0, key)
+
+
+def _text(value):
+    return '' if value is None or (isinstance(value, float) and pd.isna(value)) else str(value)
+
+
+def audience_of(notification):
+    """The audience of a row: '' for a personal notification"""
+    audience = _text(notification.get('audience'))
+    if not audience and _text(notification.get('username')) == AUDIENCE_ALL:
+        return AUDIENCE_ALL  # 'all' rows written before audiences existed
+    return audience
+
+
+def is_broadcast(notification):
+    return bool(audience_of(notification))
+
+
+class NotificationStore:
+    """Fan-out-on-read notifications with per-user unread counts in memory.
+
+    A notification for everyone, a club or a list of users is one row with
+    an `audience` ('all', 'club:<name>', 'users:<a,b>'); personal ones keep
+    the old per-user row. Whether a user has read or dismissed a row is a
+    read receipt in the `notification_reads` table (personal rows may also
+    carry their own `read` flag), so a broadcast costs one row instead of
+    one per user.
+
+    All rows and receipts are held in memory. For each user seen so far
+    the store keeps the unread count and the latest LATEST_K visible ids,
+    adjusted from the DataManager write listener on add, read and
+    dismiss, so the header badge is a dict lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows = None      # notification key -> row dict
+        self._receipts = {}    # (notification key, username) -> 'read' | 'deleted'
+        self._users = {}       # username -> {'unread', 'total', 'latest', 'clubs'}
+        self._directory_version = None  # user directory the cached clubs came from
+
+    # -- audiences and state ---------------------------------------------
+
+    @staticmethod
+    def reaches(notification, username, clubs=None):
+        """Whether a notification row is addressed to a user"""
+        audience = audience_of(notification)
+        if not audience:
+            return _text(notification.get('username')) == username
+        if audience == AUDIENCE_ALL:
+            return True
+        if audience.startswith(AUDIENCE_CLUB):
+            if clubs is None:
+                clubs = {club['club_name'] for club in user_directory.get_user_clubs(username)}
+            return audience[len(AUDIENCE_CLUB):] in clubs
+        if audience.startswith(AUDIENCE_USERS):
+            return username in audience[len(AUDIENCE_USERS):].split(',')
+        return False
+
+    def _visible(self, key, username, clubs=None):
+        row = self._rows.get(key)
+        return (row is not None and self._receipts.get((key, username)) != 'deleted'
+                and self.reaches(row, username, clubs))
+
+    def _is_read(self, key, username):
+        if self._receipts.get((key, username)) == 'read':
+            return True
+        row = self._rows[key]
+        return not is_broadcast(row) and _flag(row.get('read'))
+
+    @staticmethod
+    def _sort_key(key, row):
+        return (_text(row.get('created_date')), _id_order(key))
+
+    # -- loading ---------------------------------------------------------
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._rows is not None:
+                return
+            data_manager = st.session_state.data_manager
+            self._receipts = {}
+            for receipt in data_manager.load_csv(RECEIPTS_TABLE).to_dict('records'):
+                self._apply_receipt(receipt)
+            self._rows = {
+                notification_key(row.get('id')): row
+                for row in data_manager.load_csv(NOTIFICATIONS_TABLE).to_dict('records')
+            }
+            self._users = {}
+
+    def _apply_receipt(self, receipt):
+        key = (notification_key(receipt.get('notification_id')), _text(receipt.get('username')))
+        # 'deleted' wins over 'read'
+        if self._receipts.get(key) != 'deleted':
+            self._receipts[key] = _text(receipt.get('state')) or 'read'
+
+    def _user_state(self, username):
+        """Unread count and latest ids of a user, built by one scan on first use"""
+        # Memberships are also edited outside DataManager (AuthManager writes users
+        # directly), so cached club lists are dropped when the directory reloads
+        version = user_directory.version()
+        if version != self._directory_version:
+            self._users = {}
+            self._directory_version = version
+        state = self._users.get(username)
+        if state is None:
+            clubs = {club['club_name'] for club in user_directory.get_user_clubs(username)}
+            visible = [key for key in self._rows if self._visible(key, username, clubs)]
+            visible.sort(key=lambda key: self._sort_key(key, self._rows[key]), reverse=True)
+            state = self._users[username] = {
+                'unread': sum(1 for key in visible if not self._is_read(key, username)),
+                'total': len(visible),
+                'latest': visible[:LATEST_K],
+                'clubs': clubs,
+            }
+        return state
+
+    # -- keeping current -------------------------------------------------
+
+    def _add_to_user(self, username, key):
+        state = self._users[username]
+        state['total'] += 1
+        if not self._is_read(key, username):
+            state['unread'] += 1
+        latest = state['latest'] + [key]
+        latest.sort(key=lambda k: self._sort_key(k, self._rows[k]), reverse=True)
+        state['latest'] = latest[:LATEST_K]
+
+    def _remove_from_user(self, username, key, was_unread):
+        state = self._users[username]
+        state['total'] -= 1
+        if was_unread:
+            state['unread'] -= 1
+        if key in state['latest']:
+            state['latest'].remove(key)
+            if len(state['latest']) < min(LATEST_K, state['total']):
+                del self._users[username]  # refill from a fresh scan when next asked
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener (may run on the event bus thread)"""
+        if table in MEMBERSHIP_TABLES:
+            self._on_membership(records)
+            return
+        if table not in (NOTIFICATIONS_TABLE, RECEIPTS_TABLE):
+            return
+        with self._lock:
+            if self._rows is None:
+                return
+            if records is None or (table == RECEIPTS_TABLE and columns is not None):
+                # Rewritten or edited in bulk - rebuild on next read
+                self._rows = None
+                return
+            if table == RECEIPTS_TABLE:
+                for receipt in records:
+                    self._on_receipt(receipt)
+            elif columns is None:
+                for row in records:
+                    self._on_notification(dict(row))
+            elif columns & {'username', 'audience', 'created_date'}:
+                self._rows = None
+            else:
+                for change in records:
+                    self._on_notification_update(change)
+
+    def _on_membership(self, records):
+        """Club membership changed: drop the cached state of the users it touched"""
+        with self._lock:
+            usernames = {_text(record.get('username')) for record in records or []}
+            if records is None or '' in usernames:
+                self._users = {}  # rewrite, or an update without usernames
+                return
+            for username in usernames:
+                self._users.pop(username, None)
+
+    def _on_notification(self, row):
+        key = notification_key(row.get('id'))
+        self._rows[key] = row
+        # Clubs are taken from the user state: this may run off the session thread
+        for username, state in list(self._users.items()):
+            if self._visible(key, username, state['clubs']):
+                self._add_to_user(username, key)
+
+    def _on_notification_update(self, change):
+        key = notification_key(change.get('id'))
+        row = self._rows.get(key)
+        if row is None:
+            return
+        username = _text(row.get('username'))
+        track = not is_broadcast(row) and username in self._users and self._visible(key, username, ())
+        was_unread = track and not self._is_read(key, username)
+        row.update(change)
+        if track and was_unread != (not self._is_read(key, username)):
+            self._users[username]['unread'] += -1 if was_unread else 1
+
+    def _on_receipt(self, receipt):
+        key = notification_key(receipt.get('notification_id'))
+        username = _text(receipt.get('username'))
+        state = self._users.get(username)
+        track = state is not None and self._visible(key, username, state['clubs'])
+        was_unread = track and not self._is_read(key, username)
+        self._apply_receipt(receipt)
+        if not track:
+            return
+        if not self._visible(key, username, state['clubs']):
+            self._remove_from_user(username, key, was_unread)
+        elif was_unread and self._is_read(key, username):
+            self._users[username]['unread'] -= 1
+
+    def _recipients(self, row):
+        """Usernames a row is delivered to"""
+        audience = audience_of(row)
+        if not audience:
+            return {_text(row.get('username'))}
+        if audience == AUDIENCE_ALL:
+            return set(user_directory.usernames())
+        if audience.startswith(AUDIENCE_CLUB):
+            return set(user_directory.members_of_club(audience[len(AUDIENCE_CLUB):]))
+        if audience.startswith(AUDIENCE_USERS):
+            return set(filter(None, audience[len(AUDIENCE_USERS):].split(',')))
+        return set()
+
+    def delivery_counts(self):
+        """(delivered, unread) over every recipient of every row, receipts applied
+
+        A shared row counts once per audience member; dismissed deliveries
+        are left out of both numbers.
+        """
+        self._ensure_loaded()
+        delivered = unread = 0
+        with self._lock:
+            for key, row in self._rows.items():
+                for username in self._recipients(row):
+                    if self._receipts.get((key, username)) == 'deleted':
+                        continue
+                    delivered += 1
+                    if not self._is_read(key, username):
+                        unread += 1
+        return delivered, unread
+
+    # -- per-user views ---------------------------------------------------
+
+    def _view(self, key, username):
+        return dict(self._rows[key], read=self._is_read(key, username))
+
+    def unread_count(self, username):
+        """Unread notifications of a user (O(1) once the user has been seen)"""
+        self._ensure_loaded()
+        with self._lock:
+            return self._user_state(username)['unread']
+
+    def latest(self, username, k=LATEST_K):
+        """A user's newest k notifications (k <= LATEST_K), newest first"""
+        self._ensure_loaded()
+        with self._lock:
+            return [self._view(key, username) for key in self._user_state(username)['latest'][:k]]
+
+    def get_user_notifications(self, username):
+        """All of a user's notifications (personal and shared), newest first"""
+        self._ensure_loaded()
+        with self._lock:
+            clubs = {club['club_name'] for club in user_directory.get_user_clubs(username)}
+            keys = [key for key in self._rows if self._visible(key, username, clubs)]
+            keys.sort(key=lambda key: self._sort_key(key, self._rows[key]), reverse=True)
+            return [self._view(key, username) for key in keys]
+
+    def _add_receipts(self, notification_ids, username, state):
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        receipts = [
+            {'notification_id': notification_id, 'username': username, 'state': state, 'created_date': now}
+            for notification_id in notification_ids
+        ]
+        if not receipts:
+            return 0
+        return st.session_state.data_manager.add_records(RECEIPTS_TABLE, receipts, audit=False)
+
+    def mark_read(self, notification_id, username):
+        """Mark one notification read for a user"""
+        self._ensure_loaded()
+        with self._lock:
+            row = self._rows.get(notification_key(notification_id))
+        if row is None:
+            return False
+        if is_broadcast(row):
+            return self._add_receipts([row['id']], username, 'read') > 0
+        return st.session_state.data_manager.update_record(NOTIFICATIONS_TABLE, row['id'], {'read': True})
+
+    def mark_all_read(self, username):
+        """Mark a user's unread notifications read: receipts for shared rows, one update for own rows"""
+        unread = [n for n in self.get_user_notifications(username) if not n['read']]
+        shared = [n['id'] for n in unread if is_broadcast(n)]
+        own = {n['id']: {'read': True} for n in unread if not is_broadcast(n)}
+        changed = self._add_receipts(shared, username, 'read')
+        if own:
+            changed += st.session_state.data_manager.update_records(NOTIFICATIONS_TABLE, own)
+        return changed > 0
+
+    def delete(self, notification_id, username):
+        """Dismiss a notification for this user (a 'deleted' receipt; shared rows stay for others)"""
+        self._ensure_loaded()
+        with self._lock:
+            row = self._rows.get(notification_key(notification_id))
+        if row is None:
+            return False
+        return self._add_receipts([row['id']], username, 'deleted') > 0
+
+
+# Global notification store instance
+notification_store = NotificationStore()
+add_write_listener(notification_store.on_write)
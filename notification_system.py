@@ -1,58 +1,125 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+import threading
 from error_handler import error_handler
+from event_bus import TOPIC_NOTIFICATION
+from notification_store import (
+    notification_store, club_audience, users_audience, AUDIENCE_ALL
+)
 
 class NotificationSystem:
     def __init__(self):
         self.notifications_file = 'data/notifications.csv'
+        self._data_manager = None
+        self._subscribe_lock = threading.Lock()
     
-    def add_notification(self, title, notification_type, target_user, message=""):
-        """Add a new notification"""
+    def _event_bus(self):
+        """The shared event bus, with this system's persistence subscriber attached"""
+        bus = st.session_state.get('event_bus')
+        if bus is None:
+            return None
+        with self._subscribe_lock:
+            if self._data_manager is None:
+                self._data_manager = st.session_state.data_manager
+                bus.subscribe(TOPIC_NOTIFICATION, self._persist_notifications)
+        return bus
+    
+    def _persist_notifications(self, event):
+        """Event bus subscriber: write published notifications (dispatcher thread)"""
+        records = event['payload']['records']
+        if records:
+            self._data_manager.add_records('notifications', records, audit=False)
+    
+    def _publish(self, records):
+        """Publish notification rows; they are written off the request path"""
+        bus = self._event_bus()
+        if bus is None:
+            # No shared bus (e.g. scripts) - write synchronously
+            st.session_state.data_manager.add_records('notifications', records, audit=False)
+            return True
+        bus.publish(TOPIC_NOTIFICATION, {'records': records})
+        return True
+    
+    def add_notification(self, title, notification_type, target_user, message="", audience=None):
+        """Add a new notification.
+
+        target_user "all" (or an explicit audience such as club_audience())
+        stores one shared row; read state is then kept per user as receipts.
+        """
         try:
+            if audience is None:
+                audience = AUDIENCE_ALL if target_user == "all" else ''
             notification_data = {
                 'username': target_user,
                 'title': title,
                 'message': message,
                 'type': notification_type,
                 'read': False,
-                'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'created_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'audience': audience
             }
+            return self._publish([notification_data])
             
-            # If target is "all", create notifications for all users
-            if target_user == "all":
-                users_df = st.session_state.data_manager.load_csv('users')
-                if not users_df.empty:
-                    for _, user in users_df.iterrows():
-                        notification_data['username'] = user['username']
-                        st.session_state.data_manager.add_record('notifications', notification_data.copy())
-                    return True
-            else:
-                return st.session_state.data_manager.add_record('notifications', notification_data)
-            
+        except Exception as e:
+            st.error(f"알림 생성 중 오류가 발생했습니다: {e}")
+            return False
+    
+    def add_notifications(self, notifications):
+        """Add several per-user notifications with a single write.
+
+        Each item is a dict with title, type, username and optional message.
+        """
+        try:
+            created_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            records = [
+                {
+                    'username': notification['username'],
+                    'title': notification['title'],
+                    'message': notification.get('message', ''),
+                    'type': notification['type'],
+                    'read': False,
+                    'created_date': created_date,
+                    'audience': ''
+                }
+                for notification in notifications
+            ]
+            return self._publish(records) if records else False
         except Exception as e:
             st.error(f"알림 생성 중 오류가 발생했습니다: {e}")
             return False
     
     def get_user_notifications(self, username):
-        """Get notifications for a specific user"""
+        """Get notifications for a specific user (own and shared), newest first"""
         try:
-            notifications_df = st.session_state.data_manager.load_csv('notifications')
-            
-            if notifications_df.empty:
-                return []
-            
-            user_notifications = notifications_df[notifications_df['username'] == username]
-            user_notifications = user_notifications.sort_values('created_date', ascending=False)
-            
-            return user_notifications.to_dict('records')
+            return notification_store.get_user_notifications(username)
         except:
             return []
     
-    def mark_as_read(self, notification_id):
-        """Mark a notification as read"""
+    def get_unread_count(self, username):
+        """Unread notifications for the header badge (kept in memory)"""
         try:
-            return st.session_state.data_manager.update_record('notifications', notification_id, {'read': True})
+            return notification_store.unread_count(username)
+        except:
+            return 0
+    
+    def get_latest_notifications(self, username, limit=5):
+        """A user's newest notifications, for widgets that show only a few"""
+        try:
+            return notification_store.latest(username, limit)
+        except:
+            return []
+    
+    @staticmethod
+    def _current_username(username):
+        if username is not None:
+            return username
+        return st.session_state.user['username'] if 'user' in st.session_state else None
+    
+    def mark_as_read(self, notification_id, username=None):
+        """Mark a notification as read (for this user only, if it is shared)"""
+        try:
+            return notification_store.mark_read(notification_id, self._current_username(username))
         except Exception as e:
             st.error(f"알림 읽음 처리 중 오류가 발생했습니다: {e}")
             return False
@@ -60,26 +127,15 @@ class NotificationSystem:
     def mark_all_as_read(self, username):
         """Mark all notifications as read for a user"""
         try:
-            notifications_df = st.session_state.data_manager.load_csv('notifications')
-            user_notifications = notifications_df[
-                (notifications_df['username'] == username) & 
-                (notifications_df['read'] == False)
-            ]
-            
-            success_count = 0
-            for _, notification in user_notifications.iterrows():
-                if self.mark_as_read(notification['id']):
-                    success_count += 1
-            
-            return success_count > 0
+            return notification_store.mark_all_read(username)
         except Exception as e:
             st.error(f"전체 알림 읽음 처리 중 오류가 발생했습니다: {e}")
             return False
     
-    def delete_notification(self, notification_id):
-        """Delete a notification"""
+    def delete_notification(self, notification_id, username=None):
+        """Delete a notification for this user (the row itself stays; a dismissal is recorded)"""
         try:
-            return st.session_state.data_manager.delete_record('notifications', notification_id)
+            return notification_store.delete(notification_id, self._current_username(username))
         except Exception as e:
             st.error(f"알림 삭제 중 오류가 발생했습니다: {e}")
             return False
@@ -212,44 +268,33 @@ class NotificationSystem:
             with col1:
                 if not read_status:
                     if st.button("📖", key=f"read_{notification['id']}", help="읽음 처리"):
-                        if self.mark_as_read(notification['id']):
+                        if self.mark_as_read(notification['id'], user['username']):
                             st.rerun()
             
             with col2:
                 if st.button("🗑️", key=f"delete_{notification['id']}", help="삭제"):
-                    if self.delete_notification(notification['id']):
+                    if self.delete_notification(notification['id'], user['username']):
                         st.success("알림이 삭제되었습니다.")
                         st.rerun()
     
     def send_system_notification(self, title, message, notification_type="info", target_users=None):
-        """Send system-wide notification"""
+        """Send system-wide notification (one shared row for all targets)"""
         try:
             if target_users is None:
-                # Send to all users
-                users_df = st.session_state.data_manager.load_csv('users')
-                target_users = users_df['username'].tolist() if not users_df.empty else []
-            
-            success_count = 0
-            for username in target_users:
-                if self.add_notification(title, notification_type, username, message):
-                    success_count += 1
-            
-            return success_count > 0
+                return self.add_notification(title, notification_type, "all", message)
+            if not target_users:
+                return False
+            return self.add_notification(title, notification_type, '', message,
+                                         audience=users_audience(target_users))
         except Exception as e:
             st.error(f"시스템 알림 발송 중 오류가 발생했습니다: {e}")
             return False
     
     def send_club_notification(self, club_name, title, message, notification_type="info"):
-        """Send notification to specific club members"""
+        """Send notification to specific club members (one shared row)"""
         try:
-            users_df = st.session_state.data_manager.load_csv('users')
-            
-            if club_name == "전체":
-                club_users = users_df['username'].tolist()
-            else:
-                club_users = users_df[users_df['club_name'] == club_name]['username'].tolist()
-            
-            return self.send_system_notification(title, message, notification_type, club_users)
+            return self.add_notification(title, notification_type, '', message,
+                                         audience=club_audience(club_name))
         except Exception as e:
             st.error(f"동아리 알림 발송 중 오류가 발생했습니다: {e}")
             return False
@@ -315,9 +360,10 @@ class NotificationSystem:
             if notifications_df.empty:
                 return {}
             
-            # Overall stats
+            # Overall stats; read state lives in receipts for shared rows,
+            # so it is counted per delivery by the store
             total_notifications = len(notifications_df)
-            unread_notifications = len(notifications_df[notifications_df['read'] == False])
+            delivered, unread_notifications = notification_store.delivery_counts()
             
             # By type
             type_counts = notifications_df['type'].value_counts().to_dict()
@@ -332,7 +378,7 @@ class NotificationSystem:
                 'unread': unread_notifications,
                 'by_type': type_counts,
                 'recent_week': recent_notifications,
-                'read_rate': ((total_notifications - unread_notifications) / total_notifications * 100) if total_notifications > 0 else 0
+                'read_rate': ((delivered - unread_notifications) / delivered * 100) if delivered > 0 else 0
             }
             
         except Exception as e:
@@ -0,0 +1,351 @@
+import pandas as pd
+import os
+import json
+import threading
+import atexit
+from datetime import datetime
+import streamlit as st
+from storage_backend import get_storage_backend
+from data_manager import add_write_listener
+from activity_stats import ACTIVITY_SOURCES
+
+# Points per activity type (shared with GamificationSystem)
+POINT_VALUES = {
+    '출석': 10,
+    '과제제출': 20,
+    '게시글작성': 5,
+    '댓글작성': 2,
+    '퀴즈참여': 15,
+    '투표참여': 5,
+    '회의참석': 25,
+    '우수활동': 50
+}
+
+# The balance snapshot is rewritten after this many new ledger entries
+SNAPSHOT_EVERY = 100
+
+# Snapshot format; snapshots of another version are ignored and the ledger replayed
+SNAPSHOT_VERSION = 2
+
+# Sources whose credits change the balance but not earned points (levels,
+# rankings, today's points) - e.g. roulette winnings
+UNEARNED_SOURCES = {'game'}
+
+LEDGER_COLUMNS = ['id', 'username', 'delta', 'reason', 'source', 'source_id', 'created_date']
+
+# Tables whose rows earn points, tracked so removed rows give them back
+ACTIVITY_TABLES = {
+    source for counter, (source, _, _) in ACTIVITY_SOURCES.items() if counter in POINT_VALUES
+}
+
+# Columns that date an activity row, used when seeding the ledger
+ACTIVITY_DATE_COLUMNS = ['date', 'submitted_date', 'created_date', 'timestamp']
+
+
+def _source_key(value):
+    """Normalize a source row id so 3, 3.0 and '3' compare equal"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+class PointsLedger:
+    """Append-only points ledger with an in-memory balance per user.
+
+    Every point change is a ledger row (username, delta, reason, source).
+    Activity rows earn points through the DataManager write listener, and
+    spending (the point shop, roulette) appends negative deltas, so a
+    balance lookup is a dict read. Balances are snapshotted to
+    points_balance.json together with the last ledger id; on start only
+    the entries after that id are replayed.
+    """
+
+    def __init__(self, data_dir='data', table='points_ledger'):
+        self.storage = get_storage_backend(data_dir)
+        self.table = table
+        self.snapshot_file = os.path.join(data_dir, 'points_balance.json')
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._last_id = 0
+        self._balances = {}
+        self._earned = {}
+        self._today = (None, {})
+        self._credited = {}  # (source table, source_id) -> username holding its points
+        self._unsnapshotted = 0
+        atexit.register(self.save_snapshot)
+
+    # -- loading ---------------------------------------------------------
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            if self.storage.exists(self.table):
+                self._load_snapshot()
+                self._replay_ledger()
+            else:
+                self._seed_from_activity()
+            self._loaded = True
+
+    def _load_snapshot(self):
+        """Restore balances from the snapshot (an outdated one is ignored: full replay)"""
+        if not os.path.exists(self.snapshot_file):
+            return
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            return
+        self._last_id = snapshot.get('last_id', 0)
+        self._balances = snapshot.get('balances', {})
+        self._earned = snapshot.get('earned', {})
+        today = snapshot.get('today', {})
+        self._today = (today.get('date'), today.get('earned', {}))
+        self._credited = {(source, source_id): username for source, source_id, username in snapshot['credited']}
+
+    def _replay_ledger(self):
+        """Apply ledger entries written after the snapshot"""
+        ledger_df = self.storage.read(self.table)
+        if ledger_df.empty:
+            return
+        ids = pd.to_numeric(ledger_df['id'], errors='coerce').fillna(0)
+        for entry in ledger_df[ids > self._last_id].to_dict('records'):
+            self._apply(entry)
+
+    def _seed_from_activity(self):
+        """First run: one ledger entry per existing activity row"""
+        entries = []
+        data_manager = st.session_state.data_manager
+        for counter, (source, user_col, row_filter) in ACTIVITY_SOURCES.items():
+            if counter not in POINT_VALUES:
+                continue
+            df = data_manager.load_csv(source)
+            if df.empty or user_col not in df.columns:
+                continue
+            if row_filter:
+                if row_filter[0] not in df.columns:
+                    continue
+                df = df[df[row_filter[0]] == row_filter[1]]
+            date_col = next((col for col in ACTIVITY_DATE_COLUMNS if col in df.columns), None)
+            for row in df.to_dict('records'):
+                created = row.get(date_col) if date_col else None
+                if isinstance(created, (datetime, pd.Timestamp)):
+                    created = created.strftime('%Y-%m-%d %H:%M:%S')
+                entries.append(self._new_entry(
+                    row[user_col], POINT_VALUES[counter], counter, source, row.get('id'),
+                    created_date=str(created) if created is not None and not pd.isna(created) else None
+                ))
+
+        ledger_df = pd.DataFrame(entries, columns=LEDGER_COLUMNS)
+        self.storage.write(self.table, ledger_df)
+        for entry in entries:
+            self._apply(entry)
+        self.save_snapshot()
+
+    # -- writing ---------------------------------------------------------
+
+    def _new_entry(self, username, delta, reason, source='', source_id='', created_date=None):
+        self._last_id += 1
+        return {
+            'id': self._last_id,
+            'username': username,
+            'delta': int(delta),
+            'reason': reason,
+            'source': source,
+            'source_id': '' if source_id is None else _source_key(source_id),
+            'created_date': created_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def _apply(self, entry):
+        """Fold one ledger entry into the in-memory balances"""
+        username = entry['username']
+        delta = int(entry['delta'])
+        self._last_id = max(self._last_id, int(entry['id']))
+        self._balances[username] = self._balances.get(username, 0) + delta
+        self._track_credit(entry)
+
+        if delta > 0 and entry.get('source') not in UNEARNED_SOURCES:
+            self._earned[username] = self._earned.get(username, 0) + delta
+            day = str(entry.get('created_date'))[:10]
+            today = datetime.now().strftime('%Y-%m-%d')
+            if self._today[0] != today:
+                self._today = (today, {})
+            if day == today:
+                self._today[1][username] = self._today[1].get(username, 0) + delta
+
+    def _track_credit(self, entry):
+        """Remember which activity rows currently hold points"""
+        source = entry.get('source')
+        if source not in ACTIVITY_TABLES:
+            return
+        key = (source, _source_key(entry.get('source_id')))
+        if int(entry['delta']) > 0:
+            self._credited[key] = entry['username']
+        else:
+            self._credited.pop(key, None)
+
+    def _append(self, entries):
+        if not entries:
+            return
+        self.storage.append_many(self.table, entries)
+        for entry in entries:
+            self._apply(entry)
+        self._unsnapshotted += len(entries)
+        if self._unsnapshotted >= SNAPSHOT_EVERY:
+            self.save_snapshot()
+
+    def save_snapshot(self):
+        """Write the current balances and last applied ledger id"""
+        with self._lock:
+            if not self._loaded and not self._balances:
+                return
+            snapshot = {
+                'version': SNAPSHOT_VERSION,
+                'last_id': self._last_id,
+                'balances': self._balances,
+                'earned': self._earned,
+                'today': {'date': self._today[0], 'earned': self._today[1]},
+                'credited': [[source, source_id, username]
+                             for (source, source_id), username in sorted(self._credited.items())]
+            }
+            tmp_path = self.snapshot_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_file)
+            self._unsnapshotted = 0
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener: earn points for new activity rows,
+        take them back for rows a rewrite or delete removed"""
+        sources = [
+            (counter, user_col, row_filter)
+            for counter, (source, user_col, row_filter) in ACTIVITY_SOURCES.items()
+            if source == table and counter in POINT_VALUES
+        ]
+        if not sources:
+            return
+
+        # Loading may seed from the tables, which already hold these records;
+        # _credited then marks them as counted
+        self._ensure_loaded()
+        with self._lock:
+            entries = []
+            for counter, user_col, row_filter in sources:
+                if records is None:
+                    entries.extend(self._reconcile_removed(table, counter, row_filter))
+                elif columns is None:
+                    for record in records:
+                        if row_filter and record.get(row_filter[0]) != row_filter[1]:
+                            continue
+                        if (table, _source_key(record.get('id'))) in self._credited:
+                            continue
+                        entries.append(self._new_entry(
+                            record.get(user_col), POINT_VALUES[counter], counter, table, record.get('id')))
+                elif row_filter and row_filter[0] in columns and table == 'attendance':
+                    # Attendance status edits: credit or take back the attendance points
+                    entries.extend(self._reconcile_attendance(records, counter, row_filter))
+            self._append(entries)
+
+    def _reconcile_attendance(self, changes, counter, row_filter):
+        column, value = row_filter
+        changed = [c for c in changes if column in c]
+        if not changed:
+            return []
+        attendance_df = st.session_state.data_manager.load_csv('attendance')
+        usernames = {_source_key(i): u for i, u in zip(attendance_df['id'], attendance_df['username'])}
+
+        entries = []
+        for change in changed:
+            source_id = _source_key(change['id'])
+            username = usernames.get(source_id)
+            if username is None:
+                continue
+            credited = ('attendance', source_id) in self._credited
+            if change[column] == value and not credited:
+                entries.append(self._new_entry(username, POINT_VALUES[counter], counter, 'attendance', source_id))
+            elif change[column] != value and credited:
+                entries.append(self._new_entry(username, -POINT_VALUES[counter], f"{counter} 취소", 'attendance', source_id))
+        return entries
+
+    def _reconcile_removed(self, table, counter, row_filter):
+        """Negative entries for credited rows that are no longer in the table"""
+        source_df = st.session_state.data_manager.load_csv(table)
+        if 'id' not in source_df.columns:
+            return []
+        if row_filter and row_filter[0] in source_df.columns:
+            source_df = source_df[source_df[row_filter[0]] == row_filter[1]]
+        live = {_source_key(source_id) for source_id in source_df['id']}
+        return [
+            self._new_entry(username, -POINT_VALUES[counter], f"{counter} 취소", table, source_id)
+            for (source, source_id), username in list(self._credited.items())
+            if source == table and source_id not in live
+        ]
+
+    # -- queries and spending -------------------------------------------
+
+    def get_balance(self, username):
+        """Spendable points of a user"""
+        self._ensure_loaded()
+        return self._balances.get(username, 0)
+
+    def get_earned(self, username):
+        """Points a user has earned in total (spending does not lower it, game winnings do not raise it)"""
+        self._ensure_loaded()
+        return self._earned.get(username, 0)
+
+    def get_earned_map(self):
+        """{username: earned points} for every user with ledger entries"""
+        self._ensure_loaded()
+        with self._lock:
+            return dict(self._earned)
+
+    def get_earned_today(self, username):
+        """Points a user has earned today"""
+        self._ensure_loaded()
+        date, earned = self._today
+        if date != datetime.now().strftime('%Y-%m-%d'):
+            return 0
+        return earned.get(username, 0)
+
+    def spend(self, username, amount, reason, source='purchase'):
+        """Deduct points if the balance covers them. Returns True on success"""
+        self._ensure_loaded()
+        with self._lock:
+            if self._balances.get(username, 0) < amount:
+                return False
+            self._append([self._new_entry(username, -amount, reason, source)])
+        return True
+
+    def award(self, username, amount, reason, source='game'):
+        """Add points outside the regular activity sources (games, rewards).
+
+        Credits from UNEARNED_SOURCES such as 'game' raise the balance only.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._append([self._new_entry(username, amount, reason, source)])
+        return True
+
+    def files(self):
+        """Paths of the ledger table and a fresh balance snapshot, relative to the data dir"""
+        self.save_snapshot()
+        return [os.path.basename(self.storage.table_path(self.table)), os.path.basename(self.snapshot_file)]
+
+    def get_history(self, username, limit=20):
+        """Latest ledger entries of a user"""
+        self._ensure_loaded()
+        ledger_df = self.storage.read(self.table)
+        if ledger_df.empty:
+            return []
+        return ledger_df[ledger_df['username'] == username].tail(limit).iloc[::-1].to_dict('records')
+
+
+# Global points ledger instance
+points_ledger = PointsLedger()
+add_write_listener(points_ledger.on_write)
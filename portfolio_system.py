@@ -5,6 +5,7 @@ import base64
 import io
 from PIL import Image
 from error_handler import error_handler
+from user_directory import user_directory
 
 class PortfolioSystem:
     def __init__(self):
@@ -276,9 +277,7 @@ class PortfolioSystem:
         # Display portfolios
         for idx, item in public_portfolios.iterrows():
             # Get user info
-            users_df = st.session_state.data_manager.load_csv('users')
-            creator = users_df[users_df['username'] == item['username']] if not users_df.empty else pd.DataFrame()
-            creator_name = creator.iloc[0]['name'] if not creator.empty else item['username']
+            creator_name = user_directory.get_display_name(item['username'])
 
             # Add creator info to item
             item_with_creator = item.copy()
@@ -420,9 +419,7 @@ class PortfolioSystem:
 
             for i, (username, count) in enumerate(user_portfolio_counts.items()):
                 # Get user info
-                users_df = st.session_state.data_manager.load_csv('users')
-                user_info = users_df[users_df['username'] == username] if not users_df.empty else pd.DataFrame()
-                name = user_info.iloc[0]['name'] if not user_info.empty else username
+                name = user_directory.get_display_name(username)
 
                 rank = i + 1
                 is_current = username == user['username']
@@ -0,0 +1,195 @@
+import threading
+from bisect import bisect_right, insort
+import pandas as pd
+import streamlit as st
+from error_handler import error_handler
+from data_manager import add_write_listener
+from counter_store import counter_store
+from comment_store import comment_store
+
+# Board sort option -> post field ranked on (ties fall back to newest first)
+SORT_FIELDS = {
+    '최신순': None,
+    '좋아요순': 'likes',
+    '댓글순': 'comments',
+}
+
+# Post columns that move a post within a ranking when updated
+SORT_COLUMNS = {'likes', 'comments', 'created_date', 'club'}
+
+PAGE_SIZE = 10
+
+
+def post_key(value):
+    """Normalize a post id so 3, 3.0 and '3' name the same post"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _count(value):
+    number = pd.to_numeric(value, errors='coerce')
+    return 0 if pd.isna(number) else int(number)
+
+
+class PostFeed:
+    """Board post list kept pre-sorted for each sort option.
+
+    Every post gets a sort key per option, (-value, -created, id), and
+    the keys live in sorted lists per (option, club) - one for the whole
+    board and one per club. A page is a binary search for the cursor (the
+    last key shown) plus a slice, so showing the board costs one page of
+    posts however many there are. Post rows are kept by id and updated
+    from the DataManager write listener; like and comment counts come
+    from the counter store.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._posts = None    # post_key -> record dict
+        self._keys = {}       # post_key -> {option: sort key}
+        self._rankings = {}   # (option, club or None) -> sorted list of sort keys
+
+    def invalidate(self):
+        with self._lock:
+            self._posts = None
+
+    # -- maintenance -----------------------------------------------------
+
+    def _sort_keys(self, key, post):
+        created = error_handler.safe_datetime_parse(post.get('created_date')).timestamp()
+        keys = {}
+        for option, field in SORT_FIELDS.items():
+            value = _count(post.get(field)) if field else 0
+            keys[option] = (-value, -created, key)
+        return keys
+
+    def _lists_for(self, option, post):
+        lists = [(option, None)]
+        club = post.get('club')
+        if isinstance(club, str) and club:
+            lists.append((option, club))
+        return lists
+
+    def _add_post(self, post):
+        counter_store.merge_record('posts', post)
+        key = post_key(post.get('id'))
+        if key in self._posts:
+            self._remove_post(key)
+        self._posts[key] = post
+        self._keys[key] = self._sort_keys(key, post)
+        for option, sort_key in self._keys[key].items():
+            for list_key in self._lists_for(option, post):
+                insort(self._rankings.setdefault(list_key, []), sort_key)
+
+    def _remove_post(self, key):
+        post = self._posts.pop(key, None)
+        keys = self._keys.pop(key, None)
+        if post is None or keys is None:
+            return
+        for option, sort_key in keys.items():
+            for list_key in self._lists_for(option, post):
+                ranking = self._rankings.get(list_key, [])
+                position = bisect_right(ranking, sort_key) - 1
+                if position >= 0 and ranking[position] == sort_key:
+                    del ranking[position]
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._posts is not None:
+                return
+            self._posts = {}
+            self._keys = {}
+            self._rankings = {}
+            # Comment counters are corrected from the comments table before ranking
+            comment_store.sync_counters()
+            posts_df = st.session_state.data_manager.load_csv('posts')
+            for post in posts_df.to_dict('records'):
+                self._add_post(post)
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener"""
+        if table != 'posts':
+            return
+        with self._lock:
+            if self._posts is None:
+                return
+            if records is None:
+                self._posts = None
+                return
+            for record in records:
+                if columns is None:
+                    self._add_post(dict(record))
+                    continue
+                key = post_key(record.get('id'))
+                post = self._posts.get(key)
+                if post is None:
+                    continue
+                updated = dict(post)
+                updated.update(record)
+                if columns & SORT_COLUMNS:
+                    self._add_post(updated)
+                else:
+                    self._posts[key] = updated
+
+    def on_counter(self, namespace, key, field, value):
+        """CounterStore listener: re-rank a post whose like/comment count changed"""
+        if namespace != 'posts':
+            return
+        with self._lock:
+            if self._posts is None or key not in self._posts:
+                return
+            updated = dict(self._posts[key])
+            updated[field] = value
+            self._add_post(updated)
+
+    # -- queries ---------------------------------------------------------
+
+    def page(self, sort_by='최신순', club=None, post_ids=None, cursor=None, limit=PAGE_SIZE):
+        """One page of posts in board order.
+
+        club limits the page to one club's posts and post_ids to a set of
+        ids (e.g. search hits). cursor is the next_cursor of the previous
+        page. Returns (posts, next_cursor); next_cursor is None on the
+        last page.
+        """
+        self._ensure_loaded()
+        option = sort_by if sort_by in SORT_FIELDS else '최신순'
+        wanted = {post_key(post_id) for post_id in post_ids} if post_ids is not None else None
+        with self._lock:
+            ranking = self._rankings.get((option, club), [])
+            start = bisect_right(ranking, cursor) if cursor is not None else 0
+            posts = []
+            last_key = None
+            for position in range(start, len(ranking)):
+                sort_key = ranking[position]
+                if wanted is not None and sort_key[2] not in wanted:
+                    continue
+                if len(posts) == limit:
+                    return posts, last_key
+                posts.append(dict(self._posts[sort_key[2]]))
+                last_key = sort_key
+            return posts, None
+
+    def count(self, club=None):
+        """Number of posts on the board (or in one club)"""
+        self._ensure_loaded()
+        with self._lock:
+            return len(self._rankings.get(('최신순', club), []))
+
+    def get_post(self, post_id):
+        """A single post row, or None"""
+        self._ensure_loaded()
+        with self._lock:
+            post = self._posts.get(post_key(post_id))
+            return dict(post) if post else None
+
+
+# Global post feed instance
+post_feed = PostFeed()
+add_write_listener(post_feed.on_write)
+counter_store.add_listener(post_feed.on_counter)
@@ -0,0 +1,221 @@
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+import streamlit as st
+from data_manager import add_write_listener
+
+# Response columns a leaderboard depends on; updates touching them force a rebuild
+LEADERBOARD_COLUMNS = {'quiz_id', 'username', 'score', 'total_questions', 'time_taken', 'completed_date'}
+
+
+def quiz_key(value):
+    """Normalize a quiz id so 3, 3.0 and '3' land on the same board"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0
+    return 0 if number != number else number  # NaN -> 0
+
+
+class LeaderboardBoard:
+    """Running per-user sums for one board plus a ranking kept sorted.
+
+    The ranking is a sorted list of (-score, -accuracy, username) keys:
+    an update finds the user's old key by binary search and re-inserts the
+    new one, and reading the top K is a slice.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self.ranking = []
+        self.total_attempts = 0
+
+    @staticmethod
+    def _rank_key(username, stats):
+        accuracy = stats['score'] / stats['questions'] if stats['questions'] else 0
+        return (-stats['score'], -round(accuracy * 100, 1), str(username))
+
+    def add(self, username, score, total, time_taken):
+        stats = self.stats.get(username)
+        if stats is None:
+            stats = {
+                'score': 0, 'questions': 0, 'attempts': 0, 'perfect': 0, 'ratio_sum': 0.0,
+                'best_ratio': 0.0, 'best_score': 0, 'best_total': 0, 'best_time': 0
+            }
+            self.stats[username] = stats
+        else:
+            old_key = self._rank_key(username, stats)
+            del self.ranking[bisect_left(self.ranking, old_key)]
+
+        ratio = score / total if total else 0
+        stats['score'] += score
+        stats['questions'] += total
+        stats['attempts'] += 1
+        stats['ratio_sum'] += ratio
+        if total and score == total:
+            stats['perfect'] += 1
+        stats['best_ratio'] = max(stats['best_ratio'], ratio)
+        if stats['attempts'] == 1 or score > stats['best_score']:
+            stats['best_score'], stats['best_total'], stats['best_time'] = score, total, time_taken
+
+        insort(self.ranking, self._rank_key(username, stats))
+        self.total_attempts += 1
+
+    def row(self, username):
+        stats = self.stats.get(username)
+        if stats is None:
+            return None
+        row = dict(stats)
+        row['username'] = username
+        row['accuracy'] = round(stats['score'] / stats['questions'] * 100, 1) if stats['questions'] else 0.0
+        row['avg_ratio'] = stats['ratio_sum'] / stats['attempts'] if stats['attempts'] else 0.0
+        row['rank'] = bisect_left(self.ranking, self._rank_key(username, stats)) + 1
+        return row
+
+    def top(self, k):
+        return [self.row(key[2]) for key in self.ranking[:k]]
+
+
+class QuizLeaderboard:
+    """Quiz leaderboards (global, per club, per quiz) kept up to date from
+    the DataManager write listener, so views no longer regroup the whole
+    quiz_responses table.
+
+    Boards are built in one pass on first use; each new response is then
+    added to the global board, its club's board and its quiz's board.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._boards = None
+        self._daily = Counter()
+        self._user_quizzes = {}
+        self._quiz_clubs = None
+
+    def invalidate(self):
+        with self._lock:
+            self._boards = None
+            self._quiz_clubs = None
+
+    def _load_quiz_clubs(self):
+        quizzes_df = st.session_state.data_manager.load_csv('quizzes')
+        if quizzes_df.empty or 'club' not in quizzes_df.columns:
+            return {}
+        return {quiz_key(quiz_id): club for quiz_id, club in zip(quizzes_df['id'], quizzes_df['club'])}
+
+    def _club_of(self, key):
+        if self._quiz_clubs is None or key not in self._quiz_clubs:
+            self._quiz_clubs = self._load_quiz_clubs()
+        return self._quiz_clubs.get(key)
+
+    def _add_response(self, response):
+        username = response.get('username')
+        key = quiz_key(response.get('quiz_id'))
+        score = _number(response.get('score'))
+        total = _number(response.get('total_questions'))
+        time_taken = _number(response.get('time_taken'))
+
+        boards = [('global',), ('quiz', key)]
+        club = self._club_of(key)
+        if club is not None:
+            boards.append(('club', club))
+        for board_key in boards:
+            board = self._boards.get(board_key)
+            if board is None:
+                board = self._boards[board_key] = LeaderboardBoard()
+            board.add(username, score, total, time_taken)
+
+        self._daily[str(response.get('completed_date', ''))[:10]] += 1
+        self._user_quizzes.setdefault(username, set()).add(key)
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._boards is not None:
+                return
+            self._boards = {('global',): LeaderboardBoard()}
+            self._daily = Counter()
+            self._user_quizzes = {}
+            self._quiz_clubs = self._load_quiz_clubs()
+            responses_df = st.session_state.data_manager.load_csv('quiz_responses')
+            for response in responses_df.to_dict('records'):
+                self._add_response(response)
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener"""
+        if table == 'quizzes':
+            with self._lock:
+                if records is not None and columns is None and self._quiz_clubs is not None:
+                    for quiz in records:
+                        self._quiz_clubs[quiz_key(quiz.get('id'))] = quiz.get('club')
+                else:
+                    # Quizzes edited or deleted - club boards may have moved
+                    self._boards = None
+                    self._quiz_clubs = None
+            return
+
+        if table != 'quiz_responses':
+            return
+        with self._lock:
+            if self._boards is None:
+                return
+            if records is None or (columns is not None and columns & LEADERBOARD_COLUMNS):
+                self._boards = None
+            elif columns is None:
+                for response in records:
+                    self._add_response(response)
+
+    def top(self, k=10, club=None, quiz_id=None):
+        """Top K rows of the global board, or of one club's or quiz's board"""
+        self._ensure_loaded()
+        with self._lock:
+            board = self._boards.get(self._board_key(club, quiz_id))
+            return board.top(k) if board else []
+
+    def get_user_stats(self, username, club=None, quiz_id=None):
+        """A user's row on a board (score, attempts, accuracy, rank, ...), or None"""
+        self._ensure_loaded()
+        with self._lock:
+            board = self._boards.get(self._board_key(club, quiz_id))
+            return board.row(username) if board else None
+
+    def get_user_quizzes(self, username):
+        """Quiz ids (as strings) the user has answered"""
+        self._ensure_loaded()
+        with self._lock:
+            return sorted(self._user_quizzes.get(username, set()))
+
+    def get_totals(self):
+        """(total responses, active users, {date: responses})"""
+        self._ensure_loaded()
+        with self._lock:
+            board = self._boards[('global',)]
+            return board.total_attempts, len(board.stats), dict(self._daily)
+
+    def get_clubs(self):
+        """Clubs that have a board"""
+        self._ensure_loaded()
+        with self._lock:
+            return sorted(str(key[1]) for key in self._boards if key[0] == 'club')
+
+    @staticmethod
+    def _board_key(club, quiz_id):
+        if quiz_id is not None:
+            return ('quiz', quiz_key(quiz_id))
+        if club is not None:
+            return ('club', club)
+        return ('global',)
+
+
+# Global quiz leaderboard instance
+quiz_leaderboard = QuizLeaderboard()
+add_write_listener(quiz_leaderboard.on_write)
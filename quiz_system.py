@@ -8,6 +8,7 @@ import plotly.graph_objects as go
 from collections import Counter
 import random
 from error_handler import error_handler
+from quiz_leaderboard import quiz_leaderboard, quiz_key
 
 
 class QuizSystem:
@@ -92,24 +93,23 @@ class QuizSystem:
 
     def show_user_quiz_stats(self, user):
         """Display user quiz statistics at the top"""
-        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        user_responses = responses_df[responses_df['username'] == user['username']] if not responses_df.empty else pd.DataFrame()
+        user_stats = quiz_leaderboard.get_user_stats(user['username'])
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_attempts = len(user_responses)
+            total_attempts = user_stats['attempts'] if user_stats else 0
             error_handler.wrap_streamlit_component(st.metric, "🎯 총 시도", total_attempts)
         
         with col2:
-            if not user_responses.empty:
-                avg_score = (user_responses['score'] / user_responses['total_questions']).mean() * 100
+            if user_stats:
+                avg_score = user_stats['avg_ratio'] * 100
                 error_handler.wrap_streamlit_component(st.metric, "📊 평균 점수", f"{avg_score:.1f}%")
             else:
                 error_handler.wrap_streamlit_component(st.metric, "📊 평균 점수", "0%")
         
         with col3:
-            perfect_scores = len(user_responses[user_responses['score'] == user_responses['total_questions']]) if not user_responses.empty else 0
+            perfect_scores = user_stats['perfect'] if user_stats else 0
             error_handler.wrap_streamlit_component(st.metric, "🏆 만점 횟수", perfect_scores)
         
         with col4:
@@ -431,25 +431,32 @@ class QuizSystem:
         """Display quiz leaderboard"""
         st.markdown("#### 🏆 퀴즈 리더보드")
         
-        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        if responses_df.empty:
+        # Boards are maintained incrementally - reading the top 10 is a slice
+        scope = st.radio("범위", ["전체", "동아리별", "퀴즈별"], horizontal=True, key="quiz_leaderboard_scope")
+        club = quiz_id = None
+        if scope == "동아리별":
+            clubs = quiz_leaderboard.get_clubs()
+            if not clubs:
+                st.info("아직 퀴즈 응답이 없습니다.")
+                return
+            club = st.selectbox("동아리", clubs, key="quiz_leaderboard_club")
+        elif scope == "퀴즈별":
+            quizzes_df = st.session_state.data_manager.load_csv('quizzes')
+            if quizzes_df.empty:
+                st.info("아직 퀴즈가 없습니다.")
+                return
+            quiz_options = {f"{row['title']} ({row['club']})": row['id'] for _, row in quizzes_df.iterrows()}
+            quiz_id = quiz_options[st.selectbox("퀴즈", list(quiz_options.keys()), key="quiz_leaderboard_quiz")]
+
+        top_rows = quiz_leaderboard.top(10, club=club, quiz_id=quiz_id)
+        if not top_rows:
             st.info("아직 퀴즈 응답이 없습니다.")
             return
         
-        # Calculate user statistics
-        user_stats = responses_df.groupby('username').agg({
-            'score': 'sum',
-            'total_questions': 'sum',
-            'quiz_id': 'count'
-        }).reset_index()
-        
-        user_stats['accuracy'] = (user_stats['score'] / user_stats['total_questions'] * 100).round(1)
-        user_stats = user_stats.sort_values(['score', 'accuracy'], ascending=[False, False])
-        
         # Display top 10
         st.markdown("##### 🥇 상위 랭킹")
-        for idx, row in user_stats.head(10).iterrows():
-            rank = user_stats.index.get_loc(idx) + 1
+        for row in top_rows:
+            rank = row['rank']
             is_current_user = row['username'] == user['username']
             
             rank_emojis = {1: "🥇", 2: "🥈", 3: "🥉"}
@@ -467,13 +474,13 @@ class QuizSystem:
                         <div>
                             <strong style="color: {text_color};">{row['username']}</strong>
                             <div style="color: {text_color}; font-size: 14px; opacity: 0.8;">
-                                퀴즈 {row['quiz_id']}개 참여
+                                퀴즈 {row['attempts']}개 참여
                             </div>
                         </div>
                     </div>
                     <div style="text-align: right;">
                         <div style="color: {text_color}; font-size: 18px; font-weight: bold;">
-                            {row['score']}점
+                            {row['score']:g}점
                         </div>
                         <div style="color: {text_color}; font-size: 12px;">
                             정확도: {row['accuracy']}%
@@ -487,16 +494,15 @@ class QuizSystem:
         """Display user achievements"""
         st.markdown("#### 🎯 나의 성취도")
         
-        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        user_responses = responses_df[responses_df['username'] == user['username']] if not responses_df.empty else pd.DataFrame()
+        user_stats = quiz_leaderboard.get_user_stats(user['username'])
         
         # Achievement calculations
         achievements = []
         
-        if not user_responses.empty:
-            total_attempts = len(user_responses)
-            perfect_scores = len(user_responses[user_responses['score'] == user_responses['total_questions']])
-            avg_score = (user_responses['score'] / user_responses['total_questions']).mean() * 100
+        if user_stats:
+            total_attempts = user_stats['attempts']
+            perfect_scores = user_stats['perfect']
+            avg_score = user_stats['avg_ratio'] * 100
             
             # Define achievements
             if total_attempts >= 1:
@@ -767,18 +773,18 @@ class QuizSystem:
         """Display enhanced user scores"""
         st.markdown("#### 📈 내 퀴즈 성과")
 
-        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
-        user_responses = responses_df[responses_df['username'] == user['username']] if not responses_df.empty else pd.DataFrame()
+        user_stats = quiz_leaderboard.get_user_stats(user['username'])
 
-        if user_responses.empty:
+        if not user_stats:
             st.info("참여한 퀴즈가 없습니다.")
             return
 
         # Enhanced overall statistics
-        total_quizzes = user_responses['quiz_id'].nunique()
-        total_attempts = len(user_responses)
-        avg_score = (user_responses['score'] / user_responses['total_questions']).mean() * 100
-        best_score = (user_responses['score'] / user_responses['total_questions']).max() * 100
+        user_quiz_ids = quiz_leaderboard.get_user_quizzes(user['username'])
+        total_quizzes = len(user_quiz_ids)
+        total_attempts = user_stats['attempts']
+        avg_score = user_stats['avg_ratio'] * 100
+        best_score = user_stats['best_ratio'] * 100
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -792,6 +798,8 @@ class QuizSystem:
 
         # Progress visualization
         st.markdown("##### 📈 성과 트렌드")
+        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
+        user_responses = responses_df[responses_df['username'] == user['username']].copy()
         user_responses['completed_date'] = pd.to_datetime(user_responses['completed_date'])
         user_responses['score_percentage'] = (user_responses['score'] / user_responses['total_questions']) * 100
         
@@ -806,17 +814,17 @@ class QuizSystem:
         st.markdown("##### 📋 퀴즈별 성과")
         quizzes_df = st.session_state.data_manager.load_csv('quizzes')
 
-        for quiz_id in user_responses['quiz_id'].unique():
-            quiz_attempts = user_responses[user_responses['quiz_id'] == quiz_id]
-            quiz_info = quizzes_df[quizzes_df['id'] == quiz_id]
+        quizzes_by_id = {quiz_key(quiz_id): quiz for quiz_id, quiz in zip(quizzes_df['id'], quizzes_df.to_dict('records'))} if not quizzes_df.empty else {}
+
+        for quiz_id in user_quiz_ids:
+            quiz = quizzes_by_id.get(quiz_id)
+            quiz_stats = quiz_leaderboard.get_user_stats(user['username'], quiz_id=quiz_id)
 
-            if not quiz_info.empty:
-                quiz = quiz_info.iloc[0]
-                best_score = quiz_attempts['score'].max()
-                attempts_count = len(quiz_attempts)
-                best_attempt = quiz_attempts.loc[quiz_attempts['score'].idxmax()]
-                best_time = best_attempt['time_taken']
-                score_percentage = (best_score / best_attempt['total_questions']) * 100
+            if quiz is not None and quiz_stats:
+                best_score = quiz_stats['best_score']
+                attempts_count = quiz_stats['attempts']
+                best_time = quiz_stats['best_time']
+                score_percentage = quiz_stats['best_score'] / quiz_stats['best_total'] * 100 if quiz_stats['best_total'] else 0
 
                 # Enhanced quiz card
                 performance_color = "#28a745" if score_percentage >= 80 else "#ffc107" if score_percentage >= 60 else "#dc3545"
@@ -835,7 +843,7 @@ class QuizSystem:
                     </div>
                     <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 15px; margin-top: 15px; text-align: center;">
                         <div>
-                            <h3 style="color: #FF6B6B; margin: 0;">{best_score}/{best_attempt['total_questions']}</h3>
+                            <h3 style="color: #FF6B6B; margin: 0;">{best_score:g}/{quiz_stats['best_total']:g}</h3>
                             <small>최고 점수</small>
                         </div>
                         <div>
@@ -994,10 +1002,10 @@ class QuizSystem:
         """Show detailed statistics for teachers"""
         st.markdown("#### 📈 상세 통계")
         
-        responses_df = st.session_state.data_manager.load_csv('quiz_responses')
+        total_responses, active_users, daily_counts = quiz_leaderboard.get_totals()
         quizzes_df = st.session_state.data_manager.load_csv('quizzes')
         
-        if responses_df.empty:
+        if not total_responses:
             st.info("통계 데이터가 없습니다.")
             return
         
@@ -1009,11 +1017,9 @@ class QuizSystem:
             error_handler.wrap_streamlit_component(st.metric, "총 퀴즈 수", total_quizzes)
         
         with col2:
-            total_responses = len(responses_df)
             error_handler.wrap_streamlit_component(st.metric, "총 응답 수", total_responses)
         
         with col3:
-            active_users = responses_df['username'].nunique()
             error_handler.wrap_streamlit_component(st.metric, "활성 사용자", active_users)
         
         with col4:
@@ -1025,8 +1031,7 @@ class QuizSystem:
         
         with col1:
             st.markdown("##### 📊 일별 퀴즈 참여")
-            responses_df['completed_date'] = pd.to_datetime(responses_df['completed_date'])
-            daily_responses = responses_df.groupby(responses_df['completed_date'].dt.date).size()
+            daily_responses = pd.Series(daily_counts).sort_index()
             
             if not daily_responses.empty:
                 fig = px.bar(x=daily_responses.index, y=daily_responses.values,
@@ -1035,7 +1040,8 @@ class QuizSystem:
         
         with col2:
             st.markdown("##### 🏆 사용자별 성과")
-            user_scores = responses_df.groupby('username')['score'].sum().sort_values(ascending=False).head(10)
+            top_rows = quiz_leaderboard.top(10)
+            user_scores = pd.Series([row['score'] for row in top_rows], index=[row['username'] for row in top_rows])
             
             if not user_scores.empty:
                 fig = px.bar(x=user_scores.values, y=user_scores.index, orientation='h',
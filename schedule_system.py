@@ -259,10 +259,7 @@ class ScheduleSystem:
                             schedules_to_create.append(recurring_schedule)
 
                     # Save all schedules
-                    success_count = 0
-                    for schedule in schedules_to_create:
-                        if st.session_state.data_manager.add_record('schedule', schedule):
-                            success_count += 1
+                    success_count = st.session_state.data_manager.add_records('schedule', schedules_to_create)
 
                     if success_count == len(schedules_to_create):
                         st.success(f"일정이 등록되었습니다! ({success_count}개)")
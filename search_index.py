@@ -0,0 +1,299 @@
+import os
+import re
+import json
+import math
+import threading
+import atexit
+from collections import Counter
+import streamlit as st
+from storage_backend import get_storage_backend
+from data_manager import add_write_listener
+
+# Searchable tables: category -> table, weighted text fields and the
+# columns kept for showing and filtering results.
+SEARCH_SOURCES = {
+    '게시글': {'table': 'posts', 'fields': {'title': 3, 'content': 1}, 'author': 'author', 'key': 'id'},
+    '과제': {'table': 'assignments', 'fields': {'title': 3, 'description': 1}, 'author': 'creator', 'key': 'id'},
+    '사용자': {'table': 'users', 'fields': {'username': 3, 'name': 3}, 'author': None, 'key': 'username'},
+    '퀴즈': {'table': 'quizzes', 'fields': {'title': 3, 'description': 1}, 'author': 'creator', 'key': 'id'},
+    '투표': {'table': 'votes', 'fields': {'title': 3, 'description': 1}, 'author': 'creator', 'key': 'id'},
+}
+
+# Tables written outside DataManager (AuthManager writes users directly);
+# these are checked against the file version before each search
+EXTERNALLY_WRITTEN_TABLES = {'users'}
+
+# Index changes are written to disk this many seconds after the last write
+INDEX_SAVE_DELAY = 2.0
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercased word tokens of a text"""
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return []
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def ngrams(token):
+    """Character unigrams and bigrams of a token.
+
+    Hangul has no reliable word boundaries for particles ('동아리에서'),
+    so matching on character bigrams finds '동아리' inside it; unigrams
+    keep one-syllable queries working.
+    """
+    grams = set(token)
+    grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def _display_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    return str(value)
+
+
+def _key_value(value):
+    """Document id as text, so 3, 3.0 and '3' name the same document"""
+    try:
+        as_float = float(value)
+        if as_float.is_integer():
+            return str(int(as_float))
+    except (TypeError, ValueError):
+        pass
+    return _display_value(value)
+
+
+class SearchIndex:
+    """Inverted n-gram index over the searchable tables.
+
+    Postings map an n-gram to {doc_key: weighted term frequency}; a query
+    intersects the postings of its n-grams, verifies each query word
+    against the stored text and ranks by tf-idf. Built on first use (or
+    loaded from data/search_index.json when the tables have not changed),
+    then kept current from the DataManager write listener.
+    """
+
+    def __init__(self, data_dir='data'):
+        self.storage = get_storage_backend(data_dir)
+        self.index_file = os.path.join(data_dir, 'search_index.json')
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._docs = {}
+        self._versions = {}
+        self._loaded = False
+        self._stale_tables = set()
+        self._save_timer = None
+        atexit.register(self.save)
+
+    # -- building --------------------------------------------------------
+
+    def _table_version(self, table):
+        try:
+            stat = os.stat(self.storage.table_path(table))
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._load_from_disk()
+            rebuilt = False
+            for category, source in SEARCH_SOURCES.items():
+                table = source['table']
+                if table in self._stale_tables or self._versions.get(table) != self._table_version(table):
+                    self._rebuild_category(category)
+                    rebuilt = True
+            self._stale_tables.clear()
+            self._loaded = True
+            if rebuilt:
+                self._schedule_save()
+
+    def warm_up(self):
+        """Load or build the index ahead of the first search"""
+        try:
+            self._ensure_loaded()
+        except Exception as e:
+            print(f"검색 색인 생성 실패: {e}")
+
+    def _load_from_disk(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._postings = saved.get('postings', {})
+        self._docs = saved.get('docs', {})
+        self._versions = saved.get('versions', {})
+
+    def _rebuild_category(self, category):
+        """Re-index one table, read through DataManager so pending row updates are seen"""
+        source = SEARCH_SOURCES[category]
+        for doc_key in [key for key in self._docs if key.startswith(category + '|')]:
+            self._remove_doc(doc_key)
+
+        table = source['table']
+        df = st.session_state.data_manager.load_csv(table)
+        for record in df.to_dict('records'):
+            self._add_doc(category, record)
+        self._versions[table] = self._table_version(table)
+
+    def _doc_key(self, category, record):
+        return f"{category}|{_key_value(record.get(SEARCH_SOURCES[category]['key']))}"
+
+    def _add_doc(self, category, record):
+        source = SEARCH_SOURCES[category]
+        doc_key = self._doc_key(category, record)
+        if doc_key in self._docs:
+            self._remove_doc(doc_key)
+
+        fields = {field: _display_value(record.get(field)) for field in source['fields']}
+        self._docs[doc_key] = {
+            'fields': fields,
+            'id': _key_value(record.get(source['key'])),
+            'author': _display_value(record.get(source['author'])) if source['author'] else 'System',
+            'club': _display_value(record.get('club', record.get('club_name'))) or 'N/A',
+            'date': _display_value(record.get('created_date'))[:19],
+            'role': _display_value(record.get('role')),
+        }
+
+        weights = Counter()
+        for field, weight in source['fields'].items():
+            for token in tokenize(fields[field]):
+                for gram in ngrams(token):
+                    weights[gram] += weight
+        for gram, weight in weights.items():
+            self._postings.setdefault(gram, {})[doc_key] = weight
+
+    def _remove_doc(self, doc_key):
+        doc = self._docs.pop(doc_key, None)
+        if doc is None:
+            return
+        for text in doc['fields'].values():
+            for token in tokenize(text):
+                for gram in ngrams(token):
+                    postings = self._postings.get(gram)
+                    if postings is not None:
+                        postings.pop(doc_key, None)
+                        if not postings:
+                            del self._postings[gram]
+
+    # -- keeping current -------------------------------------------------
+
+    def on_write(self, table, records, columns):
+        """DataManager write listener"""
+        categories = [c for c, source in SEARCH_SOURCES.items() if source['table'] == table]
+        if not categories:
+            return
+        with self._lock:
+            if not self._loaded:
+                # Picked up by the version check once the index loads
+                self._stale_tables.add(table)
+                return
+            for category in categories:
+                if records is None:
+                    self._rebuild_category(category)
+                elif columns is None:
+                    for record in records:
+                        self._add_doc(category, record)
+                else:
+                    self._apply_updates(category, records)
+            self._versions[table] = self._table_version(table)
+            self._schedule_save()
+
+    def _apply_updates(self, category, changes):
+        source = SEARCH_SOURCES[category]
+        for change in changes:
+            doc_key = self._doc_key(category, change)
+            doc = self._docs.get(doc_key)
+            if doc is None:
+                continue
+            record = dict(doc['fields'])
+            record.update({
+                source['key']: doc['id'], 'created_date': doc['date'], 'club': doc['club'], 'role': doc['role']
+            })
+            if source['author']:
+                record[source['author']] = doc['author']
+            record.update(change)
+            self._add_doc(category, record)
+
+    def _schedule_save(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(INDEX_SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        """Persist the index to data/search_index.json"""
+        with self._lock:
+            self._save_timer = None
+            if not self._loaded:
+                return
+            data = {'versions': self._versions, 'docs': self._docs, 'postings': self._postings}
+            tmp_path = self.index_file + '.tmp'
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_file)
+            except OSError as e:
+                print(f"검색 색인 저장 실패: {e}")
+
+    # -- querying --------------------------------------------------------
+
+    def search(self, query, categories, limit=None):
+        """Ranked matches for a query: list of (score, category, doc) tuples"""
+        self._ensure_loaded()
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            for category in categories:
+                table = SEARCH_SOURCES.get(category, {}).get('table')
+                if table in EXTERNALLY_WRITTEN_TABLES and self._versions.get(table) != self._table_version(table):
+                    self._rebuild_category(category)
+                    self._schedule_save()
+
+            grams = set()
+            for term in terms:
+                grams.update(ngrams(term))
+            postings = [self._postings.get(gram, {}) for gram in grams]
+            if not all(postings):
+                return []
+
+            # Intersect starting from the rarest n-gram
+            postings.sort(key=len)
+            prefixes = tuple(category + '|' for category in categories)
+            candidates = [key for key in postings[0] if key.startswith(prefixes)]
+            for posting in postings[1:]:
+                candidates = [key for key in candidates if key in posting]
+
+            total_docs = max(len(self._docs), 1)
+            results = []
+            for doc_key in candidates:
+                doc = self._docs[doc_key]
+                text = ' '.join(doc['fields'].values()).lower()
+                # n-grams can co-occur without the word itself - verify
+                if not all(term in text for term in terms):
+                    continue
+                score = sum(
+                    posting[doc_key] * math.log(1 + total_docs / len(posting))
+                    for posting in postings
+                )
+                title = next(iter(doc['fields'].values()), '').lower()
+                if query.lower().strip() in title:
+                    score *= 2
+                results.append((score, doc_key.split('|', 1)[0], dict(doc)))
+
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results[:limit] if limit else results
+
+
+# Global search index instance
+search_index = SearchIndex()
+add_write_listener(search_index.on_write)
@@ -1,13 +1,26 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import trafilatura
+from datetime import datetime, timedelta
 import re
+import threading
+from urllib.parse import quote, quote_plus
 from error_handler import error_handler
+from search_index import search_index
+from web_fetcher import web_fetcher
+
+# Search page URL per engine; {query} is form-encoded, {path} is a page path.
+# Point these at a local server to exercise web search offline.
+WEB_SEARCH_URLS = {
+    "Google": "https://www.google.com/search?q={query}&hl=ko",
+    "Naver": "https://search.naver.com/search.naver?query={query}&where=nexearch",
+    "Daum": "https://search.daum.net/search?q={query}&DA=YZR",
+    "Wikipedia": "https://ko.wikipedia.org/wiki/{path}"
+}
 
 class SearchSystem:
     def __init__(self):
-        pass
+        # Build (or load) the search index in the background at startup
+        threading.Thread(target=search_index.warm_up, name='search-index-warm-up', daemon=True).start()
 
     def show_search_interface(self, user):
         """Display search interface"""
@@ -135,7 +148,7 @@ class SearchSystem:
         st.markdown("#### 📊 검색 통계")
         
         # Get search logs
-        logs_df = st.session_state.data_manager.load_csv('logs')
+        logs_df = st.session_state.logging_system.load_logs(datetime.now().date() - timedelta(days=30))
         search_logs = logs_df[
             (logs_df['activity_type'].isin(['Search', 'Web Search'])) &
             (logs_df['username'] == user['username'])
@@ -188,240 +201,78 @@ class SearchSystem:
             st.markdown(search_html, unsafe_allow_html=True)
 
     def perform_internal_search(self, query, categories, date_range, user_filter, user):
-        """Perform internal data search"""
+        """Perform internal data search through the inverted index, best matches first"""
+        date_limit = self.get_date_limit(date_range) if date_range != "전체" else None
         results = []
-        
-        # Search in posts
-        if "게시글" in categories:
-            posts_results = self.search_posts(query, date_range, user_filter)
-            results.extend(posts_results)
-        
-        # Search in assignments
-        if "과제" in categories:
-            assignment_results = self.search_assignments(query, date_range, user_filter)
-            results.extend(assignment_results)
-        
-        # Search in users
-        if "사용자" in categories:
-            user_results = self.search_users(query)
-            results.extend(user_results)
-        
-        # Search in quizzes
-        if "퀴즈" in categories:
-            quiz_results = self.search_quizzes(query, date_range)
-            results.extend(quiz_results)
-        
-        # Search in votes
-        if "투표" in categories:
-            vote_results = self.search_votes(query, date_range)
-            results.extend(vote_results)
-        
-        return results
 
-    def search_posts(self, query, date_range, user_filter):
-        """Search in posts"""
-        posts_df = st.session_state.data_manager.load_csv('posts')
-        results = []
-        
-        if posts_df.empty:
-            return results
-        
-        # Apply filters
-        filtered_posts = posts_df.copy()
-        
-        if user_filter != "전체":
-            filtered_posts = filtered_posts[filtered_posts['author'] == user_filter]
-        
-        # Date filter
-        if date_range != "전체":
-            date_limit = self.get_date_limit(date_range)
-            filtered_posts = filtered_posts[
-                pd.to_datetime(filtered_posts['created_date']) >= date_limit
-            ]
-        
-        # Search in title and content
-        for _, post in filtered_posts.iterrows():
-            if (query.lower() in str(post['title']).lower() or 
-                query.lower() in str(post['content']).lower()):
-                
-                results.append({
-                    'type': '게시글',
-                    'title': post['title'],
-                    'content': str(post['content'])[:200] + '...',
-                    'author': post['author'],
-                    'date': post['created_date'],
-                    'id': post['id'],
-                    'club': post.get('club', 'N/A')
-                })
-        
-        return results
+        for score, category, doc in search_index.search(query, categories):
+            # The user filter applies to authored content, as before
+            if user_filter != "전체" and category in ("게시글", "과제") and doc['author'] != user_filter:
+                continue
 
-    def search_assignments(self, query, date_range, user_filter):
-        """Search in assignments"""
-        assignments_df = st.session_state.data_manager.load_csv('assignments')
-        results = []
-        
-        if assignments_df.empty:
-            return results
-        
-        # Apply filters
-        filtered_assignments = assignments_df.copy()
-        
-        if user_filter != "전체":
-            filtered_assignments = filtered_assignments[filtered_assignments['creator'] == user_filter]
-        
-        # Date filter
-        if date_range != "전체":
-            date_limit = self.get_date_limit(date_range)
-            filtered_assignments = filtered_assignments[
-                pd.to_datetime(filtered_assignments['created_date']) >= date_limit
-            ]
-        
-        # Search in title and description
-        for _, assignment in filtered_assignments.iterrows():
-            if (query.lower() in str(assignment['title']).lower() or 
-                query.lower() in str(assignment['description']).lower()):
-                
-                results.append({
-                    'type': '과제',
-                    'title': assignment['title'],
-                    'content': str(assignment['description'])[:200] + '...',
-                    'author': assignment['creator'],
-                    'date': assignment['created_date'],
-                    'id': assignment['id'],
-                    'club': assignment.get('club', 'N/A')
-                })
-        
-        return results
+            if date_limit is not None and category != "사용자":
+                doc_date = pd.to_datetime(doc['date'], errors='coerce')
+                if pd.isna(doc_date) or doc_date < date_limit:
+                    continue
 
-    def search_users(self, query):
-        """Search in users"""
-        users_df = st.session_state.data_manager.load_csv('users')
-        results = []
-        
-        if users_df.empty:
-            return results
-        
-        # Search in username and name
-        for _, user in users_df.iterrows():
-            if (query.lower() in str(user['username']).lower() or 
-                query.lower() in str(user['name']).lower()):
-                
+            if category == "사용자":
+                username, name = doc['fields']['username'], doc['fields']['name']
                 results.append({
-                    'type': '사용자',
-                    'title': f"{user['name']} (@{user['username']})",
-                    'content': f"역할: {user['role']}, 동아리: {user.get('club_name', 'N/A')}",
+                    'type': category,
+                    'title': f"{name} (@{username})",
+                    'content': f"역할: {doc['role']}, 동아리: {doc['club']}",
                     'author': 'System',
-                    'date': user.get('created_date', 'N/A'),
-                    'id': user['username'],
-                    'club': user.get('club_name', 'N/A')
+                    'date': doc['date'] or 'N/A',
+                    'id': doc['id'],
+                    'club': doc['club'],
+                    'score': score
                 })
-        
-        return results
+                continue
 
-    def search_quizzes(self, query, date_range):
-        """Search in quizzes"""
-        quizzes_df = st.session_state.data_manager.load_csv('quizzes')
-        results = []
-        
-        if quizzes_df.empty:
-            return results
-        
-        # Apply date filter
-        filtered_quizzes = quizzes_df.copy()
-        if date_range != "전체":
-            date_limit = self.get_date_limit(date_range)
-            filtered_quizzes = filtered_quizzes[
-                pd.to_datetime(filtered_quizzes['created_date']) >= date_limit
-            ]
-        
-        # Search in title and description
-        for _, quiz in filtered_quizzes.iterrows():
-            if (query.lower() in str(quiz['title']).lower() or 
-                query.lower() in str(quiz['description']).lower()):
-                
-                results.append({
-                    'type': '퀴즈',
-                    'title': quiz['title'],
-                    'content': str(quiz['description'])[:200] + '...',
-                    'author': quiz['creator'],
-                    'date': quiz['created_date'],
-                    'id': quiz['id'],
-                    'club': quiz.get('club', 'N/A')
-                })
-        
-        return results
+            title, body = list(doc['fields'].values())
+            results.append({
+                'type': category,
+                'title': title,
+                'content': body[:200] + '...',
+                'author': doc['author'],
+                'date': doc['date'],
+                'id': doc['id'],
+                'club': doc['club'],
+                'score': score
+            })
 
-    def search_votes(self, query, date_range):
-        """Search in votes"""
-        votes_df = st.session_state.data_manager.load_csv('votes')
-        results = []
-        
-        if votes_df.empty:
-            return results
-        
-        # Apply date filter
-        filtered_votes = votes_df.copy()
-        if date_range != "전체":
-            date_limit = self.get_date_limit(date_range)
-            filtered_votes = filtered_votes[
-                pd.to_datetime(filtered_votes['created_date']) >= date_limit
-            ]
-        
-        # Search in title and description
-        for _, vote in filtered_votes.iterrows():
-            if (query.lower() in str(vote['title']).lower() or 
-                query.lower() in str(vote['description']).lower()):
-                
-                results.append({
-                    'type': '투표',
-                    'title': vote['title'],
-                    'content': str(vote['description'])[:200] + '...',
-                    'author': vote['creator'],
-                    'date': vote['created_date'],
-                    'id': vote['id'],
-                    'club': vote.get('club', 'N/A')
-                })
-        
         return results
 
     def perform_web_search(self, query, search_engines, content_types):
-        """Perform web search"""
+        """Perform web search (engines are fetched concurrently, with a shared cache)"""
         results = []
-        
-        # Simulated web search results (in real implementation, use APIs)
+
         search_urls = {
-            "Google": f"https://www.google.com/search?q={query.replace(' ', '+')}&hl=ko",
-            "Naver": f"https://search.naver.com/search.naver?query={query.replace(' ', '+')}&where=nexearch",
-            "Daum": f"https://search.daum.net/search?q={query.replace(' ', '+')}&DA=YZR",
-            "Wikipedia": f"https://ko.wikipedia.org/wiki/{query.replace(' ', '_')}"
+            engine: template.format(query=quote_plus(query), path=quote(query.replace(' ', '_')))
+            for engine, template in WEB_SEARCH_URLS.items()
+            if engine in search_engines
         }
-        
-        for engine in search_engines:
-            if engine in search_urls:
-                try:
-                    url = search_urls[engine]
-                    # Try to fetch content using trafilatura
-                    downloaded = trafilatura.fetch_url(url)
-                    if downloaded:
-                        text = trafilatura.extract(downloaded)
-                        if text:
-                            results.append({
-                                'engine': engine,
-                                'title': f"{query} - {engine} 검색 결과",
-                                'content': text[:500] + '...',
-                                'url': url,
-                                'type': '웹 검색 결과'
-                            })
-                except Exception as e:
-                    results.append({
-                        'engine': engine,
-                        'title': f"{engine} 검색 링크",
-                        'content': f"{query}에 대한 {engine} 검색을 수행하려면 아래 링크를 클릭하세요.",
-                        'url': url,
-                        'type': '검색 링크',
-                        'error': str(e)
-                    })
+        fetched = web_fetcher.fetch_many(list(search_urls.values()))
+
+        for engine, url in search_urls.items():
+            text, error = fetched.get(url, (None, None))
+            if text:
+                results.append({
+                    'engine': engine,
+                    'title': f"{query} - {engine} 검색 결과",
+                    'content': text[:500] + '...',
+                    'url': url,
+                    'type': '웹 검색 결과'
+                })
+            elif error:
+                results.append({
+                    'engine': engine,
+                    'title': f"{engine} 검색 링크",
+                    'content': f"{query}에 대한 {engine} 검색을 수행하려면 아래 링크를 클릭하세요.",
+                    'url': url,
+                    'type': '검색 링크',
+                    'error': error
+                })
         
         return results
 
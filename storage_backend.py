@@ -0,0 +1,286 @@
+import pandas as pd
+import os
+import csv
+import sys
+
+# Name of the marker file that records which backend a data directory uses
+BACKEND_MARKER = 'STORAGE_BACKEND'
+
+
+class StorageBackend:
+    """Table storage used by DataManager and the other persistence helpers.
+
+    A table is addressed by name ('posts', 'chat_logs', ...) and lives in
+    one file per table inside the data directory. Backends only move raw
+    frames in and out; type handling such as datetime parsing stays with
+    the caller.
+    """
+
+    name = ''
+    extension = ''
+
+    def __init__(self, data_dir='data'):
+        self.data_dir = data_dir
+
+    def table_path(self, table):
+        """Resolve a table name (with or without extension) to its file path"""
+        table = table_name(table)
+        return os.path.join(self.data_dir, table + self.extension)
+
+    def exists(self, table):
+        return os.path.exists(self.table_path(table))
+
+    def list_tables(self):
+        """Names of all tables stored by this backend"""
+        if not os.path.exists(self.data_dir):
+            return []
+        return sorted(
+            f[:-len(self.extension)] for f in os.listdir(self.data_dir)
+            if f.endswith(self.extension)
+        )
+
+    def read(self, table):
+        raise NotImplementedError
+
+    def read_column(self, table, column):
+        """Read a single column; backends override this when they can do better"""
+        return self.read(table)[column]
+
+    def header(self, table):
+        raise NotImplementedError
+
+    def write(self, table, dataframe):
+        raise NotImplementedError
+
+    def append(self, table, record):
+        """Append one record. Returns False if the record has columns the
+        table does not, so the caller can rewrite the table instead."""
+        return self.append_many(table, [record])
+
+    def append_many(self, table, records):
+        """Append several records in a single write (same contract as append)"""
+        raise NotImplementedError
+
+
+class CSVBackend(StorageBackend):
+    """The original utf-8-sig CSV files"""
+
+    name = 'csv'
+    extension = '.csv'
+
+    def read(self, table):
+        filepath = self.table_path(table)
+
+        # Check if file is empty or has only headers
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            content = f.read().strip()
+            lines = content.split('\n')
+
+            # If file has only headers or is empty, return empty DataFrame with columns
+            if len(lines) <= 1 or (len(lines) == 2 and lines[1].strip() == ''):
+                if len(lines) >= 1 and lines[0].strip():
+                    columns = [col.strip() for col in lines[0].split(',')]
+                    return pd.DataFrame(columns=columns)
+                else:
+                    return pd.DataFrame()
+
+        return pd.read_csv(filepath, encoding='utf-8-sig')
+
+    def read_column(self, table, column):
+        return pd.read_csv(self.table_path(table), encoding='utf-8-sig', usecols=[column])[column]
+
+    def header(self, table):
+        filepath = self.table_path(table)
+        if not os.path.exists(filepath):
+            return []
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            first_line = f.readline()
+        if not first_line.strip():
+            return []
+        return next(csv.reader([first_line]))
+
+    def write(self, table, dataframe):
+        filepath = self.table_path(table)
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        dataframe.to_csv(filepath, index=False, encoding='utf-8-sig')
+
+    def append_many(self, table, records):
+        filepath = self.table_path(table)
+        header = self.header(table)
+        if not header:
+            self.write(table, pd.DataFrame(records))
+            return True
+
+        if any(key not in header for record in records for key in record):
+            return False
+
+        # Make sure we start on a fresh line even if the file was hand-edited
+        with open(filepath, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b'\n', b'\r')
+
+        row_df = pd.DataFrame(records, columns=header)
+        with open(filepath, 'a', encoding='utf-8', newline='') as f:
+            if needs_newline:
+                f.write('\n')
+            row_df.to_csv(f, index=False, header=False)
+        return True
+
+
+class ParquetBackend(StorageBackend):
+    """Columnar per-table Parquet files (requires pyarrow).
+
+    Reads are much faster than CSV for the large tables and datetime
+    columns come back already typed. Parquet files cannot be appended to,
+    so append rewrites the table; that is still cheaper than a CSV
+    rewrite, but the CSV backend remains the better fit for tiny
+    write-heavy deployments.
+    """
+
+    name = 'parquet'
+    extension = '.parquet'
+
+    def __init__(self, data_dir='data'):
+        super().__init__(data_dir)
+        import pyarrow.parquet  # noqa: F401 - fail early when pyarrow is missing
+        self._pq = pyarrow.parquet
+
+    def read(self, table):
+        return pd.read_parquet(self.table_path(table))
+
+    def read_column(self, table, column):
+        return pd.read_parquet(self.table_path(table), columns=[column])[column]
+
+    def header(self, table):
+        filepath = self.table_path(table)
+        if not os.path.exists(filepath):
+            return []
+        names = self._pq.read_schema(filepath).names
+        return [name for name in names if not name.startswith('__index_level_')]
+
+    def write(self, table, dataframe):
+        filepath = self.table_path(table)
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        tmp_path = filepath + '.tmp'
+        try:
+            dataframe.to_parquet(tmp_path, index=False)
+        except Exception:
+            # Mixed-type object columns (e.g. ints and strings) cannot be
+            # stored as one Arrow type - store them as text instead
+            dataframe = _stringify_object_columns(dataframe)
+            dataframe.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, filepath)
+
+    def append_many(self, table, records):
+        if not self.exists(table):
+            self.write(table, pd.DataFrame(records))
+            return True
+
+        df = self.read(table)
+        if any(key not in df.columns for record in records for key in record):
+            return False
+        df = pd.concat([df, pd.DataFrame(records, columns=df.columns)], ignore_index=True)
+        self.write(table, df)
+        return True
+
+
+BACKENDS = {
+    CSVBackend.name: CSVBackend,
+    ParquetBackend.name: ParquetBackend,
+}
+
+_backend_instances = {}
+
+
+def table_name(filename):
+    """Strip a known table extension from a file name"""
+    for backend_class in BACKENDS.values():
+        if filename.endswith(backend_class.extension):
+            return filename[:-len(backend_class.extension)]
+    return filename
+
+
+def _stringify_object_columns(dataframe):
+    dataframe = dataframe.copy()
+    for col in dataframe.columns:
+        if dataframe[col].dtype == 'object':
+            dataframe[col] = dataframe[col].map(lambda v: v if pd.isna(v) else str(v))
+    return dataframe
+
+
+def configured_backend_name(data_dir='data'):
+    """Backend chosen via POLARCLUB_STORAGE, else the data dir marker, else csv"""
+    name = os.environ.get('POLARCLUB_STORAGE', '').strip().lower()
+    if name:
+        return name
+
+    marker = os.path.join(data_dir, BACKEND_MARKER)
+    if os.path.exists(marker):
+        with open(marker, 'r', encoding='utf-8') as f:
+            name = f.read().strip().lower()
+    return name or CSVBackend.name
+
+
+def get_storage_backend(data_dir='data'):
+    """Return the process-wide backend instance for a data directory"""
+    if data_dir not in _backend_instances:
+        name = configured_backend_name(data_dir)
+        backend_class = BACKENDS.get(name, CSVBackend)
+        try:
+            backend = backend_class(data_dir)
+        except ImportError:
+            print(f"⚠️ '{name}' 저장소를 사용할 수 없어 CSV로 대체합니다 (pyarrow 필요)")
+            backend = CSVBackend(data_dir)
+        _backend_instances[data_dir] = backend
+    return _backend_instances[data_dir]
+
+
+def migrate_data_dir(data_dir='data', target='parquet', remove_source=False):
+    """Convert every table in data_dir to the target backend in one shot.
+
+    Tables are copied as raw values, so a later migration back to CSV gives
+    the same files. The data dir marker is updated so every process picks
+    up the new backend on its next start.
+    """
+    target_backend = BACKENDS[target](data_dir)
+    converted = []
+
+    for backend_class in BACKENDS.values():
+        if backend_class is type(target_backend):
+            continue
+        try:
+            source_backend = backend_class(data_dir)
+        except ImportError:
+            continue
+
+        for table in source_backend.list_tables():
+            df = source_backend.read(table)
+            target_backend.write(table, df)
+            converted.append((table, len(df)))
+            if remove_source:
+                os.remove(source_backend.table_path(table))
+
+    with open(os.path.join(data_dir, BACKEND_MARKER), 'w', encoding='utf-8') as f:
+        f.write(target_backend.name)
+
+    _backend_instances.pop(data_dir, None)
+    return converted
+
+
+if __name__ == '__main__':
+    # python storage_backend.py migrate [parquet|csv] [data_dir] [--remove-source]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args or args[0] != 'migrate':
+        print("사용법: python storage_backend.py migrate [parquet|csv] [data_dir] [--remove-source]")
+        sys.exit(1)
+
+    target = args[1] if len(args) > 1 else ParquetBackend.name
+    data_dir = args[2] if len(args) > 2 else 'data'
+    if target not in BACKENDS:
+        print(f"알 수 없는 저장소: {target}")
+        sys.exit(1)
+
+    results = migrate_data_dir(data_dir, target, remove_source='--remove-source' in sys.argv)
+    for table, rows in results:
+        print(f"✅ {table}: {rows}행 변환")
+    print(f"🎉 {len(results)}개 테이블을 {target} 형식으로 변환했습니다.")
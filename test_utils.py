@@ -33,7 +33,8 @@ class AdvancedTestSystem:
             ("로그 시스템", self.test_logging_system),
             ("배포 준비", self.test_deployment_readiness),
             ("보안 검사", self.test_security),
-            ("성능 검사", self.test_performance)
+            ("성능 검사", self.test_performance),
+            ("웹 검색 캐시", self.test_web_fetcher)
         ]
 
         for test_name, test_function in test_sequence:
@@ -450,13 +451,13 @@ class AdvancedTestSystem:
             print("✅ LoggingSystem 임포트 성공")
             log_results['import'] = "SUCCESS"
 
-            # 로그 파일 존재 확인
-            logs_file = 'data/logs.csv'
-            if os.path.exists(logs_file):
-                logs_df = pd.read_csv(logs_file, encoding='utf-8-sig')
+            # 로그 세그먼트 확인
+            manifest_file = os.path.join(logging_system.log_store.log_dir, 'manifest.json')
+            if os.path.exists(manifest_file):
+                logs_df = logging_system.log_store.read()
                 required_columns = ['id', 'timestamp', 'username', 'activity_type', 'activity_description']
 
-                missing_cols = [col for col in required_columns if col not in logs_df.columns]
+                missing_cols = [col for col in required_columns if col not in logs_df.columns] if not logs_df.empty else []
                 if missing_cols:
                     print(f"❌ 로그 파일에 필수 컬럼 누락: {missing_cols}")
                     log_results['structure'] = f"MISSING_COLUMNS: {missing_cols}"
@@ -465,7 +466,7 @@ class AdvancedTestSystem:
                     print(f"✅ 로그 파일 구조 정상 ({len(logs_df)}개 로그)")
                     log_results['structure'] = "OK"
             else:
-                print("❌ 로그 파일이 존재하지 않습니다")
+                print("❌ 로그 매니페스트가 존재하지 않습니다")
                 log_results['file_exists'] = "MISSING"
                 self.critical_errors.append("로그 파일이 존재하지 않습니다")
 
@@ -627,9 +628,112 @@ class AdvancedTestSystem:
             print("✅ 모든 파일 크기 적정")
             performance_results['large_files'] = "OK"
 
+        performance_results['datetime_parsing'] = self.benchmark_datetime_parsing()
+
         self.test_results['performance'] = performance_results
         return True
 
+    def benchmark_datetime_parsing(self, rows=100000):
+        """Compare per-cell and vectorized datetime parsing on a large column"""
+        try:
+            import time
+            from error_handler import error_handler
+
+            samples = ['2024-01-15 09:00:00', '2024-01-15', '01/15/2024', '2024/01/15', '']
+            column = pd.Series([samples[i % len(samples)] for i in range(rows)])
+
+            start = time.perf_counter()
+            per_cell = column.apply(error_handler.safe_datetime_parse)
+            per_cell_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            vectorized = error_handler.safe_datetime_parse_series(column)
+            vectorized_time = time.perf_counter() - start
+
+            non_blank = column != ''
+            if not (per_cell[non_blank] == vectorized[non_blank]).all():
+                self.critical_errors.append("벡터화 날짜 파싱 결과가 기존 결과와 다릅니다")
+                return "MISMATCH"
+
+            speedup = per_cell_time / vectorized_time if vectorized_time > 0 else float('inf')
+            print(f"✅ 날짜 파싱 {rows:,}행: 셀 단위 {per_cell_time:.2f}s → 벡터화 {vectorized_time:.2f}s ({speedup:.1f}배)")
+            return f"{speedup:.1f}x"
+        except Exception as e:
+            self.warnings.append(f"날짜 파싱 벤치마크 실패: {e}")
+            return f"ERROR: {e}"
+
+    def test_web_fetcher(self):
+        """Test the pooled, cached web fetcher against a local stub server"""
+        print("\n🌐 웹 검색 캐시 검사 시작...")
+
+        import time
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from web_fetcher import WebFetcher
+
+        hits = {}
+        hits_lock = threading.Lock()
+
+        class StubHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with hits_lock:
+                    hits[self.path] = hits.get(self.path, 0) + 1
+                if self.path.startswith('/slow'):
+                    time.sleep(0.5)
+                body = f"page {self.path}".encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        fetcher = WebFetcher(extract=lambda html: html, ttl=0.3)
+
+        fetcher_results = {}
+        try:
+            # Cache hit: the second fetch of a page does not reach the server
+            first = fetcher.fetch_many([f"{base}/a"], timeout=2)
+            second = fetcher.fetch_many([f"{base}/a"], timeout=2)
+            fetcher_results['cache_hit'] = (
+                "OK" if first == second and first[f"{base}/a"][0] == "page /a" and hits.get('/a') == 1
+                else f"FAILED: {hits.get('/a')} requests"
+            )
+
+            # TTL expiry: once the entry is stale the page is fetched again
+            time.sleep(0.4)
+            fetcher.fetch_many([f"{base}/a"], timeout=2)
+            fetcher_results['ttl_expiry'] = "OK" if hits.get('/a') == 2 else f"FAILED: {hits.get('/a')} requests"
+
+            # Shared pending future: concurrent callers join one in-flight request
+            futures = [fetcher.submit(f"{base}/slow") for _ in range(3)]
+            texts = {future.result(timeout=2) for future in futures}
+            shared = all(future is futures[0] for future in futures)
+            fetcher_results['shared_pending'] = (
+                "OK" if shared and texts == {"page /slow"} and hits.get('/slow') == 1
+                else f"FAILED: {hits.get('/slow')} requests"
+            )
+        except Exception as e:
+            fetcher_results['error'] = f"ERROR: {e}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        for check, result in fetcher_results.items():
+            if result == "OK":
+                print(f"✅ {check}")
+            else:
+                print(f"❌ {check}: {result}")
+                self.critical_errors.append(f"웹 검색 캐시 {check} 실패: {result}")
+
+        self.test_results['web_fetcher'] = fetcher_results
+        return all(result == "OK" for result in fetcher_results.values())
+
     def auto_fix_syntax_error(self, module_name, error):
         """Attempt to automatically fix syntax errors"""
         try:
@@ -0,0 +1,92 @@
+import threading
+import os
+from storage_backend import get_storage_backend
+
+
+class UserDirectory:
+    """In-memory view of the users table for hot-path lookups.
+
+    The table is read once and indexed by username and by club. AuthManager
+    invalidates it after every write; the file's (mtime, size) is also
+    checked so edits made outside AuthManager are picked up.
+    """
+
+    def __init__(self, data_dir='data'):
+        self.storage = get_storage_backend(data_dir)
+        self._lock = threading.Lock()
+        self._version = None
+        self._users = {}
+        self._club_members = {}
+
+    def invalidate(self):
+        """Drop the in-memory directory; the next lookup reloads it"""
+        with self._lock:
+            self._version = None
+
+    def _current_version(self):
+        try:
+            stat = os.stat(self.storage.table_path('users'))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_loaded(self):
+        version = self._current_version()
+        with self._lock:
+            if version is not None and version == self._version:
+                return
+
+            users = {}
+            club_members = {}
+            if version is not None:
+                users_df = self.storage.read('users')
+                for record in users_df.to_dict('records'):
+                    username = record.get('username')
+                    users.setdefault(username, []).append(record)
+                    club_members.setdefault(record.get('club_name'), []).append(username)
+
+            self._users = users
+            self._club_members = club_members
+            self._version = version
+
+    def version(self):
+        """Identifies the loaded users table; changes whenever memberships may have"""
+        self._ensure_loaded()
+        return self._version
+
+    def get_user(self, username):
+        """Return the user's record as a dict, or None"""
+        self._ensure_loaded()
+        rows = self._users.get(username)
+        return dict(rows[0]) if rows else None
+
+    def get_user_rows(self, username):
+        """All rows for a username (a user can appear once per club)"""
+        self._ensure_loaded()
+        return [dict(row) for row in self._users.get(username, [])]
+
+    def get_user_clubs(self, username):
+        """List of {'club_name', 'role'} dicts for a user"""
+        return [
+            {'club_name': row.get('club_name'), 'role': row.get('club_role')}
+            for row in self.get_user_rows(username)
+        ]
+
+    def members_of_club(self, club_name):
+        """Usernames belonging to a club"""
+        self._ensure_loaded()
+        return list(self._club_members.get(club_name, []))
+
+    def usernames(self):
+        """Every username in the directory"""
+        self._ensure_loaded()
+        return list(self._users)
+
+    def get_display_name(self, username):
+        """User's name, falling back to the username itself"""
+        user = self.get_user(username)
+        return user['name'] if user and user.get('name') else username
+
+
+# Global user directory instance
+user_directory = UserDirectory()
@@ -3,7 +3,7 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-from error_handler import ErrorHandler
+from error_handler import error_handler
 import json
 
 class VoteSystem:
@@ -14,7 +14,8 @@ class VoteSystem:
     def __init__(self):
         self.votes_file = 'data/votes.csv'
         self.vote_responses_file = 'data/vote_responses.csv'
-        self.error_handler = ErrorHandler()
+        # Shared handler: one background writer owns the error_log table
+        self.error_handler = error_handler
         self.initialize_vote_files()
 
     def initialize_vote_files(self):
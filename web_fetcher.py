@@ -0,0 +1,119 @@
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+import trafilatura
+
+# Fetch layer settings
+FETCH_TIMEOUT = 5.0          # seconds per HTTP request
+FETCH_WORKERS = 4
+CACHE_TTL = 10 * 60          # seconds an extracted page stays fresh
+CACHE_SIZE = 256             # pages kept (least recently used are evicted)
+
+USER_AGENT = 'Mozilla/5.0 (compatible; PolarClubSearch/1.0)'
+
+
+def download_html(url, timeout=FETCH_TIMEOUT):
+    """Download a page with a hard timeout and decode it to text"""
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+
+class WebFetcher:
+    """Concurrent page fetching with a TTL/LRU cache of extracted text.
+
+    Requests run on a shared thread pool, each with its own socket
+    timeout, and fetch_many waits at most `timeout` seconds overall, so
+    one slow site cannot stall the page. Results (including ones that
+    arrive after the caller gave up) are cached by URL for every session.
+    The download and extract steps are plain callables, so the layer can
+    be pointed at a local stub server or given fakes when testing.
+    """
+
+    def __init__(self, download=download_html, extract=trafilatura.extract,
+                 workers=FETCH_WORKERS, ttl=CACHE_TTL, max_entries=CACHE_SIZE):
+        self.download = download
+        self.extract = extract
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='web-fetch')
+        self._cache = OrderedDict()  # url -> (fetched_at, text)
+        self._pending = {}           # url -> Future, so concurrent callers share one request
+        self._lock = threading.Lock()
+
+    def cached(self, url):
+        """Cached text for a URL if it is still fresh, else None"""
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._cache[url]
+                return None
+            self._cache.move_to_end(url)
+            return entry[1]
+
+    def _store(self, url, text):
+        with self._lock:
+            self._cache[url] = (time.monotonic(), text)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _fetch(self, url, timeout):
+        try:
+            html = self.download(url, timeout=timeout)
+            text = self.extract(html) if html else None
+            if text:
+                self._store(url, text)
+            return text
+        finally:
+            with self._lock:
+                self._pending.pop(url, None)
+
+    def submit(self, url, timeout=FETCH_TIMEOUT):
+        """Start fetching a URL (or join a fetch already running)"""
+        with self._lock:
+            future = self._pending.get(url)
+            if future is None:
+                future = self._executor.submit(self._fetch, url, timeout)
+                self._pending[url] = future
+        return future
+
+    def fetch_many(self, urls, timeout=FETCH_TIMEOUT):
+        """Fetch several URLs at once.
+
+        Returns {url: (text, error)}: text is None when the page had no
+        extractable content, error is a message when the request failed
+        or did not finish within `timeout` seconds.
+        """
+        results = {}
+        futures = {}
+        for url in urls:
+            text = self.cached(url)
+            if text is not None:
+                results[url] = (text, None)
+            else:
+                futures[url] = self.submit(url, timeout)
+
+        if futures:
+            wait(futures.values(), timeout=timeout)
+        for url, future in futures.items():
+            if not future.done():
+                results[url] = (None, f"{timeout:.0f}초 내에 응답이 없습니다")
+            elif future.exception() is not None:
+                results[url] = (None, str(future.exception()))
+            else:
+                results[url] = (future.result(), None)
+        return results
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Global web fetcher instance (shared by every session)
+web_fetcher = WebFetcher()